@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/3.1/ref/settings/
 
 import os
 import os.path
+from distutils.util import strtobool
 from pathlib import Path
 
 import yaml
@@ -92,6 +93,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django_prometheus.middleware.PrometheusBeforeMiddleware',
     'middleware.logging.RequestResponseLoggingMiddleware',
+    # Must be before any middleware accessing the DB
+    'middleware.db_replica.DBReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -153,6 +156,47 @@ DATABASES = {
     }
 }
 
+# Connection pool, see db_backends.postgis_pool. The connections are shared by all requests
+# (greenlets) of a worker process, with at most DB_POOL_SIZE connections per database and process.
+# A DB_POOL_SIZE of 0 disables the pool.
+try:
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '10'))
+    # Maximum time a request waits for a free connection of the pool
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '10'))
+    # Idle time after which a connection is checked before being reused
+    DB_POOL_CHECK_SECONDS = float(os.environ.get('DB_POOL_CHECK_SECONDS', '30'))
+    # Maximum lifetime of a connection of the pool
+    DB_POOL_MAX_AGE = float(os.environ.get('DB_POOL_MAX_AGE', '3600'))
+except ValueError as error:
+    raise ValueError('Invalid DB_POOL_* environment value: must be a number') from error
+if DB_POOL_SIZE > 0:
+    DATABASES['default']['ENGINE'] = 'db_backends.postgis_pool'
+
+# Read replicas (comma separated list of hosts) used for the safe requests (GET/HEAD), see
+# middleware.db_replica. The replicas use the same credentials, name and port as the primary.
+DB_REPLICAS = []
+for i, host in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))):
+    DATABASES[f'replica_{i}'] = {
+        **DATABASES['default'], 'HOST': host.strip(), 'TEST': {
+            'MIRROR': 'default'
+        }
+    }
+    DB_REPLICAS.append(f'replica_{i}')
+
+DATABASE_ROUTERS = ['middleware.db_replica.ReplicaRouter']
+
+# Name of the cookie used to route the requests of a client to the primary after a write, for
+# DB_REPLICA_STICKY_SECONDS, in order to read its own writes.
+DB_REPLICA_STICKY_COOKIE = 'stac-db-primary'
+try:
+    DB_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', '10'))
+    # Maximum replication lag, replicas with a bigger lag are not used
+    DB_REPLICA_MAX_LAG_SECONDS = float(os.environ.get('DB_REPLICA_MAX_LAG_SECONDS', '5'))
+    # Interval of the replicas lag check (done per process)
+    DB_REPLICA_CHECK_SECONDS = float(os.environ.get('DB_REPLICA_CHECK_SECONDS', '5'))
+except ValueError as error:
+    raise ValueError('Invalid DB_REPLICA_* environment value: must be a number') from error
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -207,6 +251,9 @@ WHITENOISE_MIMETYPES = {
 
 # Media files (i.e. uploaded content=assets in this project)
 UPLOAD_FILE_CHUNK_SIZE = 1024 * 1024  # Size in Bytes
+# Compute the checksum of the large asset files (see FILE_UPLOAD_MAX_MEMORY_SIZE) while uploading
+# them to S3 instead of reading them twice, the sha256 metadata is then set with a copy in place
+UPLOAD_STREAMING_HASH = bool(strtobool(os.getenv('UPLOAD_STREAMING_HASH', 'False')))
 DEFAULT_FILE_STORAGE = 'stac_api.storages.S3Storage'
 
 try:
@@ -231,6 +278,34 @@ except KeyError as err:
 
 AWS_PRESIGNED_URL_EXPIRES = int(os.environ.get('AWS_PRESIGNED_URL_EXPIRES', '3600'))
 
+# Maximum number of parts of an asset upload for which the parts presigned urls are created with
+# the upload, the urls of uploads with more parts are created on demand (see AssetUploadPartUrl)
+try:
+    UPLOAD_PRESIGNED_URLS_MAX_PARTS = int(os.environ.get('UPLOAD_PRESIGNED_URLS_MAX_PARTS', '100'))
+except ValueError as error:
+    raise ValueError(
+        'Invalid UPLOAD_PRESIGNED_URLS_MAX_PARTS environment value: must be an integer'
+    ) from error
+
+# Duration after which an asynchronous upload completion is considered as lost (e.g. the process
+# has been killed), the upload can then be completed or aborted again
+try:
+    UPLOAD_COMPLETION_TIMEOUT_SECONDS = int(
+        os.environ.get('UPLOAD_COMPLETION_TIMEOUT_SECONDS', '3600')
+    )
+except ValueError as error:
+    raise ValueError(
+        'Invalid UPLOAD_COMPLETION_TIMEOUT_SECONDS environment value: must be an integer'
+    ) from error
+
+# Maximum number of connections kept alive by the S3 client of the process
+try:
+    AWS_S3_MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_S3_MAX_POOL_CONNECTIONS', '10'))
+except ValueError as error:
+    raise ValueError(
+        'Invalid AWS_S3_MAX_POOL_CONNECTIONS environment value: must be an integer'
+    ) from error
+
 # Configure the admin upload caching
 try:
     STORAGE_ASSETS_CACHE_SECONDS = int(os.environ.get('HTTP_ASSETS_CACHE_SECONDS', '7200'))
@@ -294,6 +369,78 @@ DEBUG_PROPAGATE_API_EXCEPTIONS = False
 # data.geo.admin.ch/collection/item/asset to check if asset exists.
 EXTERNAL_SERVICE_TIMEOUT = 3
 
+# Cache of the objects ETag used by the conditional requests (If-None-Match) of safe methods,
+# see stac_api.etag_cache. The ETags are invalidated on each object changes, but with a local
+# memory cache the invalidation is only done within the process that did the change and the other
+# processes would answer 304 Not Modified for changed objects until ETAG_CACHE_SECONDS. Therefore
+# the cache is disabled by default (ETAG_CACHE_SECONDS=0) unless a shared cache backend (e.g.
+# memcached) invalidating the ETags of all processes right away is configured.
+ETAG_CACHE_BACKEND = os.environ.get(
+    'ETAG_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+)
+try:
+    ETAG_CACHE_SECONDS = int(
+        os.environ.get(
+            'ETAG_CACHE_SECONDS', '0' if ETAG_CACHE_BACKEND.endswith('.LocMemCache') else '10'
+        )
+    )
+except ValueError as error:
+    raise ValueError('Invalid ETAG_CACHE_SECONDS environment value: must be an integer') from error
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'etags': {
+        'BACKEND': ETAG_CACHE_BACKEND,
+        'LOCATION': os.environ.get('ETAG_CACHE_LOCATION', 'etags'),
+        'TIMEOUT': ETAG_CACHE_SECONDS,
+    }
+}
+
+# Stream the FeatureCollection of the items list and search endpoints feature by feature instead
+# of rendering the whole page in memory before sending it. This reduces the memory footprint and
+# time to first byte of large pages (see PAGE_SIZE_LIMIT).
+STREAMING_RESPONSES = bool(strtobool(os.getenv('STREAMING_RESPONSES', 'False')))
+
+# Engine used to build the items document of the items list and search endpoints:
+#   - python: documents serialized by django and stored next to the item (see
+#     stac_api.item_documents)
+#   - sql: documents built by PostgreSQL within the items query
+ITEM_DOCUMENTS_ENGINE = os.environ.get('ITEM_DOCUMENTS_ENGINE', 'python')
+if ITEM_DOCUMENTS_ENGINE not in ['python', 'sql']:
+    raise ValueError('Invalid ITEM_DOCUMENTS_ENGINE environment value: must be python or sql')
+
+# Maximum number of features of an items bulk creation request (see stac_api.views.ItemsBulk), the
+# features are all validated and inserted within a single transaction locking the collection
+try:
+    ITEMS_BULK_MAX_FEATURES = int(os.environ.get('ITEMS_BULK_MAX_FEATURES', '1000'))
+except ValueError as error:
+    raise ValueError(
+        'Invalid ITEMS_BULK_MAX_FEATURES environment value: must be an integer'
+    ) from error
+
+# Defer the update of the collections extent and summaries to a background worker instead of
+# updating them on every item/asset write. The item and asset writes only record a collection change
+# and the changes of a collection are coalesced during COLLECTION_UPDATES_DELAY_SECONDS before
+# recomputing its extent and summaries (see stac_api.collection_updates).
+COLLECTION_UPDATES_DEFERRED = bool(strtobool(os.getenv('COLLECTION_UPDATES_DEFERRED', 'False')))
+try:
+    COLLECTION_UPDATES_DELAY_SECONDS = float(
+        os.environ.get('COLLECTION_UPDATES_DELAY_SECONDS', '5')
+    )
+except ValueError as error:
+    raise ValueError(
+        'Invalid COLLECTION_UPDATES_DELAY_SECONDS environment value: must be a number'
+    ) from error
+
+# Expand the collection extent on item insertions within a single UPDATE statement instead of
+# saving the whole collection row. This allows parallel insertions in the same collection without
+# losing extent updates (see stac_api.collection_updates).
+COLLECTION_EXTENT_ATOMIC_MERGE = bool(
+    strtobool(os.getenv('COLLECTION_EXTENT_ATOMIC_MERGE', 'False'))
+)
+
 # By default django_prometheus tracks the number of migrations
 # This causes troubles in various places so we disable it
 PROMETHEUS_EXPORT_MIGRATIONS = False
@@ -20,3 +20,11 @@ AWS_DEFAULT_ACL = 'public-read'
 AWS_S3_REGION_NAME = 'wonderland'
 AWS_S3_ENDPOINT_URL = None
 AWS_S3_CUSTOM_DOMAIN = 'testserver'
+
+# The ETag cache is tested explicitly, disable it otherwise as the test DB is rolled back between
+# tests without invalidating the cache
+ETAG_CACHE_SECONDS = 0
+
+# The pooled connections would prevent the test database to be dropped at the end of the tests
+for database in DATABASES.values():
+    database['ENGINE'] = 'django.contrib.gis.db.backends.postgis'
@@ -0,0 +1,46 @@
+'''psycopg2 integration with gevent
+
+By default psycopg2 blocks the process while waiting on the database, with the gevent worker all
+greenlets of the worker are blocked. With the wait callback installed, psycopg2 runs the
+connections in non blocking mode and waits on their socket through the gevent hub, letting the
+other greenlets run in between.
+
+NOTE: this module must not import django, it is used by wsgi.py before the django setup.
+'''
+import psycopg2
+from psycopg2 import extensions
+
+
+def gevent_wait_callback(conn, timeout=None):
+    '''psycopg2 wait callback yielding to the gevent hub while waiting on the database
+
+    Args:
+        conn: psycopg2 connection
+            Connection to wait on
+        timeout: float | None
+            Optional timeout in seconds
+    '''
+    # pylint: disable=import-outside-toplevel
+    from gevent.socket import wait_read
+    from gevent.socket import wait_write
+
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        if state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise psycopg2.OperationalError(f'Bad result from poll: {state!r}')
+
+
+def patch_psycopg():
+    '''Make psycopg2 cooperative with gevent
+
+    This must be called after the gevent monkey patching and before any connection is opened.
+    '''
+    if not hasattr(extensions, 'set_wait_callback'):
+        raise ImportError('psycopg2 version does not support wait callbacks (coroutines)')
+    extensions.set_wait_callback(gevent_wait_callback)
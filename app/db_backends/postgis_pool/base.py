@@ -0,0 +1,84 @@
+'''PostGIS database backend with a process wide connection pool
+
+Django opens a new connection for every request (or thread/greenlet with CONN_MAX_AGE), with the
+gevent worker this means one connection per concurrent request. This backend instead borrows the
+connections from a pool shared by all greenlets of the process and returns them to the pool when
+django closes them (e.g. at the end of the request).
+
+The pool is configured with the DB_POOL_* settings, see config/settings_prod.py.
+'''
+import logging
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.contrib.gis.db.backends.postgis.base import DatabaseWrapper as PostGISDatabaseWrapper
+
+from .pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Connection pools per database alias and connection parameters
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, conn_params):
+    '''Returns the connection pool of a database, creating it if needed
+
+    Args:
+        alias: string
+            Database alias
+        conn_params: dict
+            psycopg2 connection parameters
+
+    Returns: ConnectionPool
+        The connection pool
+    '''
+    # The test database and the no db connections use the same alias with other parameters
+    key = (alias, repr(sorted(conn_params.items())))
+    with _pools_lock:
+        if key not in _pools:
+            logger.debug('Creating %s connection pool of size %d', alias, settings.DB_POOL_SIZE)
+            _pools[key] = ConnectionPool(
+                alias,
+                size=settings.DB_POOL_SIZE,
+                timeout=settings.DB_POOL_TIMEOUT,
+                check_seconds=settings.DB_POOL_CHECK_SECONDS,
+                max_age=settings.DB_POOL_MAX_AGE
+            )
+        return _pools[key]
+
+
+def close_pools():
+    '''Close the idle connections of all pools'''
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_idle()
+
+
+class DatabaseWrapper(PostGISDatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self.alias, conn_params)
+        connection, is_new = self.pool.acquire(partial(super().get_new_connection, conn_params))
+        if not is_new:
+            # Done by the parent get_new_connection() for new connections
+            self.isolation_level = self.settings_dict['OPTIONS'].get(
+                'isolation_level', connection.isolation_level
+            )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                if self.in_atomic_block:
+                    # The connection is still referenced until the end of the atomic block, don't
+                    # reuse it (the pool discards closed connections)
+                    self.connection.close()
+                self.pool.release(self.connection)
@@ -0,0 +1,219 @@
+import logging
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from prometheus_client import Counter
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+from psycopg2 import extensions
+
+logger = logging.getLogger(__name__)
+
+# NOTE: with the gevent monkey patching, the threading primitives are greenlet aware, therefore
+# a greenlet waiting for a connection yields to the others.
+
+POOL_CONNECTIONS = Gauge(
+    'django_db_pool_connections',
+    'Number of connections of the database connection pool',
+    ['alias', 'state'],
+)
+POOL_WAITING = Gauge(
+    'django_db_pool_waiting',
+    'Number of requests (greenlets) waiting for a connection of the pool',
+    ['alias'],
+)
+POOL_WAIT_SECONDS = Histogram(
+    'django_db_pool_wait_seconds',
+    'Time spent waiting for a connection of the pool',
+    ['alias'],
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, float('inf')),
+)
+POOL_TIMEOUTS = Counter(
+    'django_db_pool_timeouts_total',
+    'Number of times no connection of the pool could be obtained in time',
+    ['alias'],
+)
+POOL_DISCARDED = Counter(
+    'django_db_pool_discarded_total',
+    'Number of connections closed by the pool',
+    ['alias', 'reason'],
+)
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    pass
+
+
+class ConnectionPool:
+    '''Bounded pool of psycopg2 connections
+
+    At most `size` connections are in use at the same time, the requests exceeding it wait up to
+    `timeout` seconds for a connection to be released. The idle connections are reused LIFO and
+    are health checked before being reused when they have been idle for more than `check_seconds`.
+    Connections older than `max_age` seconds or in a broken state are closed.
+    '''
+
+    def __init__(self, alias, size, timeout, check_seconds, max_age):
+        '''
+        Args:
+            alias: string
+                Database alias, used for the logs and metrics
+            size: int
+                Maximum number of connections
+            timeout: float
+                Maximum time to wait for a connection in seconds
+            check_seconds: float
+                Idle time in seconds after which a connection is checked before being reused
+            max_age: float
+                Maximum lifetime of a connection in seconds
+        '''
+        self.alias = alias
+        self.size = size
+        self.timeout = timeout
+        self.check_seconds = check_seconds
+        self.max_age = max_age
+        self._slots = threading.BoundedSemaphore(size)
+        # idle connections: (connection, created_at, released_at)
+        self._idle = deque()
+        # creation time of the connections in use: {id(connection): created_at}
+        self._in_use = {}
+        self._lock = threading.Lock()
+
+    def _update_metrics(self):
+        POOL_CONNECTIONS.labels(self.alias, 'idle').set(len(self._idle))
+        POOL_CONNECTIONS.labels(self.alias, 'in_use').set(len(self._in_use))
+
+    def _discard(self, connection, reason):
+        POOL_DISCARDED.labels(self.alias, reason).inc()
+        logger.debug('Closing %s pool connection (%s)', self.alias, reason)
+        try:
+            connection.close()
+        except psycopg2.Error as error:
+            logger.warning('Failed to close %s pool connection: %s', self.alias, error)
+
+    def _is_healthy(self, connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except psycopg2.Error as error:
+            logger.warning('%s pool connection failed its health check: %s', self.alias, error)
+            return False
+        return True
+
+    def _get_idle(self):
+        '''Returns a healthy idle connection and its creation time or (None, None)'''
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None, None
+                connection, created_at, released_at = self._idle.pop()
+            now = time.monotonic()
+            if connection.closed:
+                self._discard(connection, 'closed')
+            elif now - created_at >= self.max_age:
+                self._discard(connection, 'expired')
+            elif now - released_at >= self.check_seconds and not self._is_healthy(connection):
+                self._discard(connection, 'unhealthy')
+            else:
+                return connection, created_at
+
+    def acquire(self, connect):
+        '''Returns a connection of the pool
+
+        Args:
+            connect: callable
+                Function opening a new connection, used when no idle connection is available
+
+        Returns: (connection, bool)
+            The connection and True if it is a newly opened connection
+
+        Raises:
+            PoolTimeout: when no connection was released in time
+        '''
+        POOL_WAITING.labels(self.alias).inc()
+        start = time.monotonic()
+        try:
+            acquired = self._slots.acquire(timeout=self.timeout)
+        finally:
+            POOL_WAITING.labels(self.alias).dec()
+            POOL_WAIT_SECONDS.labels(self.alias).observe(time.monotonic() - start)
+        if not acquired:
+            POOL_TIMEOUTS.labels(self.alias).inc()
+            logger.error(
+                'No %s pool connection available after %.1fs (pool size %d)',
+                self.alias,
+                self.timeout,
+                self.size
+            )
+            raise PoolTimeout(
+                f'No database connection available after {self.timeout}s (pool size {self.size})'
+            )
+
+        try:
+            connection, created_at = self._get_idle()
+            is_new = connection is None
+            if is_new:
+                connection = connect()
+                created_at = time.monotonic()
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_use[id(connection)] = created_at
+            self._update_metrics()
+        return connection, is_new
+
+    def release(self, connection):
+        '''Returns a connection to the pool
+
+        A connection with a pending transaction is rolled back, broken and expired connections
+        are closed.
+
+        Args:
+            connection: psycopg2 connection
+                Connection obtained with acquire()
+        '''
+        with self._lock:
+            created_at = self._in_use.pop(id(connection), None)
+        try:
+            if created_at is None:
+                # Not a connection of this pool (e.g. the pool has been reset)
+                self._discard(connection, 'unknown')
+                return
+            reason = None
+            if connection.closed:
+                reason = 'closed'
+            elif time.monotonic() - created_at >= self.max_age:
+                reason = 'expired'
+            else:
+                status = connection.get_transaction_status()
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    reason = 'broken'
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    try:
+                        connection.rollback()
+                    except psycopg2.Error:
+                        reason = 'broken'
+            if reason:
+                self._discard(connection, reason)
+            else:
+                with self._lock:
+                    self._idle.append((connection, created_at, time.monotonic()))
+        finally:
+            if created_at is not None:
+                self._slots.release()
+            with self._lock:
+                self._update_metrics()
+
+    def close_idle(self):
+        '''Close all idle connections of the pool'''
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._update_metrics()
+        for connection, _, _ in idle:
+            self._discard(connection, 'closed_idle')
@@ -0,0 +1,156 @@
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+STAC_BASE_V = settings.STAC_BASE_V
+
+# Request state, NOTE: with gevent the thread local are greenlet local
+_state = threading.local()
+
+# Replicas availability per process: {alias: (checked_at, available)}
+_replicas_availability = {}
+
+
+def get_replica_lag(alias):
+    '''Returns the replication lag of a replica in seconds
+
+    Args:
+        alias: string
+            Replica database alias
+
+    Returns: float
+        Replication lag in seconds, 0 when the replica has replayed all received WAL or when the
+        database is not a replica.
+    '''
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+            'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+        )
+        lag = cursor.fetchone()[0]
+    return float(lag or 0)
+
+
+def is_replica_available(alias):
+    '''Check if a replica is available and its replication lag is acceptable
+
+    The check is done at most every DB_REPLICA_CHECK_SECONDS per process.
+
+    Args:
+        alias: string
+            Replica database alias
+
+    Returns: bool
+        True if the replica can be used
+    '''
+    now = time.monotonic()
+    checked_at, available = _replicas_availability.get(alias, (None, False))
+    if checked_at is not None and now - checked_at < settings.DB_REPLICA_CHECK_SECONDS:
+        return available
+    try:
+        lag = get_replica_lag(alias)
+        available = lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+        if not available:
+            logger.warning(
+                'Database replica %s lag of %.1fs is too big, use primary instead', alias, lag
+            )
+    except DatabaseError as error:
+        logger.error('Database replica %s not available, use primary instead: %s', alias, error)
+        available = False
+    _replicas_availability[alias] = (now, available)
+    return available
+
+
+def get_replica():
+    '''Returns the alias of an available replica
+
+    Returns: string | None
+        Replica database alias or None if no replica is available
+    '''
+    replicas = [alias for alias in settings.DB_REPLICAS if is_replica_available(alias)]
+    if not replicas:
+        return None
+    return random.choice(replicas)
+
+
+class ReplicaRouter:
+    '''Database router for the read replicas
+
+    The reads of safe requests (e.g. GET/HEAD) are routed to a replica (see DBReplicaMiddleware),
+    all other reads and all writes are routed to the primary (default database).
+    '''
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance', None)
+        if instance is not None and instance._state.db:  # pylint: disable=protected-access
+            return instance._state.db  # pylint: disable=protected-access
+        if not getattr(_state, 'use_replica', False):
+            return 'default'
+        if getattr(_state, 'replica', None) is None:
+            # Select the replica once per request for consistent reads
+            _state.replica = get_replica() or 'default'
+        return _state.replica
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class DBReplicaMiddleware:
+    '''Middleware that routes the safe requests (GET, HEAD, OPTIONS and POST /search) to the read
+    replicas
+
+    To read its own writes, a client that did an unsafe request (e.g. PUT, PATCH, POST) gets a
+    cookie and its requests are routed to the primary for DB_REPLICA_STICKY_SECONDS.
+
+    NOTE: this middleware must be placed before any middleware accessing the DB
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def is_safe(self, request):
+        # POST /search is a read only request
+        return request.method in ('GET', 'HEAD', 'OPTIONS') or (
+            request.method == 'POST' and request.path == f'/{STAC_BASE_V}/search'
+        )
+
+    def __call__(self, request):
+        # Code to be executed for each request before
+        # the view (and later middleware) are called.
+        _state.use_replica = (
+            bool(settings.DB_REPLICAS) and self.is_safe(request) and
+            settings.DB_REPLICA_STICKY_COOKIE not in request.COOKIES
+        )
+        _state.replica = None
+
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.use_replica = False
+            _state.replica = None
+
+        # Code to be executed for each request/response after
+        # the view is called.
+        if settings.DB_REPLICAS and not self.is_safe(request):
+            response.set_cookie(
+                settings.DB_REPLICA_STICKY_COOKIE,
+                '1',
+                max_age=settings.DB_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax'
+            )
+
+        return response
@@ -1,13 +1,21 @@
 import logging
 import time
 
-from django.contrib.gis.db.models import Extent
 from django.contrib.gis.geos import GEOSGeometry
 from django.contrib.gis.geos import Polygon
 from django.contrib.gis.geos.error import GEOSException
+from django.db.models import F
 
 logger = logging.getLogger(__name__)
 
+# Item bbox fields of the collection extent edges (xmin, ymin, xmax, ymax): (field, is_max)
+BBOX_EDGES = [
+    ('bbox_xmin', False),
+    ('bbox_ymin', False),
+    ('bbox_xmax', True),
+    ('bbox_ymax', True),
+]
+
 
 class CollectionSpatialExtentMixin():
 
@@ -63,75 +71,40 @@ class CollectionSpatialExtentMixin():
 
             # update
             if trigger == 'update' and geometry != original_geometry:
-                # is the new bbox larger than (and covering) the existing
-                if Polygon.from_bbox(GEOSGeometry(geometry).extent).covers(self.extent_geometry):
-                    logger.info(
-                        'Updating collections extent_geometry with item geometry changed '
-                        'from %s to %s, (larger and covering bbox)',
-                        GEOSGeometry(original_geometry).extent,
-                        GEOSGeometry(geometry).extent,
-                        extra={
-                            'collection': self.name, 'item': item.name, 'trigger': 'item-update'
-                        },
-                    )
-                    self.extent_geometry = Polygon.from_bbox(GEOSGeometry(geometry).extent)
-                # we need to iterate trough the items
-                else:
-                    logger.warning(
-                        'Updating collections extent_geometry with item geometry changed '
-                        'from %s to %s. We need to loop over all items of the collection, '
-                        'this may take a while !',
-                        GEOSGeometry(original_geometry).extent,
-                        GEOSGeometry(geometry).extent,
-                        extra={
-                            'collection': self.name, 'item': item.name, 'trigger': 'item-update'
-                        },
-                    )
-                    start = time.time()
-                    bbox_other_items = type(item).objects.filter(collection_id=self.pk).exclude(
-                        id=item.pk
-                    ).only('geometry', 'collection').aggregate(Extent('geometry'))
-                    geometry_updated_item = GEOSGeometry(geometry)
-
-                    if bool(bbox_other_items['geometry__extent']):
-                        geometry_other_items = GEOSGeometry(
-                            Polygon.from_bbox(bbox_other_items['geometry__extent'])
-                        )
-                        self.extent_geometry = Polygon.from_bbox(
-                            geometry_updated_item.union(geometry_other_items).extent
-                        )
-                    else:
-                        self.extent_geometry = geometry_updated_item
-                    logger.info(
-                        'Collection extent_geometry updated to %s in %ss, after item update',
-                        self.extent_geometry.extent,
-                        time.time() - start,
-                        extra={
-                            'collection': self.name, 'item': item.name, 'trigger': 'item-update'
-                        },
-                    )
+                logger.info(
+                    'Updating collections extent_geometry with item geometry changed '
+                    'from %s to %s',
+                    GEOSGeometry(original_geometry).extent,
+                    GEOSGeometry(geometry).extent,
+                    extra={
+                        'collection': self.name, 'item': item.name, 'trigger': 'item-update'
+                    },
+                )
+                start = time.time()
+                self._update_bbox_extent_edges(
+                    item, GEOSGeometry(original_geometry).extent, GEOSGeometry(geometry).extent
+                )
+                logger.info(
+                    'Collection extent_geometry updated to %s in %ss, after item update',
+                    self.extent_geometry.extent,
+                    time.time() - start,
+                    extra={
+                        'collection': self.name, 'item': item.name, 'trigger': 'item-update'
+                    },
+                )
                 updated |= True
 
-            # delete, we need to iterate trough the items
+            # delete
             if trigger == 'delete':
-                logger.warning(
-                    'Updating collections extent_geometry with removal of item geometry %s. '
-                    'We need to loop over all items of the collection, this may take a while !',
+                logger.info(
+                    'Updating collections extent_geometry with removal of item geometry %s',
                     GEOSGeometry(geometry).extent,
                     extra={
                         'collection': self.name, 'item': item.name, 'trigger': 'item-delete'
                     },
                 )
                 start = time.time()
-                bbox_other_items = type(item).objects.filter(collection_id=self.pk).exclude(
-                    id=item.pk
-                ).only('geometry', 'collection').aggregate(Extent('geometry'))
-                if bool(bbox_other_items['geometry__extent']):
-                    self.extent_geometry = GEOSGeometry(
-                        Polygon.from_bbox(bbox_other_items['geometry__extent'])
-                    )
-                else:
-                    self.extent_geometry = None
+                self._update_bbox_extent_edges(item, GEOSGeometry(geometry).extent, None)
                 logger.info(
                     'Collection extent_geometry updated to %s in %ss, after item deletion',
                     self.extent_geometry.extent if self.extent_geometry else None,
@@ -161,3 +134,101 @@ class CollectionSpatialExtentMixin():
                 f'{item.name}: {error}'
             ) from error
         return updated
+
+    def update_bbox_extent_on_items_insert(self, items):
+        '''Updates the collection's spatial extent with a batch of inserted items
+
+        Args:
+            items: list[Item]
+                the inserted items, with their bbox fields updated (see Item.update_bbox())
+
+        Returns:
+            bool: True if the collection spatial extent has been updated, false otherwise
+        '''
+        bboxes = [item.bbox for item in items if item.bbox is not None]
+        if not bboxes:
+            return False
+        if self.extent_geometry is not None:
+            bboxes.append(GEOSGeometry(self.extent_geometry).extent)
+        extent = (
+            min(bbox[0] for bbox in bboxes),
+            min(bbox[1] for bbox in bboxes),
+            max(bbox[2] for bbox in bboxes),
+            max(bbox[3] for bbox in bboxes),
+        )
+        logger.info(
+            'Updating collections extent_geometry to %s, triggered by the insertion of %d items',
+            extent,
+            len(items),
+            extra={
+                'collection': self.name, 'trigger': 'item-insert'
+            },
+        )
+        self.extent_geometry = Polygon.from_bbox(extent)
+        return True
+
+    def _update_bbox_extent_edges(self, item, old_bbox, new_bbox):
+        '''Updates the collection's spatial extent when an item bbox is changed or removed
+
+        The item defines an edge of the collection extent when its old bbox lies on this edge.
+        Only those edges are recomputed from the other items of the collection, each with an
+        index scan on (collection, bbox_*) that returns the first row (ORDER BY ... LIMIT 1). The
+        other edges are kept as they are, then the new item bbox is added to the extent.
+
+        Args:
+            item: Item
+                the item being updated or deleted
+            old_bbox: tuple
+                the original item bbox (xmin, ymin, xmax, ymax)
+            new_bbox: tuple | None
+                the new item bbox (xmin, ymin, xmax, ymax), None when the item is deleted
+        '''
+        if self.extent_geometry is None:
+            edges = [None] * 4
+        else:
+            edges = list(GEOSGeometry(self.extent_geometry).extent)
+
+        for i, (field, is_max) in enumerate(BBOX_EDGES):
+            if edges[i] is None:
+                continue
+            on_edge = old_bbox[i] >= edges[i] if is_max else old_bbox[i] <= edges[i]
+            moved_inward = new_bbox is None or (
+                new_bbox[i] < edges[i] if is_max else new_bbox[i] > edges[i]
+            )
+            if on_edge and moved_inward:
+                edges[i] = self._get_bbox_extent_edge(item, field, is_max)
+
+        if new_bbox is not None:
+            edges = [
+                bound if edge is None else (max(edge, bound) if is_max else min(edge, bound))
+                for edge,
+                bound, (field, is_max) in zip(edges, new_bbox, BBOX_EDGES)
+            ]
+
+        if None in edges:
+            # no items left in the collection
+            self.extent_geometry = None
+        else:
+            self.extent_geometry = Polygon.from_bbox(edges)
+
+    def _get_bbox_extent_edge(self, item, field, is_max):
+        '''Returns the bbox edge of all the other items of the collection
+
+        Args:
+            item: Item
+                the item to exclude
+            field: string
+                the item bbox field, e.g. 'bbox_xmin'
+            is_max: bool
+                True to get the maximum value, false to get the minimum
+
+        Returns:
+            float | None: the bbox edge, None if there are no other items
+        '''
+        logger.debug(
+            'Recomputing collection extent %s edge', field, extra={'collection': self.name}
+        )
+        items = type(item).objects.filter(collection_id=self.pk).exclude(id=item.pk)
+        items = items.filter(**{f'{field}__isnull': False})
+        order = F(field).desc() if is_max else F(field).asc()
+        return items.order_by(order).values_list(field, flat=True).first()
@@ -1,26 +1,66 @@
+import json
 import logging
 
-import numpy as np
+from django.apps import apps
+from django.db import connection
 
 logger = logging.getLogger(__name__)
 
 UPDATE_SUMMARIES_FIELDS = ["eo_gsd", "geoadmin_variant", "proj_epsg"]
 
+# Collection summaries key => (asset field, value type), in the UPDATE_SUMMARIES_FIELDS order
+SUMMARIES_FIELDS = {
+    'eo:gsd': ('eo_gsd', float),
+    'geoadmin:variant': ('geoadmin_variant', str),
+    'proj:epsg': ('proj_epsg', int),
+}
 
-def float_in(flt, floats, **kwargs):
-    '''This function is needed for comparing floats in order to check if a
-    given float is member of a list of floats.
+
+def is_summary_value(value):
+    '''Returns True if the asset value is part of the collection summaries (not null or empty)
+    '''
+    return value is not None and value != ''
+
+
+def get_summary_values_sql(asset_table, item_table, where):
+    '''Returns the SQL query counting the assets per summary value
+
+    Args:
+        asset_table: string
+            Asset DB table name
+        item_table: string
+            Item DB table name
+        where: string
+            SQL condition on the assets (`asset`) and their item (`item`)
+
+    Returns:
+        string: SQL query returning the collection_id, field, value (jsonb) and asset_count
     '''
-    return np.any(np.isclose(flt, floats, **kwargs))
+    return ' UNION ALL '.join(
+        f'''
+        SELECT item.collection_id, '{key}' AS field, to_jsonb(asset.{attribute}) AS value,
+               count(*) AS asset_count
+        FROM {asset_table} AS asset JOIN {item_table} AS item ON item.id = asset.item_id
+        WHERE ({where}) AND asset.{attribute} IS NOT NULL AND asset.{attribute}::text <> ''
+        GROUP BY item.collection_id, asset.{attribute}
+        ''' for key, (attribute, _type) in SUMMARIES_FIELDS.items()
+    )
 
 
 class CollectionSummariesMixin():
+    '''Collection summaries maintained with the number of assets per summary value
+
+    The number of assets of the collection per summary value is kept in the CollectionSummaryValue
+    table and updated incrementally on each asset write. The collection summaries only need to be
+    updated when a value count goes from 0 to 1 or from 1 to 0, they are then derived from the
+    values with a non zero count.
+    '''
 
     def update_summaries(self, asset, trigger, old_values=None):
         '''Updates the collection's summaries if needed when assets are updated or deleted.
 
-        For all the given parameters this function checks, if the corresponding parameters of the
-        collection need to be updated. If so, they will be updated.
+        The assets count of the asset's old and new summary values are updated and when a value
+        appears or disappears from the collection, the summaries are updated.
 
         Args:
             asset:
@@ -33,14 +73,14 @@ class CollectionSummariesMixin():
         Returns:
             bool: True if the collection summaries has been updated, false otherwise
         '''
-
+        new_values = [getattr(asset, field) for field in UPDATE_SUMMARIES_FIELDS]
         logger.debug(
             'Collection update summaries: '
             'trigger=%s, asset=%s, old_values=%s, new_values=%s, current_summaries=%s',
             trigger,
             asset,
             old_values,
-            [asset.eo_gsd, asset.geoadmin_variant, asset.proj_epsg],
+            new_values,
             self.summaries,
             extra={
                 'collection': self.name,
@@ -49,348 +89,120 @@ class CollectionSummariesMixin():
             },
         )
 
-        if trigger == 'delete':
-            return self._update_summaries_on_asset_delete(asset)
-        if trigger == 'update':
-            return self._update_summaries_on_asset_update(asset, old_values)
         if trigger == 'insert':
-            return self._update_summaries_on_asset_insert(asset)
-        raise ValueError(f'Invalid trigger parameter: {trigger}')
-
-    def _update_summaries_on_asset_delete(self, asset):
-        '''Updates the collection's summaries if needed  on an asset's deletion
-
-        Args:
-            asset: asset thats being deleted
-
-            For all the given parameters this function checks, if the corresponding
-            parameters of the collection need to be updated. If so, they will be either
-            updated or an error will be raised, if updating fails.
-
-        Returns:
-            bool: True if the collection summaries has been updated, false otherwise
-        '''
-        updated = False
-        assets = type(asset).objects.filter(item__collection_id=self.pk).exclude(
-            id=asset.id
-        ).only('geoadmin_variant', 'proj_epsg', 'eo_gsd')
-        if assets.exists():
-            for key, attribute in [('geoadmin:variant', 'geoadmin_variant'),
-                                   ('proj:epsg', 'proj_epsg'),
-                                   ('eo:gsd', 'eo_gsd')]:
-                attribute_value = getattr(asset, attribute)
-                if (
-                    not assets.filter(**{
-                        attribute: attribute_value
-                    }).exists() and attribute_value is not None and
-                    attribute_value in self.summaries[key]
-                ):
-                    logger.info(
-                        'Removing %s %s from collection summaries',
-                        key,
-                        attribute_value,
-                        extra={
-                            'collection': self.name,
-                            'item': asset.item.name,
-                            'asset': asset.name,
-                            'trigger': 'asset-delete'
-                        }
-                    )
-                    self.summaries[key].remove(attribute_value)
-                    updated |= True
-        else:
-            logger.info(
-                'Clearing the collection summaries',
-                extra={
-                    'collection': self.name,
-                    'item': asset.item.name,
-                    'asset': asset.name,
-                    'trigger': 'asset-delete'
-                }
-            )
-            # asset was the last item in the collection
-            self.summaries["geoadmin:variant"] = []
-            self.summaries["proj:epsg"] = []
-            self.summaries["eo:gsd"] = []
-            updated |= True
-
-        return updated
-
-    def _update_summaries_on_asset_insert(self, asset):
-        '''Updates the collection's summaries if needed on an asset's insertion
-
-        Args:
-            asset: asset thats being inserted
-            For all the given parameters this function checks, if the corresponding
-            parameters of the collection need to be updated. If so, they will be either
-            updated or an error will be raised, if updating fails.
-
-        Returns:
-            bool: True if the collection summaries has been updated, false otherwise
-        '''
-        updated = False
-        if (
-            asset.geoadmin_variant and
-            asset.geoadmin_variant not in self.summaries["geoadmin:variant"]
-        ):
-            logger.info(
-                'Adds geoadmin:variant %s to collection summaries',
-                asset.geoadmin_variant,
-                extra={
-                    'collection': self.name,
-                    'item': asset.item.name,
-                    'asset': asset.name,
-                    'trigger': 'asset-insert'
-                }
-            )
-            self.summaries["geoadmin:variant"].append(asset.geoadmin_variant)
-            self.summaries["geoadmin:variant"].sort()
-            updated |= True
-
-        if asset.proj_epsg is not None and asset.proj_epsg not in self.summaries["proj:epsg"]:
-            logger.info(
-                'Adds proj:epsg %s to collection summaries',
-                asset.proj_epsg,
-                extra={
-                    'collection': self.name,
-                    'item': asset.item.name,
-                    'asset': asset.name,
-                    'trigger': 'asset-insert'
-                }
-            )
-            self.summaries["proj:epsg"].append(asset.proj_epsg)
-            self.summaries["proj:epsg"].sort()
-            updated |= True
-
-        if asset.eo_gsd is not None and not float_in(asset.eo_gsd, self.summaries["eo:gsd"]):
-            logger.info(
-                'Adds eo:gsd %s to collection summaries',
-                asset.proj_epsg,
-                extra={
-                    'collection': self.name,
-                    'item': asset.item.name,
-                    'asset': asset.name,
-                    'trigger': 'asset-insert'
-                }
-            )
-            self.summaries["eo:gsd"].append(asset.eo_gsd)
-            self.summaries["eo:gsd"].sort()
-            updated |= True
-
-        return updated
-
-    def _update_summaries_geoadmin_variant_on_update(
-        self, assets, asset, geoadmin_variant, original_geoadmin_variant
-    ):
-        '''Updates the collection's geoadmin:variant summary if needed on an asset's update
-
-        For the given geoadmin:variant parameter this function checks, if the collection's
-        geoadmin:variant summary needs to be updated. If so, it will be updated.
-
-        Args:
-            assets: QuerySet
-                Assets queryset of all other collection's assets (excluding the one that trigger
-                this update)
-            asset: Asset
-                asset thats being updated
-            geoadmin_variant: int
-                New asset's geoadmin:variant value
-            original_geoadmin_variant: int
-                Original asset's geoadmin:variant value
-
-        Returns:
-            bool: True if the collection summaries has been updated, false otherwise
-        '''
-        updated = False
-
-        if geoadmin_variant and geoadmin_variant not in self.summaries["geoadmin:variant"]:
-            logger.info(
-                'Adds geoadmin:variant %s to collection summaries',
-                geoadmin_variant,
-                extra={
-                    'collection': self.name,
-                    'item': asset.item.name,
-                    'asset': asset.name,
-                    'trigger': 'asset-update'
-                }
-            )
-            self.summaries["geoadmin:variant"].append(geoadmin_variant)
-            updated |= True
-
-        # check if the asset's original value is still present in other
-        # assets and can remain in the summaries or has to be deleted:
-        if ((
-            not assets.exists() or
-            not assets.filter(geoadmin_variant=original_geoadmin_variant).exists()
-        ) and original_geoadmin_variant is not None):
-            logger.info(
-                'Removes original geoadmin:variant value %s from collection summaries',
-                original_geoadmin_variant,
-                extra={
-                    'collection': self.name,
-                    'item': asset.item.name,
-                    'asset': asset.name,
-                    'trigger': 'asset-update'
-                }
-            )
-            self.summaries["geoadmin:variant"].remove(original_geoadmin_variant)
-            updated |= True
-
-        if updated:
-            self.summaries["geoadmin:variant"].sort()
-
-        return updated
-
-    def _update_summaries_proj_epsg_on_update(self, assets, asset, proj_epsg, original_proj_epsg):
-        '''Updates the collection's proj:epsg summary if needed on an asset's update
+            old_values = [None] * len(UPDATE_SUMMARIES_FIELDS)
+        elif trigger == 'delete':
+            old_values = new_values
+            new_values = [None] * len(UPDATE_SUMMARIES_FIELDS)
+        elif trigger != 'update':
+            raise ValueError(f'Invalid trigger parameter: {trigger}')
+
+        increments = []
+        decrements = []
+        for key, old_value, new_value in zip(SUMMARIES_FIELDS, old_values, new_values):
+            if old_value == new_value:
+                continue
+            if is_summary_value(old_value):
+                decrements.append((key, old_value))
+            if is_summary_value(new_value):
+                increments.append((key, new_value))
+
+        if not self._update_summary_counts(increments, decrements):
+            return False
+
+        summaries = self._get_summaries_from_counts()
+        logger.info(
+            'Collection summaries updated from %s to %s',
+            self.summaries,
+            summaries,
+            extra={
+                'collection': self.name,
+                'item': asset.item.name,
+                'asset': asset.name,
+                'trigger': f'asset-{trigger}'
+            }
+        )
+        self.summaries = summaries
+        return True
 
-        For the given proj:epsg parameter this function checks, if the collection's proj:epsg
-        summary needs to be updated. If so, it will be updated.
+    def rebuild_summaries(self):
+        '''Rebuild the assets count per summary value and the summaries of the collection
 
-        Args:
-            assets: QuerySet
-                Assets queryset of all other collection's assets (excluding the one that trigger
-                this update)
-            asset: Asset
-                asset thats being updated
-            proj_epsg: int
-                New asset's proj:epsg value
-            original_proj_epsg: int
-                Original asset's proj:epsg value
+        Unlike update_summaries(), this goes through all the assets of the collection.
 
         Returns:
             bool: True if the collection summaries has been updated, false otherwise
         '''
-        updated = False
-
-        if proj_epsg is not None and proj_epsg not in self.summaries["proj:epsg"]:
-            logger.info(
-                'Adds proj:epsg value %s from collection summaries',
-                proj_epsg,
-                extra={
-                    'collection': self.name,
-                    'item': asset.item.name,
-                    'asset': asset.name,
-                    'trigger': 'asset-update'
-                }
+        table = self._get_summary_values_table()
+        values_sql = get_summary_values_sql(
+            apps.get_model('stac_api', 'Asset')._meta.db_table,
+            apps.get_model('stac_api', 'Item')._meta.db_table,
+            'item.collection_id = %(collection)s'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {table} WHERE collection_id = %(collection)s',
+                {'collection': self.pk}
             )
-            self.summaries["proj:epsg"].append(proj_epsg)
-            updated |= True
-
-        if (
-            not assets.exists() or not assets.filter(proj_epsg=original_proj_epsg).exists()
-        ) and original_proj_epsg is not None:
-            logger.info(
-                'Removes original proj:epsg value %s from collection summaries',
-                original_proj_epsg,
-                extra={
-                    'collection': self.name,
-                    'item': asset.item.name,
-                    'asset': asset.name,
-                    'trigger': 'asset-update'
-                }
+            cursor.execute(
+                f'INSERT INTO {table} (collection_id, field, value, asset_count) {values_sql}',
+                {'collection': self.pk}
             )
-            self.summaries["proj:epsg"].remove(original_proj_epsg)
-            updated |= True
-
-        if updated:
-            self.summaries["proj:epsg"].sort()
+        summaries = self._get_summaries_from_counts()
+        if summaries == self.summaries:
+            return False
+        self.summaries = summaries
+        return True
 
-        return updated
+    def _get_summary_values_table(self):
+        return apps.get_model('stac_api', 'CollectionSummaryValue')._meta.db_table
 
-    def _update_summaries_eo_gsd_on_update(self, assets, asset, eo_gsd, original_eo_gsd):
-        '''Updates the collection's eo:gsd summary if needed on an asset's update
-
-        For the given eo:gsd parameter this function checks, if the collection's eo:gsd summary
-        needs to be updated. If so, it will be updated.
+    def _update_summary_counts(self, increments, decrements):
+        '''Increments and decrements the assets count of summary values
 
         Args:
-            assets: QuerySet
-                Assets queryset of all other collection's assets (excluding the one that trigger
-                this update)
-            asset: Asset
-                asset thats being updated
-            eo_gsd: int
-                New asset's eo:gsd value
-            original_eo_gsd: int
-                Original asset's eo:gsd value
+            increments: list((string, value))
+                List of summaries (key, value) which counts must be incremented
+            decrements: list((string, value))
+                List of summaries (key, value) which counts must be decremented
 
         Returns:
-            bool: True if the collection summaries has been updated, false otherwise
+            bool: True if a value appeared (count from 0 to 1) or disappeared (count from 1 to 0)
         '''
-        updated = False
-
-        if eo_gsd is not None and not float_in(eo_gsd, self.summaries["eo:gsd"]):
-            logger.info(
-                'Adds eo:gsd value %s from collection summaries',
-                eo_gsd,
-                extra={
-                    'collection': self.name,
-                    'item': asset.item.name,
-                    'asset': asset.name,
-                    'trigger': 'asset-update'
-                }
-            )
-            self.summaries["eo:gsd"].append(eo_gsd)
-            updated |= True
-
-        if (
-            not assets.exists() or not assets.filter(eo_gsd=original_eo_gsd).exists()
-        ) and original_eo_gsd is not None:
-            logger.info(
-                'Removes original eo:gsd value %s from collection summaries',
-                original_eo_gsd,
-                extra={
-                    'collection': self.name,
-                    'item': asset.item.name,
-                    'asset': asset.name,
-                    'trigger': 'asset-update'
-                }
-            )
-            self.summaries["eo:gsd"].remove(original_eo_gsd)
-            updated |= True
-
-        if updated:
-            self.summaries["eo:gsd"].sort()
-
-        return updated
-
-    def _update_summaries_on_asset_update(self, asset, old_values):
-        '''Updates the collection's summaries if needed on an asset's update
-
-        For all the given parameters this function checks, if the corresponding
-        parameters of the collection need to be updated. If so, they will be updated.
-
-        Args:
-            asset: Asset
-                asset thats being updated
-            old_values: list (optional)
-                list with the original values of asset's; [eo_gsd, geoadmin_variant, proj_epsg].
-
-        Returns:
-            bool: True if the collection summaries has been updated, false otherwise
+        table = self._get_summary_values_table()
+        changed = False
+        with connection.cursor() as cursor:
+            for key, value in increments:
+                cursor.execute(
+                    f'''
+                    INSERT INTO {table} (collection_id, field, value, asset_count)
+                    VALUES (%s, %s, %s::jsonb, 1)
+                    ON CONFLICT (collection_id, field, value)
+                    DO UPDATE SET asset_count = {table}.asset_count + 1
+                    RETURNING asset_count
+                    ''', [self.pk, key, json.dumps(value)]
+                )
+                changed |= cursor.fetchone()[0] == 1
+            for key, value in decrements:
+                cursor.execute(
+                    f'''
+                    UPDATE {table} SET asset_count = asset_count - 1
+                    WHERE collection_id = %s AND field = %s AND value = %s::jsonb
+                        AND asset_count > 0
+                    RETURNING asset_count
+                    ''', [self.pk, key, json.dumps(value)]
+                )
+                row = cursor.fetchone()
+                changed |= row is not None and row[0] == 0
+        return changed
+
+    def _get_summaries_from_counts(self):
+        '''Returns the collection summaries derived from the values with a non zero assets count
         '''
-        updated = False
-        original_eo_gsd = old_values[0]
-        original_geoadmin_variant = old_values[1]
-        original_proj_epsg = old_values[2]
-
-        assets = type(asset).objects.filter(item__collection_id=self.pk).exclude(
-            id=asset.id
-        ).only('geoadmin_variant', 'proj_epsg', 'eo_gsd')
-        if original_geoadmin_variant != asset.geoadmin_variant:
-            updated |= self._update_summaries_geoadmin_variant_on_update(
-                assets, asset, asset.geoadmin_variant, original_geoadmin_variant
-            )
-
-        if original_proj_epsg != asset.proj_epsg:
-            updated |= self._update_summaries_proj_epsg_on_update(
-                assets, asset, asset.proj_epsg, original_proj_epsg
-            )
-
-        if original_eo_gsd != asset.eo_gsd:
-            updated |= self._update_summaries_eo_gsd_on_update(
-                assets, asset, asset.eo_gsd, original_eo_gsd
-            )
-
-        return updated
+        summaries = {key: [] for key in SUMMARIES_FIELDS}
+        values = self.summary_values.filter(asset_count__gt=0).values_list('field', 'value')
+        for key, value in values:
+            summaries[key].append(SUMMARIES_FIELDS[key][1](value))
+        for value_list in summaries.values():
+            value_list.sort()
+        return summaries
@@ -0,0 +1,267 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.gis.geos import Polygon
+from django.db import DatabaseError
+from django.db import connection
+from django.db import connections
+from django.db import transaction
+from django.utils import timezone
+
+from stac_api.etag_cache import invalidate_etag
+
+logger = logging.getLogger(__name__)
+
+# Collection extent fields, see CollectionUpdatesMixin.extent_update()
+EXTENT_FIELDS = ['extent_geometry', 'extent_start_datetime', 'extent_end_datetime']
+
+_worker_lock = threading.Lock()
+_worker = None
+
+
+class CollectionUpdatesMixin():
+    '''Deferred update of the collection extent and summaries
+
+    When settings.COLLECTION_UPDATES_DEFERRED is set, the item and asset writes don't update the
+    collection extent and summaries, they only record a change of the collection (see
+    request_update()). The changes are then coalesced by a background worker which recomputes the
+    extent and summaries of each changed collection with a single aggregate query (see
+    process_collection_updates()).
+
+    When settings.COLLECTION_EXTENT_ATOMIC_MERGE is set, the item insertions expand the collection
+    extent within a single UPDATE statement (see merge_extent()). The item updates and deletions
+    still update the extent in python, but on the locked collection row (see extent_update()).
+    '''
+
+    @contextmanager
+    def extent_update(self):
+        '''Context of a collection extent update done in python (item update or deletion)
+
+        With settings.COLLECTION_EXTENT_ATOMIC_MERGE, the collection row is locked and its extent
+        reloaded within a transaction, so that the extent merged by concurrent item insertions is
+        not overwritten. The extent must then be saved with save_extent() within the block.
+        '''
+        if not settings.COLLECTION_EXTENT_ATOMIC_MERGE:
+            yield
+            return
+        with transaction.atomic():
+            collections = type(self).objects.select_for_update().filter(pk=self.pk)
+            extent = collections.values(*EXTENT_FIELDS).get()
+            for field, value in extent.items():
+                setattr(self, field, value)
+            yield
+
+    def save_extent(self):
+        '''Save the collection after an extent update (see extent_update())
+
+        With settings.COLLECTION_EXTENT_ATOMIC_MERGE, only the extent fields are saved.
+        '''
+        if settings.COLLECTION_EXTENT_ATOMIC_MERGE:
+            self.save(update_fields=EXTENT_FIELDS + ['etag', 'updated'])
+        else:
+            self.save()
+
+    def merge_extent(self, items):
+        '''Expand the collection extent with the inserted items within a single UPDATE statement
+
+        Unlike the update of the extent in python followed by a save(), the extent is merged by
+        the database from the current row value. Concurrent insertions in the same collection
+        (e.g. from parallel ingestion workers) therefore don't lose any update, PostgreSQL applying
+        each UPDATE on the latest committed row value.
+
+        Args:
+            items: list[Item]
+                the inserted items, with their bbox fields updated (see Item.update_bbox())
+        '''
+        if not items:
+            return
+        bboxes = [item.bbox for item in items if item.bbox is not None]
+        self.update_etag()
+        params = {
+            'collection': self.pk,
+            'etag': self.etag,
+            'start':
+                min(item.properties_start_datetime or item.properties_datetime for item in items),
+            'end': max(item.properties_end_datetime or item.properties_datetime for item in items),
+            'xmin': min(bbox[0] for bbox in bboxes) if bboxes else None,
+            'ymin': min(bbox[1] for bbox in bboxes) if bboxes else None,
+            'xmax': max(bbox[2] for bbox in bboxes) if bboxes else None,
+            'ymax': max(bbox[3] for bbox in bboxes) if bboxes else None,
+        }
+        # NOTE: LEAST/GREATEST ignore the NULL values, and ST_MakeEnvelope returns NULL if one of
+        # its arguments is NULL
+        sql = f'''
+            UPDATE {type(self)._meta.db_table} SET
+                extent_geometry = COALESCE(ST_MakeEnvelope(
+                    LEAST(ST_XMin(extent_geometry), %(xmin)s),
+                    LEAST(ST_YMin(extent_geometry), %(ymin)s),
+                    GREATEST(ST_XMax(extent_geometry), %(xmax)s),
+                    GREATEST(ST_YMax(extent_geometry), %(ymax)s),
+                    4326
+                ), extent_geometry),
+                extent_start_datetime = LEAST(extent_start_datetime, %(start)s),
+                extent_end_datetime = GREATEST(extent_end_datetime, %(end)s),
+                etag = %(etag)s,
+                updated = now()
+            WHERE id = %(collection)s
+            RETURNING
+                ST_XMin(extent_geometry), ST_YMin(extent_geometry),
+                ST_XMax(extent_geometry), ST_YMax(extent_geometry),
+                extent_start_datetime, extent_end_datetime, updated
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            xmin, ymin, xmax, ymax, start, end, updated = cursor.fetchone()
+        logger.info(
+            'Collection extent merged with %d items: extent=%s, interval=[%s, %s]',
+            len(items), (xmin, ymin, xmax, ymax),
+            start,
+            end,
+            extra={'collection': self.name}
+        )
+        if xmin is not None:
+            self.extent_geometry = Polygon.from_bbox((xmin, ymin, xmax, ymax))
+        self.extent_start_datetime = start
+        self.extent_end_datetime = end
+        self.updated = updated
+        invalidate_etag(self.name)
+
+    def request_update(self):
+        '''Request the deferred update of the collection extent and summaries
+
+        This only inserts a change row, the extent and summaries are recomputed later by the
+        worker. The caller still propagates the change to the collection ETag (see
+        propagate_changes()), so that the collection and the lists ETag change right away.
+        '''
+        logger.debug('Requesting collection update', extra={'collection': self.name})
+        self.changes.create()
+        transaction.on_commit(start_collection_updates_worker)
+
+    def update_extent_and_summaries(self):
+        '''Recompute the collection extent and summaries from all its items and assets
+
+        The extent is computed by a single aggregate query on the items and the summaries are
+        rebuilt from the assets (see CollectionSummariesMixin.rebuild_summaries()).
+
+        Returns:
+            bool: True if the collection extent or summaries have been updated, false otherwise
+        '''
+        item_table = apps.get_model('stac_api', 'Item')._meta.db_table
+        sql = f'''
+            SELECT
+                min(COALESCE(properties_start_datetime, properties_datetime)),
+                max(COALESCE(properties_end_datetime, properties_datetime)),
+                min(bbox_xmin), min(bbox_ymin), max(bbox_xmax), max(bbox_ymax)
+            FROM {item_table} WHERE collection_id = %s
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.pk])
+            start, end, xmin, ymin, xmax, ymax = cursor.fetchone()
+
+        extent_geometry = None
+        if xmin is not None:
+            extent_geometry = Polygon.from_bbox((xmin, ymin, xmax, ymax))
+            extent_geometry.srid = 4326
+
+        current_extent = self.extent_geometry.extent if self.extent_geometry else None
+        new_extent = extent_geometry.extent if extent_geometry else None
+        updated = self.rebuild_summaries()
+        if (
+            current_extent != new_extent or self.extent_start_datetime != start or
+            self.extent_end_datetime != end
+        ):
+            self.extent_geometry = extent_geometry
+            self.extent_start_datetime = start
+            self.extent_end_datetime = end
+            updated = True
+        if updated:
+            logger.info(
+                'Collection extent and summaries updated: extent=%s, interval=[%s, %s], '
+                'summaries=%s',
+                new_extent,
+                start,
+                end,
+                self.summaries,
+                extra={'collection': self.name}
+            )
+        return updated
+
+
+def process_collection_updates(delay=None):
+    '''Process the pending collection updates
+
+    The collections having changes older than `delay` seconds are updated, each collection being
+    updated in its own transaction with its row locked, collections already locked by another
+    worker are skipped.
+
+    Args:
+        delay: float | None
+            Minimum age in seconds of the changes to process (default
+            settings.COLLECTION_UPDATES_DELAY_SECONDS). The changes are coalesced during this delay.
+
+    Returns:
+        int: number of collections processed
+    '''
+    if delay is None:
+        delay = settings.COLLECTION_UPDATES_DELAY_SECONDS
+    collection_model = apps.get_model('stac_api', 'Collection')
+    change_model = apps.get_model('stac_api', 'CollectionChange')
+    cutoff = timezone.now() - timedelta(seconds=delay)
+
+    changes = change_model.objects.filter(created__lte=cutoff)
+    collection_ids = changes.values_list('collection_id', flat=True).distinct()
+    processed = 0
+    for collection_id in list(collection_ids):
+        with transaction.atomic():
+            collections = collection_model.objects.select_for_update(skip_locked=True)
+            collection = collections.filter(pk=collection_id).first()
+            if collection is None:
+                # collection being updated by another worker
+                continue
+            # Only the changes committed so far are removed, the later ones will trigger another
+            # update
+            change_model.objects.filter(collection_id=collection_id).delete()
+            start = time.time()
+            if collection.update_extent_and_summaries():
+                collection.save()
+            logger.debug(
+                'Collection update processed in %.3fs',
+                time.time() - start,
+                extra={'collection': collection.name}
+            )
+            processed += 1
+    return processed
+
+
+def _run_worker():
+    while True:
+        time.sleep(settings.COLLECTION_UPDATES_DELAY_SECONDS)
+        try:
+            processed = process_collection_updates()
+            if processed:
+                logger.info('%d collection updates processed', processed)
+        except DatabaseError as error:
+            logger.error('Failed to process the collection updates: %s', error)
+        finally:
+            # The worker thread connections are not closed by the request cycle
+            connections.close_all()
+
+
+def start_collection_updates_worker():
+    '''Start the collection updates worker of the process, if not yet started
+
+    The worker processes the pending collection updates every
+    settings.COLLECTION_UPDATES_DELAY_SECONDS seconds, see process_collection_updates().
+    '''
+    global _worker  # pylint: disable=global-statement
+    with _worker_lock:
+        if _worker is not None and _worker.is_alive():
+            return
+        logger.info('Starting the collection updates worker')
+        _worker = threading.Thread(target=_run_worker, name='collection-updates', daemon=True)
+        _worker.start()
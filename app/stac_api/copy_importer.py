@@ -0,0 +1,234 @@
+import csv
+import datetime
+import io
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
+from django.contrib.gis.db.models import GeometryField
+from django.db import connection
+from django.db import models
+from django.db import transaction
+from django.db.models.fields.files import FieldFile
+
+logger = logging.getLogger(__name__)
+
+# Default number of objects per model sent in one COPY statement
+COPY_CHUNK_SIZE = 10000
+
+
+def get_copy_value(field, instance):
+    '''Returns the value of a model field in the COPY CSV format
+
+    Args:
+        field: Field
+            Concrete model field
+        instance: Model
+            Model instance, its auto fields (e.g. auto_now dates) are set as by save()
+
+    Returns:
+        The python value to write in the CSV row, None being written as NULL
+    '''
+    value = field.pre_save(instance, add=True)
+    if value is None:
+        return None
+    if isinstance(field, GeometryField):
+        if value.srid is None:
+            value.srid = field.srid
+        elif value.srid != field.srid:
+            value = value.transform(field.srid, clone=True)
+        return value.ewkt
+    if isinstance(field, models.JSONField):
+        return json.dumps(value, cls=field.encoder)
+    if isinstance(value, FieldFile):
+        return value.name
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+class CopyImporter():
+    '''Bulk importer of a collection's objects through PostgreSQL COPY
+
+    The objects (items, assets and links) are buffered and sent to the database in chunks with
+    `COPY ... FROM STDIN`, without calling their save() method nor validating them. Their primary
+    keys are reserved by blocks from the table sequence, so that the children can reference their
+    parent before it is written. Only the ETag and bbox of the items are set by the importer,
+    the collection extent and summaries being computed once by finish(). The asset files are not
+    uploaded, only their path is recorded.
+
+    The importer must be used within a transaction and the objects must not already exist.
+
+    Usage:
+        importer = CopyImporter(collection)
+        item = importer.add_item(Item(name='my-item', geometry=geometry, ...))
+        importer.add(Asset(item=item, name='my-asset', file='path/on/s3', ...))
+        importer.finish()
+    '''
+
+    def __init__(self, collection, chunk_size=COPY_CHUNK_SIZE):
+        '''
+        Args:
+            collection: Collection
+                Collection in which the objects are imported (it must already exist)
+            chunk_size: int
+                Number of objects per model sent in one COPY statement
+        '''
+        self.collection = collection
+        self.chunk_size = chunk_size
+        # The buffers are flushed in the order of the models first added (e.g. items before
+        # assets), dict keeping the insertion order
+        self.buffers = {}
+        self.ids = {}
+        self.counts = {}
+
+    def add_item(self, item):
+        '''Add an item to the import
+
+        Args:
+            item: Item
+                new item of the importer collection
+
+        Returns:
+            Item: the item with its id, etag and bbox fields set
+        '''
+        item.collection = self.collection
+        item.update_bbox()
+        return self.add(item)
+
+    def add(self, instance):
+        '''Add a model instance to the import
+
+        Args:
+            instance: Model
+                new model instance (e.g. an Asset or a Link), the buffers are flushed when the
+                instance's model buffer is full
+
+        Returns:
+            Model: the instance with its primary key set
+        '''
+        model = type(instance)
+        if hasattr(instance, 'update_etag'):
+            instance.update_etag()
+        instance.pk = self._get_next_id(model)
+        buffer = self.buffers.setdefault(model, [])
+        buffer.append(instance)
+        if len(buffer) >= self.chunk_size:
+            self.flush()
+        return instance
+
+    def flush(self):
+        '''Write all the buffered objects to the database'''
+        for model, instances in self.buffers.items():
+            if instances:
+                self._copy(model, instances)
+                self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(instances)
+                instances.clear()
+
+    def finish(self):
+        '''Write the remaining objects and update the collection extent and summaries
+
+        Returns:
+            dict: number of objects imported per model name
+        '''
+        self.flush()
+        start = time.time()
+        self.collection.update_extent_and_summaries()
+        self.collection.save()
+        logger.info(
+            'Imported %s, collection extent and summaries updated in %.3fs',
+            self.counts,
+            time.time() - start,
+            extra={'collection': self.collection.name}
+        )
+        return self.counts
+
+    def _get_next_id(self, model):
+        ids = self.ids.get(model)
+        if not ids:
+            # reserve a block of ids from the table sequence
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+                    [model._meta.db_table, model._meta.pk.column, self.chunk_size]
+                )
+                ids = [row[0] for row in cursor.fetchall()]
+            ids.reverse()
+            self.ids[model] = ids
+        return ids.pop()
+
+    def _copy(self, model, instances):
+        start = time.time()
+        fields = model._meta.concrete_fields
+        data = io.StringIO()
+        # All strings are quoted in order to distinguish the empty strings from NULL
+        writer = csv.writer(data, quoting=csv.QUOTE_NONNUMERIC)
+        for instance in instances:
+            writer.writerow([get_copy_value(field, instance) for field in fields])
+        data.seek(0)
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)', data)
+        logger.debug(
+            'Copied %d %s in %.3fs',
+            len(instances),
+            model._meta.verbose_name_plural,
+            time.time() - start,
+            extra={'collection': self.collection.name}
+        )
+
+
+def run_import_workers(import_function, collections, workers=1):
+    '''Run an import function for each collection, in parallel worker threads
+
+    Each collection is imported within its own transaction. With more than one worker, each
+    worker thread uses its own database connection which is closed at the end of the import.
+
+    Args:
+        import_function: callable
+            Function importing one collection, called with the collection argument
+        collections: list
+            Collection arguments (e.g. names or directories)
+        workers: int
+            Number of collections imported in parallel
+
+    Returns:
+        dict: exception per collection argument of the failed imports
+    '''
+
+    def import_collection(collection):
+        with transaction.atomic():
+            return import_function(collection)
+
+    def import_collection_in_thread(collection):
+        try:
+            return import_collection(collection)
+        finally:
+            connection.close()
+
+    errors = {}
+    if workers <= 1:
+        for collection in collections:
+            try:
+                import_collection(collection)
+            except Exception as error:  # pylint: disable=broad-except
+                logger.error('Failed to import collection %s: %s', collection, error)
+                errors[collection] = error
+        return errors
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures_to_collection = {
+            executor.submit(import_collection_in_thread, collection): collection
+            for collection in collections
+        }
+        for future in as_completed(futures_to_collection):
+            collection = futures_to_collection[future]
+            try:
+                future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                logger.error('Failed to import collection %s: %s', collection, error)
+                errors[collection] = error
+    return errors
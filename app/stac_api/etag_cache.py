@@ -0,0 +1,102 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+ETAG_CACHE = 'etags'
+
+
+def get_etag_cache_key(*names):
+    '''Returns the ETag cache key of an object
+
+    Args:
+        *names: string
+            Object URL kwargs, e.g. collection name, item name, ...
+
+    Returns: string
+        Cache key
+    '''
+    return 'etag:' + '/'.join(names)
+
+
+def get_etag(queryset):
+    '''Returns the ETag of the object selected by the queryset with a single query
+
+    Args:
+        queryset: QuerySet
+            Queryset selecting a single object
+
+    Returns: string | None
+        The object ETag or None if the object doesn't exist
+    '''
+    return queryset.values_list('etag', flat=True).first()
+
+
+def get_cached_etag(request, queryset, *names):
+    '''Returns the ETag of an object using the ETag cache
+
+    The ETag is taken from the cache and on a cache miss from the primary DB, in which case the
+    cache is filled. The cache is only used for safe methods (GET/HEAD) requests, the ETag used
+    for the preconditions of unsafe methods is always read from the DB.
+
+    Args:
+        request: HttpRequest
+            Request
+        queryset: QuerySet
+            Queryset selecting the object
+        *names: string
+            Object URL kwargs used as cache key (see get_etag_cache_key())
+
+    Returns: string | None
+        The object ETag or None if the object doesn't exist
+    '''
+    if settings.ETAG_CACHE_SECONDS <= 0 or request.method not in SAFE_METHODS:
+        return get_etag(queryset)
+
+    cache = caches[ETAG_CACHE]
+    key = get_etag_cache_key(*names)
+    etag = cache.get(key)
+    if etag is None:
+        # The cache is shared by all the requests, it is therefore always filled from the primary
+        # and never from a replica which could still have the ETag invalidated by a recent write
+        etag = get_etag(queryset.using(DEFAULT_DB_ALIAS))
+        # Missing objects are not cached, the ETag key is only invalidated on object changes
+        if etag is not None:
+            cache.set(key, etag, settings.ETAG_CACHE_SECONDS)
+    return etag
+
+
+def invalidate_etag(*names):
+    '''Invalidate the cached ETag of an object
+
+    The ETag is invalidated right away and again once the current transaction has been
+    committed, to discard an old ETag that might have been cached in between by a concurrent
+    request.
+
+    Args:
+        *names: string
+            Object URL kwargs (see get_etag_cache_key())
+    '''
+    key = get_etag_cache_key(*names)
+    cache = caches[ETAG_CACHE]
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def clear_etags():
+    '''Clear the whole ETag cache
+
+    This is used when objects are renamed, because the cache keys of all their children would
+    change as well. The cache is cleared right away and once the current transaction has been
+    committed (see invalidate_etag()).
+    '''
+    logger.debug('Clearing the ETag cache')
+    cache = caches[ETAG_CACHE]
+    cache.clear()
+    transaction.on_commit(cache.clear)
@@ -0,0 +1,357 @@
+import json
+import logging
+from collections import OrderedDict
+
+from psycopg2.extras import execute_values
+
+from django.conf import settings
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.db import DatabaseError
+from django.db import connections
+from django.db import router
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import Prefetch
+from django.db.models import TextField
+from django.db.models import Value
+from django.db.models import When
+from django.db.models import prefetch_related_objects
+from django.db.models.expressions import RawSQL
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from stac_api.models import Asset
+from stac_api.models import Collection
+from stac_api.models import Item
+from stac_api.models import ItemLink
+from stac_api.serializers import ItemDocumentSerializer
+from stac_api.serializers_utils import get_relation_links
+from stac_api.utils import build_asset_href
+from stac_api.utils import get_url
+
+logger = logging.getLogger(__name__)
+
+
+def serialize_item_document(item):
+    '''Serialize the item into its host independent document
+
+    The document is the item serialization without the auto generated links and with the asset
+    file path instead of the asset href. It is tagged with the application version, so that
+    documents serialized by another version of the service are discarded (the version must stay
+    the first member, see get_item_document_prefix()).
+
+    Args:
+        item: Item
+            Item to serialize
+
+    Returns: string
+        JSON document
+    '''
+    document = {'version': settings.APP_VERSION, 'item': ItemDocumentSerializer(item).data}
+    return json.dumps(document, cls=JSONEncoder, ensure_ascii=False)
+
+
+def get_item_document_prefix():
+    '''Returns the prefix of the documents serialized by this version of the service'''
+    return '{"version": %s, ' % (json.dumps(settings.APP_VERSION))
+
+
+def is_valid_item_document(document):
+    '''Check, without parsing it, if the item document is valid
+
+    Args:
+        document: string | None
+            JSON document
+
+    Returns: bool
+        False if the document is missing or has been serialized by another version of the
+        service.
+    '''
+    return document is not None and document.startswith(get_item_document_prefix())
+
+
+def load_item_document(document):
+    '''Load a serialized item document
+
+    Args:
+        document: string | None
+            JSON document
+
+    Returns: dict | None
+        The item representation or None if the document is not valid (see
+        is_valid_item_document())
+    '''
+    if not is_valid_item_document(document):
+        return None
+    return json.loads(document)['item']
+
+
+def render_item_document(item, representation, request):
+    '''Complete an item document with the request dependent data
+
+    Args:
+        item: Item
+            Item of the document
+        representation: dict
+            Item representation as returned by load_item_document()
+        request: HttpRequest
+            Request used to build the hrefs
+
+    Returns: dict
+        Item representation as returned by the ItemSerializer
+    '''
+    collection = item.collection.name
+    representation['collection'] = collection
+    for asset in representation.get('assets', {}).values():
+        if 'href' in asset:
+            asset['href'] = build_asset_href(request, asset['href'])
+    # Add auto links
+    # We use OrderedDict, although it is not necessary, because the default serializer/model for
+    # links already uses OrderedDict, this way we keep consistency between auto link and user
+    # link
+    representation['links'][:0] = \
+        get_relation_links(request, 'item-detail', [collection, item.name]) \
+        + [
+            OrderedDict([
+                ('rel', 'collection'),
+                ('href', get_url(request, 'collection-detail', [collection])),
+            ])
+        ]
+    return representation
+
+
+def sql_isoformat(column):
+    '''Returns the SQL expression formatting a datetime column as the DRF DateTimeField
+
+    Args:
+        column: string
+            SQL column
+
+    Returns: string
+        SQL expression
+    '''
+    return (
+        f"to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS') || "
+        f"CASE WHEN mod(extract(microseconds FROM {column})::bigint, 1000000) <> 0 "
+        f"THEN to_char({column} AT TIME ZONE 'UTC', '.US') ELSE '' END || 'Z'"
+    )
+
+
+def get_item_document_sql():
+    '''Returns the SQL expression building the item document in DB
+
+    The expression builds, from the outer item table, the same representation as the
+    ItemDocumentSerializer with a correlated sub query for the assets and one for the links.
+
+    Returns: tuple(string, list)
+        SQL expression and its parameters
+    '''
+    # pylint: disable=protected-access
+    item = Item._meta.db_table
+    asset = Asset._meta.db_table
+    link = ItemLink._meta.db_table
+    collection = Collection._meta.db_table
+    sql = f'''json_strip_nulls(json_build_object(
+        'id', {item}.name,
+        'collection', (
+            SELECT collection.name FROM {collection} AS collection
+            WHERE collection.id = {item}.collection_id
+        ),
+        'type', 'Feature',
+        'stac_version', %s,
+        'geometry', ST_AsGeoJSON({item}.geometry, 15)::json,
+        'bbox', json_build_array(
+            {item}.bbox_xmin, {item}.bbox_ymin, {item}.bbox_xmax, {item}.bbox_ymax
+        ),
+        'properties', json_build_object(
+            'datetime', {sql_isoformat(f'{item}.properties_datetime')},
+            'start_datetime', {sql_isoformat(f'{item}.properties_start_datetime')},
+            'end_datetime', {sql_isoformat(f'{item}.properties_end_datetime')},
+            'title', {item}.properties_title,
+            'created', {sql_isoformat(f'{item}.created')},
+            'updated', {sql_isoformat(f'{item}.updated')}
+        ),
+        'links', COALESCE((
+            SELECT json_agg(json_build_object(
+                'href', link.href,
+                'rel', link.rel,
+                'title', link.title,
+                'type', link.link_type
+            ) ORDER BY link.id)
+            FROM {link} AS link WHERE link.item_id = {item}.id
+        ), '[]'::json),
+        'assets', COALESCE((
+            SELECT json_object_agg(asset.name, json_build_object(
+                'title', asset.title,
+                'type', asset.media_type,
+                'href', NULLIF(asset.file, ''),
+                'description', asset.description,
+                'eo:gsd', asset.eo_gsd,
+                'geoadmin:lang', asset.geoadmin_lang,
+                'geoadmin:variant', asset.geoadmin_variant,
+                'proj:epsg', asset.proj_epsg,
+                'checksum:multihash', asset.checksum_multihash,
+                'created', {sql_isoformat('asset.created')},
+                'updated', {sql_isoformat('asset.updated')}
+            ) ORDER BY asset.name)
+            FROM {asset} AS asset WHERE asset.item_id = {item}.id
+        ), '{{}}'::json)
+    ))::text'''
+    return sql, [settings.STAC_VERSION]
+
+
+def annotate_item_documents(queryset):
+    '''Annotate an item queryset with the item document built by the DB
+
+    This is the `sql` engine of the item documents (see ITEM_DOCUMENTS_ENGINE setting), the
+    document of each item, including its assets and links, is built by PostgreSQL within the
+    items query, only the item and collection names are loaded as model fields. The items
+    documents are then rendered by iter_item_documents() without any further DB access.
+
+    Args:
+        queryset: ItemQuerySet
+            Items queryset
+
+    Returns: ItemQuerySet
+        Queryset annotated with `sql_document`
+    '''
+    sql, params = get_item_document_sql()
+    return queryset.only('name', 'collection', 'collection__name').annotate(
+        sql_document=RawSQL(sql, params, output_field=TextField())
+    )
+
+
+def annotate_items_for_documents(queryset):
+    '''Prepare an items queryset for iter_item_documents() based on the documents engine
+
+    With the `python` engine, the items without a valid stored document are annotated with their
+    GeoJSON geometry rendered by the DB (`geometry_geojson`, used by the ItemGeometryField), the
+    geometry itself being deferred.
+
+    Args:
+        queryset: ItemQuerySet
+            Items queryset
+
+    Returns: ItemQuerySet
+        Annotated queryset
+    '''
+    if settings.ITEM_DOCUMENTS_ENGINE == 'sql':
+        return annotate_item_documents(queryset)
+    # The GeoJSON geometry is only needed to serialize the items without a valid document (see
+    # iter_item_documents()), it is not rendered for the others
+    return queryset.defer('geometry').annotate(
+        geometry_geojson=Case(
+            When(document__startswith=get_item_document_prefix(), then=Value(None)),
+            default=AsGeoJSON('geometry', precision=15),
+            output_field=TextField()
+        )
+    )
+
+
+def load_item_sql_document(document):
+    '''Load an item document built by the DB (see annotate_item_documents())
+
+    Args:
+        document: string
+            JSON document
+
+    Returns: dict
+        The item representation
+    '''
+    representation = json.loads(document)
+    for asset in representation['assets'].values():
+        # The FloatField serializes integral floats with a decimal, unlike PostgreSQL
+        if 'eo:gsd' in asset:
+            asset['eo:gsd'] = float(asset['eo:gsd'])
+    return representation
+
+
+def store_item_documents(items):
+    '''Store the items document in DB, on a best effort basis
+
+    The documents are stored with a single query and only if the item ETag didn't change in
+    between, otherwise the document would be outdated. This is called by read only requests,
+    therefore the item rows are locked in a consistent order and the rows already locked by
+    another request are skipped instead of waited for; any DB error is logged and discarded as the
+    document is simply serialized again by the next request.
+
+    Args:
+        items: [Item]
+            List of items with their new document
+    '''
+    table = Item._meta.db_table  # pylint: disable=protected-access
+    using = router.db_for_write(Item)
+    try:
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            execute_values(
+                cursor,
+                f'''WITH data (id, etag, document) AS (VALUES %s),
+                locked AS (
+                    SELECT id FROM {table} WHERE id IN (SELECT id FROM data)
+                    ORDER BY id FOR UPDATE SKIP LOCKED
+                )
+                UPDATE {table} AS item SET document = data.document
+                FROM data JOIN locked ON locked.id = data.id
+                WHERE item.id = data.id AND item.etag = data.etag''',
+                [(item.pk, item.etag, item.document) for item in items]
+            )
+    except DatabaseError as error:
+        logger.error('Failed to store the documents of %d items: %s', len(items), error)
+
+
+def iter_item_documents(items, request):
+    '''Returns an iterator over the items representation using their stored document
+
+    Items without a valid document are serialized (their assets and links are fetched at this
+    point) and their new document is stored in DB before returning. Only the rendering of the
+    representations, which doesn't require any DB access, is done lazily during the iteration.
+    When the items have been annotated with their document built by the DB (see
+    annotate_item_documents()), the stored documents are not used.
+
+    Args:
+        items: iterable
+            Items to represent
+        request: HttpRequest
+            Request used to build the hrefs
+
+    Returns: iterator
+        Iterator of item representation as returned by the ItemSerializer
+    '''
+    items = list(items)
+    if items and hasattr(items[0], 'sql_document'):
+        # Documents built by the DB, see annotate_item_documents()
+        return (
+            render_item_document(item, load_item_sql_document(item.sql_document), request)
+            for item in items
+        )
+
+    missing = [item for item in items if not is_valid_item_document(item.document)]
+    if missing:
+        logger.debug('Serializing %d items without valid document', len(missing))
+        prefetch_related_objects(
+            missing, Prefetch('assets', queryset=Asset.objects.order_by('name')), 'links'
+        )
+        for item in missing:
+            item.document = serialize_item_document(item)
+        store_item_documents(missing)
+
+    return (
+        render_item_document(item, load_item_document(item.document), request) for item in items
+    )
+
+
+def get_item_documents(items, request):
+    '''Returns the items representation using their stored document
+
+    See iter_item_documents()
+
+    Args:
+        items: iterable
+            Items to represent
+        request: HttpRequest
+            Request used to build the hrefs
+
+    Returns: list
+        List of item representation as returned by the ItemSerializer
+    '''
+    return list(iter_item_documents(items, request))
@@ -13,10 +13,14 @@ from django.contrib.gis.geos import Polygon
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management.base import BaseCommand
 
+from stac_api.copy_importer import CopyImporter
+from stac_api.copy_importer import run_import_workers
 from stac_api.models import Asset
 from stac_api.models import Collection
 from stac_api.models import Item
 from stac_api.utils import CommandHandler
+from stac_api.utils import get_asset_path
+from stac_api.utils import get_sha256_multihash
 from stac_api.validators import MEDIA_TYPES
 
 logger = logging.getLogger(__name__)
@@ -69,7 +73,15 @@ class DummyDataHandler(CommandHandler):
         )
 
         errors = 0
-        if self.options['parallel_collections'] > 1:
+        if self.options['copy']:
+            errors = len(
+                run_import_workers(
+                    lambda collection_id: self.copy_collection(collection_id, items, assets),
+                    collections,
+                    self.options['parallel_collections']
+                )
+            )
+        elif self.options['parallel_collections'] > 1:
             with ThreadPoolExecutor(max_workers=self.options['parallel_collections']) as executor:
                 futures_to_id = {
                     executor.submit(self.create_collection, collection_id, items, assets):
@@ -138,21 +150,68 @@ class DummyDataHandler(CommandHandler):
 
         self.print('collection %s created', collection_id)
 
-    def create_item(self, collection, item_id, assets):
+    def copy_collection(self, collection_id, items, assets):
+        '''Create the collection's items and assets through PostgreSQL COPY
+
+        The items already in the collection are skipped, see stac_api.copy_importer.
+        '''
+        collection, _ = Collection.objects.get_or_create(
+            name=collection_id,
+            defaults={
+                'description': 'This is a description',
+                'license': 'test',
+                'title': 'Test title'
+            }
+        )
+        existing_items = set(collection.item_set.values_list('name', flat=True))
+
+        importer = CopyImporter(collection)
+        for item_id in items:
+            if item_id in existing_items:
+                continue
+            item = importer.add_item(Item(name=item_id, **self.get_item_values(item_id)))
+            for asset_id in assets:
+                asset_values = self.get_asset_values(asset_id)
+                content = asset_values.pop('content')
+                asset = Asset(
+                    item=item, checksum_multihash=get_sha256_multihash(content), **asset_values
+                )
+                asset.file = get_asset_path(item, asset.name)
+                importer.add(asset)
+        importer.finish()
+
+        self.print('collection %s created', collection_id)
+
+    def get_item_values(self, item_id):
         xmin = random.randint(XMIN, XMAX)
         ymin = random.randint(YMIN, YMAX)
         geo = Polygon.from_bbox((xmin, ymin, xmin + 1000, ymin + 1000))
         geo.srid = 2056
         geo.transform(4326, clone=False)
+        return {
+            'properties_datetime': random_datetime(MIN_DATETIME, MAX_DATETIME),
+            'properties_title': f"This is my Item Title: {item_id}",
+            'geometry': geo
+        }
+
+    def get_asset_values(self, asset_id):
+        media_type = random.choice(MEDIA_TYPES)
+        content = ''.join(random.choices(string.ascii_uppercase + string.digits, k=16))
+        return {
+            'name': f'{asset_id}{random.choice(media_type[2])}',
+            'title': f'This is my asset title: {asset_id}',
+            'description': f"This is a detail description of the asset {asset_id}.",
+            'eo_gsd': random.choice([2, 2.5, 5, 10]),
+            'geoadmin_lang': random.choice(['de', 'fr', 'it', 'rm', 'en']),
+            'geoadmin_variant': random.choice(['var1', 'var2', 'var3']),
+            'proj_epsg': random.choice([2056, 4326, 21781]),
+            'media_type': media_type[0],
+            'content': content.encode('utf-8')
+        }
 
+    def create_item(self, collection, item_id, assets):
         item, _ = Item.objects.get_or_create(
-            collection=collection,
-            name=item_id,
-            defaults={
-                'properties_datetime': random_datetime(MIN_DATETIME, MAX_DATETIME),
-                'properties_title': f"This is my Item Title: {item_id}",
-                'geometry': geo
-            }
+            collection=collection, name=item_id, defaults=self.get_item_values(item_id)
         )
 
         for asset_id in assets:
@@ -161,26 +220,12 @@ class DummyDataHandler(CommandHandler):
         self.print('Item %s/%s created', collection.name, item_id, level=3)
 
     def create_asset(self, item, asset_id):
-        media_type = random.choice(MEDIA_TYPES)
-        asset, _ = Asset.objects.get_or_create(
-            item=item,
-            name=f'{asset_id}{random.choice(media_type[2])}',
-            defaults={
-                'title': f'This is my asset title: {asset_id}',
-                'description': f"This is a detail description of the asset {asset_id}.",
-                'eo_gsd': random.choice([2, 2.5, 5, 10]),
-                'geoadmin_lang': random.choice(['de', 'fr', 'it', 'rm', 'en']),
-                'geoadmin_variant': random.choice(['var1', 'var2', 'var3']),
-                'proj_epsg': random.choice([2056, 4326, 21781]),
-                'media_type': media_type[0],
-                'file': SimpleUploadedFile(
-                    f'{item.collection.name}/{item.name}/{asset_id}',
-                    ''.join(random.choices(
-                        string.ascii_uppercase + string.digits, k=16))
-                        .encode('utf-8')
-                )
-            }
+        asset_values = self.get_asset_values(asset_id)
+        name = asset_values.pop('name')
+        asset_values['file'] = SimpleUploadedFile(
+            f'{item.collection.name}/{item.name}/{asset_id}', asset_values.pop('content')
         )
+        asset, _ = Asset.objects.get_or_create(item=item, name=name, defaults=asset_values)
         self.print('Asset %s/%s/%s created', item.collection.name, item.name, asset_id, level=3)
 
 
@@ -239,6 +284,14 @@ class Command(BaseCommand):
             help="Number of items created in parallel (default 5)"
         )
 
+        parser.add_argument(
+            '--copy',
+            action='store_true',
+            help="Create the items and assets through PostgreSQL COPY, the collection extent and "
+            "summaries being computed once at the end (asset files are not uploaded and "
+            "--parallel-items is ignored)"
+        )
+
     def handle(self, *args, **options):
         handler = DummyDataHandler(self, options)
 
@@ -1,17 +1,127 @@
 import json
 import logging
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timedelta
+from itertools import groupby
+from operator import attrgetter
+from operator import itemgetter
+
+from botocore.exceptions import ClientError
+from botocore.exceptions import ParamValidationError
 
 from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
 from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
 
 from stac_api.models import AssetUpload
 from stac_api.s3_multipart_upload import MultipartUpload
 from stac_api.serializers import AssetUploadSerializer
 from stac_api.utils import CommandHandler
-from stac_api.utils import get_asset_path
+from stac_api.utils import utc_aware
 
 logger = logging.getLogger(__name__)
 
+# Number of uploads fetched per S3 request (S3 maximum) and per DB query
+S3_PAGE_SIZE = 1000
+DB_CHUNK_SIZE = 2000
+
+
+def iter_s3_uploads(executor, key_start=None, upload_id_start=None, page_size=S3_PAGE_SIZE):
+    '''Iterate over all the S3 multipart uploads, sorted by key
+
+    Args:
+        executor: MultipartUpload
+            S3 multipart upload executor
+        key_start: string | None
+            Only list the uploads with a key after this one
+        upload_id_start: string | None
+            Also list the uploads of the key_start key with an upload ID after this one
+        page_size: int
+            Number of uploads fetched per S3 request
+
+    Yields:
+        dict: S3 multipart upload
+    '''
+    key_marker = key_start
+    upload_id_marker = upload_id_start if key_start is not None else None
+    has_next = True
+    while has_next:
+        uploads, has_next, key_marker, upload_id_marker = executor.list_multipart_uploads(
+            key=key_marker, limit=page_size, start=upload_id_marker
+        )
+        yield from uploads
+
+
+def iter_db_uploads(status, key_start=None, upload_id_start=None, chunk_size=DB_CHUNK_SIZE):
+    '''Iterate over the asset uploads of the DB, sorted by S3 key as the S3 uploads
+
+    The S3 key is computed by the DB (see AssetUploadQuerySet.annotate_s3_key()), therefore the
+    asset, item and collection are not loaded for each upload.
+
+    Args:
+        status: string
+            Asset upload status filter
+        key_start: string | None
+            Only list the uploads with a key after this one
+        upload_id_start: string | None
+            Also list the uploads of the key_start key with an upload ID after this one (as S3
+            upload IDs, compared lexicographically)
+        chunk_size: int
+            Number of uploads fetched at once from the DB
+
+    Yields:
+        AssetUpload: asset upload annotated with its s3_key
+    '''
+    queryset = AssetUpload.objects.filter_by_status(status).annotate_s3_key()
+    if key_start is not None:
+        key_filter = Q(s3_key__gt=key_start)
+        if upload_id_start is not None:
+            key_filter |= Q(s3_key=key_start, upload_id__gt=upload_id_start)
+        queryset = queryset.filter(key_filter)
+    yield from queryset.order_by('s3_key', 'upload_id').iterator(chunk_size=chunk_size)
+
+
+def merge_uploads(s3_uploads, db_uploads):
+    '''Merge the S3 uploads with the DB uploads
+
+    Both sides must be sorted by key, this is then done in a single pass over them. Within a key,
+    the uploads are matched by upload ID (S3 sorts them by initiation date).
+
+    Args:
+        s3_uploads: iterable
+            S3 multipart uploads (dict), sorted by Key
+        db_uploads: iterable
+            Asset uploads annotated with their s3_key, sorted by s3_key
+
+    Yields:
+        tuple(string, dict | None, AssetUpload | None): key, S3 upload and DB upload, one of the
+        uploads being None if it is only found on the other side
+    '''
+    s3_groups = groupby(s3_uploads, key=itemgetter('Key'))
+    db_groups = groupby(db_uploads, key=attrgetter('s3_key'))
+    s3_key, s3_group = next(s3_groups, (None, None))
+    db_key, db_group = next(db_groups, (None, None))
+    while s3_key is not None or db_key is not None:
+        if db_key is None or (s3_key is not None and s3_key < db_key):
+            key, s3_key_uploads, db_key_uploads = s3_key, list(s3_group), []
+            s3_key, s3_group = next(s3_groups, (None, None))
+        elif s3_key is None or db_key < s3_key:
+            key, s3_key_uploads, db_key_uploads = db_key, [], list(db_group)
+            db_key, db_group = next(db_groups, (None, None))
+        else:
+            key, s3_key_uploads, db_key_uploads = s3_key, list(s3_group), list(db_group)
+            s3_key, s3_group = next(s3_groups, (None, None))
+            db_key, db_group = next(db_groups, (None, None))
+
+        db_key_uploads = {db_upload.upload_id: db_upload for db_upload in db_key_uploads}
+        for s3_upload in s3_key_uploads:
+            yield key, s3_upload, db_key_uploads.pop(s3_upload['UploadId'], None)
+        for db_upload in db_key_uploads.values():
+            yield key, None, db_upload
+
 
 class ListAssetUploadsHandler(CommandHandler):
 
@@ -20,100 +130,133 @@ class ListAssetUploadsHandler(CommandHandler):
         self.s3 = MultipartUpload()
 
     def list_asset_uploads(self):
-        # pylint: disable=too-many-locals
         uploads = []
         only_s3_uploads = []
         only_db_uploads = []
-        s3_has_next = False
-        db_has_next = False
+        has_next = False
         limit = self.options['limit']
-        start = self.options['start']
-        s3_key_start = self.options['s3_key_start']
-        s3_upload_id_start = self.options['s3_upload_id_start']
+        key_start, upload_id_start = self.get_start_markers()
 
         s3_uploads = []
         if not self.options['db_only']:
-            # get all s3 multipart uploads
-            (
-                s3_uploads,
-                s3_has_next,
-                s3_next_key,
-                s3_next_upload_id,
-            ) = self.s3.list_multipart_uploads(
-                limit=limit, key=s3_key_start, start=s3_upload_id_start
+            s3_uploads = iter_s3_uploads(self.s3, key_start, upload_id_start)
+        db_uploads = []
+        if not self.options['s3_only']:
+            db_uploads = iter_db_uploads(self.options['status'], key_start, upload_id_start)
+
+        last_key = None
+        count = 0
+        for key, s3_upload, db_upload in merge_uploads(s3_uploads, db_uploads):
+            # Stop between two keys, so that the next page can start after the last key
+            if limit and count >= limit and key != last_key:
+                has_next = True
+                break
+            if db_upload is None:
+                only_s3_uploads.append(s3_upload)
+            elif s3_upload is None:
+                only_db_uploads.append(AssetUploadSerializer(instance=db_upload).data)
+            else:
+                uploads.append({
+                    'db': AssetUploadSerializer(instance=db_upload).data, 's3': s3_upload
+                })
+            last_key = key
+            count += 1
+
+        result = {
+            'uploads': uploads,
+            'db_uploads': only_db_uploads,
+            's3_uploads': only_s3_uploads,
+            'next':
+                ' '.join([
+                    f'./{self.command.prog}',
+                    f'--limit={limit}',
+                    f'--key-start={shlex.quote(last_key)}' if has_next else '',
+                ])
+        }
+        if self.options['abort_orphans']:
+            result['aborted'], result['abort_errors'] = self.abort_orphans(only_s3_uploads)
+
+        self.stdout.write(json.dumps(result, indent=2, cls=DjangoJSONEncoder))
+
+    def get_start_markers(self):
+        '''Returns the key and upload ID markers at which the list starts
+
+        The deprecated --start index of the DB uploads is mapped onto the markers of the DB upload
+        preceding it, in the sorted list order.
+
+        Returns:
+            tuple(string | None, string | None): key and upload ID markers
+        '''
+        key_start = self.options['key_start']
+        upload_id_start = self.options['upload_id_start']
+        start = self.options['start']
+        if not start:
+            return key_start, upload_id_start
+        if key_start is not None:
+            raise CommandError('--start cannot be combined with --key-start')
+        logger.warning('--start is deprecated, use the --key-start of the next command')
+        queryset = AssetUpload.objects.filter_by_status(self.options['status']).annotate_s3_key()
+        markers = queryset.order_by('s3_key', 'upload_id').values_list('s3_key', 'upload_id')
+        previous = list(markers[start - 1:start]) or list(markers.reverse()[:1])
+        if not previous:
+            return None, None
+        return previous[0]
+
+    def abort_orphans(self, s3_uploads):
+        '''Abort in parallel the S3 uploads without asset upload object
+
+        Only the uploads older than the --abort-older-than option are aborted, the others might
+        just have been created and their asset upload object not yet committed. The uploads which
+        are in progress or being completed in the DB, but not listed due to the --status filter,
+        are never aborted.
+
+        Args:
+            s3_uploads: list
+                S3 multipart uploads without asset upload object
+
+        Returns:
+            tuple(list, list): the aborted uploads and the uploads that failed to be aborted
+        '''
+        abort_older_than = timedelta(hours=self.options['abort_older_than'])
+        older_than = utc_aware(datetime.utcnow()) - abort_older_than
+        candidates = [upload for upload in s3_uploads if upload['Initiated'] < older_than]
+        protected = set()
+        for start in range(0, len(candidates), DB_CHUNK_SIZE):
+            protected.update(
+                AssetUpload.objects.filter(
+                    upload_id__in=[
+                        upload['UploadId'] for upload in candidates[start:start + DB_CHUNK_SIZE]
+                    ],
+                    status__in=[AssetUpload.Status.IN_PROGRESS, AssetUpload.Status.COMPLETING]
+                ).values_list('upload_id', flat=True)
             )
+        orphans = [upload for upload in candidates if upload['UploadId'] not in protected]
 
-        if not self.options['s3_only']:
-            queryset = AssetUpload.objects.filter_by_status(self.options['status'])
-            count = queryset.count()
-            if count > limit:
-                queryset = queryset[start:start + limit]
-            db_uploads_qs = queryset
-            if start + limit < count:
-                db_has_next = True
-
-        if not self.options['db_only'] and not self.options['s3_only']:
-
-            def are_uploads_equal(s3_upload, db_upload):
-                if (
-                    s3_upload['UploadId'] == db_upload.upload_id and
-                    s3_upload['Key'] == get_asset_path(db_upload.asset.item, db_upload.asset.name)
-                ):
-                    return True
-                return False
-
-            # Add all db uploads
-            for db_upload in db_uploads_qs:
-                s3_upload = next(
-                    (
-                        s3_upload for s3_upload in s3_uploads
-                        if are_uploads_equal(s3_upload, db_upload)
-                    ),
-                    None,
-                )
-
-                if s3_upload is None:
-                    only_db_uploads.append(AssetUploadSerializer(instance=db_upload).data)
+        def abort(upload):
+            try:
+                self.s3.abort_multipart_upload(upload['Key'], None, upload['UploadId'])
+            except (ClientError, ParamValidationError, ValueError) as error:
+                # see MultipartUpload.call_s3_api(), the other aborts must go on
+                return upload, error
+            return upload, None
+
+        aborted = []
+        errors = []
+        with ThreadPoolExecutor(max_workers=self.options['abort_workers']) as executor:
+            for upload, error in executor.map(abort, orphans):
+                if error is None:
+                    aborted.append({'Key': upload['Key'], 'UploadId': upload['UploadId']})
                 else:
-                    uploads.append({
-                        'db': AssetUploadSerializer(instance=db_upload).data, 's3': s3_upload
+                    errors.append({
+                        'Key': upload['Key'], 'UploadId': upload['UploadId'], 'error': str(error)
                     })
-
-            # Add s3 uploads that are not found in db uploads
-            for s3_upload in s3_uploads:
-                db_upload = next(
-                    (
-                        db_upload for db_upload in db_uploads_qs
-                        if are_uploads_equal(s3_upload, db_upload)
-                    ),
-                    None,
-                )
-                if db_upload is None:
-                    only_s3_uploads.append(s3_upload)
-        elif self.options['db_only']:
-            only_db_uploads = AssetUploadSerializer(instance=list(db_uploads_qs), many=True).data
-        elif self.options['s3_only']:
-            only_s3_uploads = s3_uploads
-
-        print(
-            json.dumps(
-                {
-                    'uploads': uploads,
-                    'db_uploads': only_db_uploads,
-                    's3_uploads': only_s3_uploads,
-                    'next':
-                        ' '.join([
-                            f'./{self.command.prog}',
-                            f'--limit={limit}',
-                            f'--start={start}' if db_has_next else '',
-                            f'--s3-key-start={s3_next_key}' if s3_has_next else '',
-                            f'--s3-upload-id-start={s3_next_upload_id}' if s3_has_next else ''
-                        ])
-                },
-                indent=2,
-                cls=DjangoJSONEncoder,
-            )
+        self.print(
+            'Aborted %d orphan S3 uploads out of %d (%d failed)',
+            len(aborted),
+            len(s3_uploads),
+            len(errors)
         )
+        return aborted, errors
 
 
 class Command(BaseCommand):
@@ -125,10 +268,11 @@ class Command(BaseCommand):
     .../assets/<asset_name>/uploads which only list the uploads of one asset, while the command list
     all uploads for all assets.
 
+    The DB and S3 uploads are both listed sorted by S3 key and merged in a single pass, the
+    uploads found only on one side are listed in `db_uploads` and `s3_uploads`. The S3 uploads
+    without asset upload object can be aborted with --abort-orphans.
+
     WARNINGS:
-      - Although pagination is implemented, if there is more uploads than the limit, the sync
-        algorithm will not work because it only search for common upload on the page context and
-        uploads are not sorted.
       - The S3 minio server for local development doesn't supports the list_multipart_uploads
         methods, therefore the output will only contains the DB entries.
     """
@@ -148,22 +292,61 @@ class Command(BaseCommand):
             '--limit',
             type=int,
             default=default_limit,
-            help=f"Limit the output (default {default_limit})"
+            help=f"Limit the output, 0 for no limit (default {default_limit})"
         )
 
+        parser.add_argument('--db-only', type=bool, default=False, help="List only DB objects")
+
+        parser.add_argument('--s3-only', type=bool, default=False, help="List only S3 objects")
+
         parser.add_argument(
-            '--start', type=int, default=0, help="Start the list at the given index (default 0)"
+            '--key-start',
+            '--s3-key-start',
+            dest='key_start',
+            type=str,
+            default=None,
+            help='Start the list after the given S3 key, for pagination (--s3-key-start is '
+            'deprecated)'
         )
 
-        parser.add_argument('--db-only', type=bool, default=False, help="List only DB objects")
+        parser.add_argument(
+            '--s3-upload-id-start',
+            dest='upload_id_start',
+            type=str,
+            default=None,
+            help='With --key-start, also list the uploads of this key with an upload ID after the '
+            'given one (deprecated, the pages now end between two keys)'
+        )
 
-        parser.add_argument('--s3-only', type=bool, default=False, help="List only S3 objects")
+        parser.add_argument(
+            '--start',
+            type=int,
+            default=0,
+            help='Start the list at the given index of the DB uploads (deprecated, use '
+            '--key-start)'
+        )
 
         parser.add_argument(
-            '--s3-key-start', type=str, default=None, help='Next S3 key for pagination'
+            '--abort-orphans',
+            action='store_true',
+            help="Abort the listed S3 uploads that have no asset upload object"
         )
+
+        default_abort_older_than = 24
+        parser.add_argument(
+            '--abort-older-than',
+            type=int,
+            default=default_abort_older_than,
+            help="Only abort the orphan S3 uploads initiated more than the given number of hours "
+            f"ago (default {default_abort_older_than})"
+        )
+
+        default_abort_workers = 8
         parser.add_argument(
-            '--s3-upload-id-start', type=str, default=None, help='Next S3 upload ID for pagination'
+            '--abort-workers',
+            type=int,
+            default=default_abort_workers,
+            help=f"Number of S3 uploads aborted in parallel (default {default_abort_workers})"
         )
 
     def handle(self, *args, **options):
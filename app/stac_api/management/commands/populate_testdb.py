@@ -3,7 +3,9 @@ import os
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
 
+from stac_api.copy_importer import run_import_workers
 from stac_api.sample_data import importer
 from stac_api.utils import CommandHandler
 
@@ -16,14 +18,26 @@ class Handler(CommandHandler):
 
     def populate(self):
         # loop over the collection directories inside sample_data
+        collection_dirs = []
         for collection_dir in os.scandir(DATADIR):
             if collection_dir.is_dir() and not collection_dir.name.startswith('_'):
-                self.print('Import collection %s', collection_dir.name, level=1)
-                importer.import_collection(collection_dir)
+                collection_dirs.append(collection_dir)
             else:
                 self.print('Ignore file %s', collection_dir.name, level=2)
+
+        errors = run_import_workers(
+            self.import_collection, collection_dirs, self.options['parallel_collections']
+        )
+        for collection_dir, error in errors.items():
+            self.print_error('Import collection %s failed: %s', collection_dir.name, error)
+        if errors:
+            raise CommandError(f'{len(errors)} collection imports failed')
         self.print_success('Done')
 
+    def import_collection(self, collection_dir):
+        self.print('Import collection %s', collection_dir.name, level=1)
+        importer.import_collection(collection_dir, copy=self.options['copy'])
+
 
 class Command(BaseCommand):
     help = """Populates the local test database with sample data
@@ -37,5 +51,20 @@ class Command(BaseCommand):
        |- collection.json
     """
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--copy',
+            action='store_true',
+            help="Import the items and assets through PostgreSQL COPY, the collection extent and "
+            "summaries being computed once at the end (asset files are not uploaded)"
+        )
+
+        parser.add_argument(
+            '--parallel-collections',
+            type=int,
+            default=1,
+            help="Number of collections imported in parallel (default 1)"
+        )
+
     def handle(self, *args, **options):
         Handler(self, options).populate()
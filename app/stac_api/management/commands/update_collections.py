@@ -0,0 +1,36 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from stac_api.collection_updates import process_collection_updates
+from stac_api.utils import CommandHandler
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateCollectionsHandler(CommandHandler):
+
+    def update(self):
+        self.print('Processing the pending collection updates...')
+        processed = process_collection_updates(self.options['delay'])
+        self.print_success('%d collections updated', processed)
+
+
+class Command(BaseCommand):
+    help = """Process the pending collection extent and summaries updates.
+
+    When COLLECTION_UPDATES_DEFERRED is set, the collections extent and summaries are updated by a
+    background worker. This command processes the pending updates right away, e.g. after a bulk
+    import or from a cron job.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delay',
+            type=float,
+            default=0,
+            help="Only process the collection changes older than this delay in seconds (default 0)"
+        )
+
+    def handle(self, *args, **options):
+        UpdateCollectionsHandler(self, options).update()
@@ -3,7 +3,13 @@ from datetime import datetime
 
 from django.contrib.gis.db import models
 from django.contrib.gis.geos import GEOSGeometry
+from django.db.models import BooleanField
+from django.db.models import Func
 from django.db.models import Q
+from django.db.models import TextField
+from django.db.models import Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Concat
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework.exceptions import ValidationError
@@ -53,7 +59,7 @@ class ItemQuerySet(models.QuerySet):
                 code='bbox-invalid'
             ) from None
 
-        return self.filter(geometry__intersects=bbox_geometry)
+        return self.filter_by_geometry(bbox_geometry)
 
     def filter_by_datetime(self, date_time):
         '''Filter a queryset by datetime
@@ -87,23 +93,25 @@ class ItemQuerySet(models.QuerySet):
         Returns:
             The queryset filtered by datetime range
         '''
+        # The ranges are matched on the `datetime_range` generated column (see migration 0014)
+        # which holds [datetime, datetime] or [start_datetime, end_datetime] and has a GiST
+        # index. The items matching the query range are the items whose range is contained by
+        # the query range.
         if start_datetime == '..':
             # open start range
-            return self.filter(
-                Q(properties_datetime__lte=end_datetime) |
-                Q(properties_end_datetime__lte=end_datetime)
-            )
-        if end_datetime == '..':
+            query_range = (None, end_datetime, '(]')
+        elif end_datetime == '..':
             # open end range
-            return self.filter(
-                Q(properties_datetime__gte=start_datetime) |
-                Q(properties_start_datetime__gte=start_datetime)
-            )
-            # else fixed range
+            query_range = (start_datetime, None, '[)')
+        else:
+            # fixed range
+            query_range = (start_datetime, end_datetime, '[]')
+        table = self.model._meta.db_table  # pylint: disable=protected-access
         return self.filter(
-            Q(properties_datetime__range=(start_datetime, end_datetime)) | (
-                Q(properties_start_datetime__gte=start_datetime) &
-                Q(properties_end_datetime__lte=end_datetime)
+            RawSQL(
+                f'{table}.datetime_range <@ tstzrange(%s, %s, %s)',
+                query_range,
+                output_field=BooleanField()
             )
         )
 
@@ -191,7 +199,35 @@ class ItemQuerySet(models.QuerySet):
             ValueError or GDALException: When the Geojson is not a valid geometry
         '''
         the_geom = GEOSGeometry(intersects)
-        return self.filter(geometry__intersects=the_geom)
+        return self.filter_by_geometry(the_geom)
+
+    def filter_by_geometry(self, geometry):
+        '''Filter the items intersecting a geometry
+
+        The filter is done in two phases, first the items whose bbox overlaps the geometry bbox
+        are selected using the geometry spatial index (&&). Then when the geometry is a rectangle
+        the items whose bbox is within the rectangle intersect it, the exact intersection test
+        is therefore only done for the other items.
+
+        Args:
+            geometry: GEOSGeometry
+                Geometry
+
+        Returns:
+            queryset filtered by geometry
+        '''
+        queryset = self.filter(geometry__bboverlaps=geometry)
+        if geometry.srid in (None, 4326) and geometry.equals(geometry.envelope):
+            xmin, ymin, xmax, ymax = geometry.extent
+            return queryset.filter(
+                Q(
+                    bbox_xmin__gte=xmin,
+                    bbox_ymin__gte=ymin,
+                    bbox_xmax__lte=xmax,
+                    bbox_ymax__lte=ymax,
+                ) | Q(geometry__intersects=geometry)
+            )
+        return queryset.filter(geometry__intersects=geometry)
 
     def filter_by_query(self, query):
         '''Filter by the query parameter
@@ -255,6 +291,31 @@ class AssetUploadQuerySet(models.QuerySet):
 
         return self.filter(status=status)
 
+    def annotate_s3_key(self):
+        '''Annotate the queryset with the S3 key of the uploads' asset file
+
+        The key (see stac_api.utils.get_asset_path()) is built by the DB into the `s3_key`
+        annotation in the binary collation, which sorts the keys in the same order as S3 (UTF-8
+        bytes order). The queryset can then be filtered and ordered on it.
+
+        Returns:
+            queryset annotated with s3_key
+        '''
+        return self.annotate(
+            s3_key=Func(
+                Concat(
+                    'asset__item__collection__name',
+                    Value('/'),
+                    'asset__item__name',
+                    Value('/'),
+                    'asset__name',
+                    output_field=TextField()
+                ),
+                template='(%(expressions)s) COLLATE "C"',
+                output_field=TextField()
+            )
+        )
+
 
 class AssetUploadManager(models.Manager):
 
@@ -263,3 +324,6 @@ class AssetUploadManager(models.Manager):
 
     def filter_by_status(self, status):
         return self.get_queryset().filter_by_status(status)
+
+    def annotate_s3_key(self):
+        return self.get_queryset().annotate_s3_key()
@@ -0,0 +1,19 @@
+# Generated by Django 3.1.10 on 2021-07-20 08:12
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0012_auto_20210709_0734'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='document',
+            field=models.TextField(blank=True, default=None, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0013_item_document'),
+    ]
+
+    # The datetime_range column is generated by the DB and is therefore not a model field, it is
+    # used by ItemQuerySet.filter_by_datetime()
+    operations = [
+        migrations.RunSQL(
+            sql='''
+            ALTER TABLE stac_api_item ADD COLUMN datetime_range tstzrange
+                GENERATED ALWAYS AS (tstzrange(
+                    COALESCE(properties_datetime, properties_start_datetime),
+                    COALESCE(properties_datetime, properties_end_datetime),
+                    '[]'
+                )) STORED;
+            CREATE INDEX item_datetime_range_idx ON stac_api_item USING gist (datetime_range);
+            ''',
+            reverse_sql='''
+            DROP INDEX item_datetime_range_idx;
+            ALTER TABLE stac_api_item DROP COLUMN datetime_range;
+            '''
+        ),
+    ]
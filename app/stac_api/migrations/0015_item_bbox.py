@@ -0,0 +1,44 @@
+# Generated by Django 3.1.10 on 2021-07-26 09:12
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0014_item_datetime_range'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='bbox_xmax',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='bbox_xmin',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='bbox_ymax',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='bbox_ymin',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            sql='''
+            UPDATE stac_api_item SET
+                bbox_xmin = ST_XMin(geometry),
+                bbox_ymin = ST_YMin(geometry),
+                bbox_xmax = ST_XMax(geometry),
+                bbox_ymax = ST_YMax(geometry)
+            ''',
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.1.10 on 2021-07-28 14:05
+
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0015_item_bbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                (
+                    'collection',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='changes',
+                        to='stac_api.collection'
+                    )
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 3.1.10 on 2021-07-30 08:41
+
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0016_collectionchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionSummaryValue',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('field', models.CharField(max_length=30)),
+                ('value', models.JSONField()),
+                ('asset_count', models.IntegerField(default=0)),
+                (
+                    'collection',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='summary_values',
+                        to='stac_api.collection'
+                    )
+                ),
+            ],
+            options={
+                'unique_together': {('collection', 'field', 'value')},
+            },
+        ),
+        # Count the existing assets per summary value
+        migrations.RunSQL(
+            '''
+            INSERT INTO stac_api_collectionsummaryvalue (collection_id, field, value, asset_count)
+            SELECT item.collection_id, 'eo:gsd', to_jsonb(asset.eo_gsd), count(*)
+            FROM stac_api_asset AS asset JOIN stac_api_item AS item ON item.id = asset.item_id
+            WHERE asset.eo_gsd IS NOT NULL
+            GROUP BY item.collection_id, asset.eo_gsd
+            UNION ALL
+            SELECT
+                item.collection_id, 'geoadmin:variant', to_jsonb(asset.geoadmin_variant), count(*)
+            FROM stac_api_asset AS asset JOIN stac_api_item AS item ON item.id = asset.item_id
+            WHERE asset.geoadmin_variant <> ''
+            GROUP BY item.collection_id, asset.geoadmin_variant
+            UNION ALL
+            SELECT item.collection_id, 'proj:epsg', to_jsonb(asset.proj_epsg), count(*)
+            FROM stac_api_asset AS asset JOIN stac_api_item AS item ON item.id = asset.item_id
+            WHERE asset.proj_epsg IS NOT NULL
+            GROUP BY item.collection_id, asset.proj_epsg
+            ''',
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.1.10 on 2021-08-02 10:17
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0017_collectionsummaryvalue'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['collection', 'bbox_xmin'], name='item_collection_xmin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['collection', 'bbox_ymin'], name='item_collection_ymin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['collection', 'bbox_xmax'], name='item_collection_xmax_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['collection', 'bbox_ymax'], name='item_collection_ymax_idx'),
+        ),
+    ]
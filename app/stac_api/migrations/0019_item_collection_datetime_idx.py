@@ -0,0 +1,34 @@
+# Generated by Django 3.1.10 on 2021-08-03 13:52
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0018_item_collection_bbox_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(
+                fields=['collection', 'properties_datetime'], name='item_collection_dttm_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(
+                fields=['collection', 'properties_start_datetime'],
+                name='item_collection_start_dttm_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(
+                fields=['collection', 'properties_end_datetime'],
+                name='item_collection_end_dttm_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.1.10 on 2021-08-05 09:12
+
+import django.core.validators
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0019_item_collection_datetime_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assetupload',
+            name='number_parts',
+            field=models.IntegerField(
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(10000)
+                ]
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.1.10 on 2021-08-06 08:41
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0020_assetupload_number_parts_max'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='assetupload',
+            name='unique_in_progress',
+        ),
+        migrations.AddField(
+            model_name='assetupload',
+            name='completion_started',
+            field=models.DateTimeField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='assetupload',
+            name='failure_reason',
+            field=models.TextField(blank=True, default=None, null=True),
+        ),
+        migrations.AlterField(
+            model_name='assetupload',
+            name='status',
+            field=models.CharField(
+                choices=[(None, ''), ('in-progress', 'In Progress'), ('completing', 'Completing'),
+                         ('completed', 'Completed'), ('aborted', 'Aborted'), ('failed', 'Failed')],
+                default='in-progress',
+                max_length=32
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='assetupload',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(status__in=['in-progress', 'completing']),
+                fields=('asset',),
+                name='unique_in_progress'
+            ),
+        ),
+    ]
@@ -1,7 +1,9 @@
 import hashlib
 import logging
 import os
+import threading
 import time
+from contextlib import contextmanager
 from uuid import uuid4
 
 from multihash import encode as multihash_encode
@@ -17,6 +19,7 @@ from django.core.validators import MaxValueValidator
 from django.core.validators import MinValueValidator
 from django.db.models import Q
 from django.db.models.deletion import ProtectedError
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from solo.models import SingletonModel
@@ -25,6 +28,9 @@ from stac_api.collection_spatial_extent import CollectionSpatialExtentMixin
 from stac_api.collection_summaries import UPDATE_SUMMARIES_FIELDS
 from stac_api.collection_summaries import CollectionSummariesMixin
 from stac_api.collection_temporal_extent import CollectionTemporalExtentMixin
+from stac_api.collection_updates import CollectionUpdatesMixin
+from stac_api.etag_cache import clear_etags
+from stac_api.etag_cache import invalidate_etag
 from stac_api.managers import AssetUploadManager
 from stac_api.managers import ItemManager
 from stac_api.utils import get_asset_path
@@ -157,6 +163,80 @@ def get_save_trigger(instance):
     return trigger
 
 
+def invalidate_etag_cache(instance, *names):
+    '''Invalidate the cached ETag of a model instance
+
+    When the instance has been renamed, the cache keys of all its children change as well,
+    therefore in this case the whole ETag cache is cleared.
+
+    Args:
+        instance: Collection | Item | Asset
+            Model instance with its original values (see from_db())
+        *names: string
+            Instance URL kwargs (see stac_api.etag_cache.get_etag_cache_key())
+    '''
+    original_name = instance._original_values.get('name', None)  # pylint: disable=protected-access
+    if original_name is not None and original_name != instance.name:
+        clear_etags()
+    else:
+        invalidate_etag(*names)
+
+
+# Parent objects whose changes have already been propagated within the current
+# propagate_changes_once() block, NOTE: with gevent the thread local are greenlet local
+_propagated_changes = threading.local()
+
+
+@contextmanager
+def propagate_changes_once():
+    '''Propagate the changes to each parent object only once within the block
+
+    This is meant to wrap a whole write transaction (e.g. a write request), the parent objects
+    ETag being only visible by others once the transaction is committed.
+    '''
+    if getattr(_propagated_changes, 'objects', None) is not None:
+        # nested block
+        yield
+        return
+    _propagated_changes.objects = set()
+    try:
+        yield
+    finally:
+        _propagated_changes.objects = None
+
+
+def propagate_changes(instance, *names):
+    '''Propagate the change of a child object (e.g. an asset) to its parent
+
+    The parent ETag and updated fields are bumped with a single targeted UPDATE, the parent row is
+    not saved again. The serialized document of an item is reset as well. Within a
+    propagate_changes_once() block, this is only done once per parent.
+
+    Args:
+        instance: Collection | Item
+            Parent model instance
+        *names: string
+            Parent URL kwargs (see stac_api.etag_cache.get_etag_cache_key())
+    '''
+    model = type(instance)
+    key = (model, instance.pk)
+    propagated = getattr(_propagated_changes, 'objects', None)
+    if propagated is not None:
+        if key in propagated:
+            return
+        propagated.add(key)
+    logger.debug('Propagating changes to %s %s', model.__name__, instance.pk)
+    instance.etag = compute_etag()
+    instance.updated = timezone.now()
+    fields = {'etag': instance.etag, 'updated': instance.updated}
+    if model is Item:
+        # The item document is bound to the ETag (see Item.update_etag())
+        instance.document = None
+        fields['document'] = None
+    model.objects.filter(pk=instance.pk).update(**fields)
+    invalidate_etag(*names)
+
+
 class Link(models.Model):
     href = models.URLField()
     rel = models.CharField(max_length=30, validators=[validate_link_rel])
@@ -245,7 +325,7 @@ class Provider(models.Model):
         # parameters
         logger.debug('Saving CollectionProvider %s', self.name)
         super().save(*args, **kwargs)
-        self.collection.save()  # save the collection to updated its ETag
+        propagate_changes(self.collection, self.collection.name)  # update the collection ETag
 
     def clean(self):
         if self.roles is None:
@@ -262,6 +342,8 @@ class Provider(models.Model):
                 )
 
 
+COLLECTION_KEEP_ORIGINAL_FIELDS = ['name']
+
 # For Collections and Items: No primary key will be defined, so that the auto-generated ones
 # will be used by Django. For assets, a primary key is defined as "BigAutoField" due the
 # expected large number of assets
@@ -271,7 +353,8 @@ class Collection(
     models.Model,
     CollectionSpatialExtentMixin,
     CollectionSummariesMixin,
-    CollectionTemporalExtentMixin
+    CollectionTemporalExtentMixin,
+    CollectionUpdatesMixin
 ):
 
     class Meta:
@@ -314,6 +397,25 @@ class Collection(
     # hidden ETag field
     etag = models.CharField(blank=False, null=False, editable=False, max_length=56)
 
+    def __init__(self, *args, **kwargs):
+        self._original_values = {}
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+
+        # Save original values for some fields, when model is loaded from database,
+        # in a separate attribute on the model, this simplify the ETag cache invalidation.
+        # See https://docs.djangoproject.com/en/3.1/ref/models/instances/#customizing-model-loading
+        instance._original_values = dict( # pylint: disable=protected-access
+            filter(
+                lambda item: item[0] in COLLECTION_KEEP_ORIGINAL_FIELDS, zip(field_names, values)
+            )
+        )
+
+        return instance
+
     def __str__(self):
         return self.name
 
@@ -329,6 +431,45 @@ class Collection(
         logger.debug('Saving collection', extra={'collection': self.name})
         self.update_etag()
         super().save(*args, **kwargs)
+        invalidate_etag_cache(self, self.name)
+
+        # update the original_values just in case save() is called again without reloading from db
+        self._original_values = {key: getattr(self, key) for key in COLLECTION_KEEP_ORIGINAL_FIELDS}
+
+    def delete(self, *args, **kwargs):  # pylint: disable=signature-differs
+        # It is important to use `*args, **kwargs` in signature because django might add dynamically
+        # parameters
+        super().delete(*args, **kwargs)
+        invalidate_etag_cache(self, self.name)
+
+
+class CollectionChange(models.Model):
+    '''Pending update of the collection extent and summaries
+
+    A change is inserted for each item or asset write when settings.COLLECTION_UPDATES_DEFERRED
+    is set, and removed by the worker updating the collection (see stac_api.collection_updates).
+    '''
+
+    id = models.BigAutoField(primary_key=True)
+    collection = models.ForeignKey(Collection, related_name='changes', on_delete=models.CASCADE)
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+
+class CollectionSummaryValue(models.Model):
+    '''Number of assets of a collection having a summary value (see CollectionSummariesMixin)
+    '''
+
+    class Meta:
+        unique_together = (('collection', 'field', 'value'),)
+
+    id = models.BigAutoField(primary_key=True)
+    collection = models.ForeignKey(
+        Collection, related_name='summary_values', on_delete=models.CASCADE
+    )
+    # collection summaries key, e.g. 'eo:gsd'
+    field = models.CharField(max_length=30)
+    value = models.JSONField()
+    asset_count = models.IntegerField(default=0)
 
 
 class CollectionLink(Link):
@@ -346,10 +487,11 @@ class CollectionLink(Link):
             'Saving collection link %s', self.rel, extra={'collection': self.collection.name}
         )
         super().save(*args, **kwargs)
-        self.collection.save()  # save the collection to updated its ETag
+        propagate_changes(self.collection, self.collection.name)  # update the collection ETag
 
 
 ITEM_KEEP_ORIGINAL_FIELDS = [
+    'name',
     'geometry',
     'properties_datetime',
     'properties_start_datetime',
@@ -363,7 +505,7 @@ class Item(models.Model):
         unique_together = (('collection', 'name'),)
         indexes = [
             models.Index(fields=['name'], name='item_name_idx'),
-            # the following 3 indices are used e.g. in collection_temporal_extent
+            # the following 3 indices are used e.g. in the datetime filters
             models.Index(fields=['properties_datetime'], name='item_datetime_idx'),
             models.Index(fields=['properties_start_datetime'], name='item_start_datetime_idx'),
             models.Index(fields=['properties_end_datetime'], name='item_end_datetime_idx'),
@@ -380,6 +522,25 @@ class Item(models.Model):
                 ],
                 name='item_dttme_start_end_dttm_idx'
             ),
+            # the following 4 indices are used to find the items defining the collection extent
+            # edges, see collection_spatial_extent
+            models.Index(fields=['collection', 'bbox_xmin'], name='item_collection_xmin_idx'),
+            models.Index(fields=['collection', 'bbox_ymin'], name='item_collection_ymin_idx'),
+            models.Index(fields=['collection', 'bbox_xmax'], name='item_collection_xmax_idx'),
+            models.Index(fields=['collection', 'bbox_ymax'], name='item_collection_ymax_idx'),
+            # the following 3 indices are used to find the items defining the collection temporal
+            # extent, see collection_temporal_extent
+            models.Index(
+                fields=['collection', 'properties_datetime'], name='item_collection_dttm_idx'
+            ),
+            models.Index(
+                fields=['collection', 'properties_start_datetime'],
+                name='item_collection_start_dttm_idx'
+            ),
+            models.Index(
+                fields=['collection', 'properties_end_datetime'],
+                name='item_collection_end_dttm_idx'
+            ),
         ]
 
     name = models.CharField('id', blank=False, max_length=255, validators=[validate_name])
@@ -389,6 +550,12 @@ class Item(models.Model):
     geometry = models.PolygonField(
         null=False, blank=False, default=BBOX_CH, srid=4326, validators=[validate_geometry]
     )
+    # Bounding box of the geometry, updated on save (see update_bbox()). It is used to serve the
+    # item bbox and to speed up the bbox filters without processing the geometry.
+    bbox_xmin = models.FloatField(null=True, blank=True, editable=False)
+    bbox_ymin = models.FloatField(null=True, blank=True, editable=False)
+    bbox_xmax = models.FloatField(null=True, blank=True, editable=False)
+    bbox_ymax = models.FloatField(null=True, blank=True, editable=False)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
     # after discussion with Chris and Tobias: for the moment only support
@@ -428,6 +595,11 @@ class Item(models.Model):
     # hidden ETag field
     etag = models.CharField(blank=False, null=False, editable=False, max_length=56)
 
+    # hidden serialized STAC document (JSON string without the host dependent hrefs and auto
+    # links), it is reset on each ETag update and rebuilt on demand by the list views.
+    # See stac_api.item_documents
+    document = models.TextField(blank=True, null=True, editable=False, default=None)
+
     # Custom Manager that preselects the collection
     objects = ItemManager()
 
@@ -454,8 +626,26 @@ class Item(models.Model):
 
     def update_etag(self):
         '''Update the ETag with a new UUID
+
+        The serialized document is bound to the ETag and therefore invalidated as well.
         '''
         self.etag = compute_etag()
+        self.document = None
+
+    def update_bbox(self):
+        '''Update the bbox fields from the geometry'''
+        if self.geometry is None:
+            self.bbox_xmin = self.bbox_ymin = self.bbox_xmax = self.bbox_ymax = None
+        else:
+            self.bbox_xmin, self.bbox_ymin, self.bbox_xmax, self.bbox_ymax = self.geometry.extent
+
+    @property
+    def bbox(self):
+        '''Bounding box [xmin, ymin, xmax, ymax] of the geometry or None'''
+        bbox = [self.bbox_xmin, self.bbox_ymin, self.bbox_xmax, self.bbox_ymax]
+        if None in bbox:
+            return None
+        return bbox
 
     def clean(self):
         validate_item_properties_datetimes(
@@ -468,18 +658,33 @@ class Item(models.Model):
         logger.debug('Saving item', extra={'collection': self.collection.name, 'item': self.name})
 
         self.update_etag()
+        self.update_bbox()
 
         trigger = get_save_trigger(self)
+        if settings.COLLECTION_UPDATES_DEFERRED:
+            # only the extent update is deferred, the collection ETag must change right away
+            self.collection.request_update()
+            propagate_changes(self.collection, self.collection.name)
+        elif settings.COLLECTION_EXTENT_ATOMIC_MERGE and trigger == 'insert':
+            self.collection.merge_extent([self])
+        else:
+            with self.collection.extent_update():
+                updated = self.collection.update_temporal_extent(
+                    self, trigger, self._original_values
+                )
 
-        self.collection.update_temporal_extent(self, trigger, self._original_values)
-
-        self.collection.update_bbox_extent(
-            trigger, self.geometry, self._original_values.get('geometry', None), self
-        )
+                updated |= self.collection.update_bbox_extent(
+                    trigger, self.geometry, self._original_values.get('geometry', None), self
+                )
 
-        self.collection.save()
+                # the collection row is only saved when its extent changed
+                if updated:
+                    self.collection.save_extent()
+                else:
+                    propagate_changes(self.collection, self.collection.name)
 
         super().save(*args, **kwargs)
+        invalidate_etag_cache(self, self.collection.name, self.name)
 
         # update the original_values just in case save() is called again without reloading from db
         self._original_values = {key: getattr(self, key) for key in ITEM_KEEP_ORIGINAL_FIELDS}
@@ -489,13 +694,24 @@ class Item(models.Model):
         # parameters
         logger.debug('Deleting item', extra={'collection': self.collection.name, 'item': self.name})
 
-        self.collection.update_temporal_extent(self, 'delete', self._original_values)
+        if settings.COLLECTION_UPDATES_DEFERRED:
+            self.collection.request_update()
+            propagate_changes(self.collection, self.collection.name)
+        else:
+            with self.collection.extent_update():
+                updated = self.collection.update_temporal_extent(
+                    self, 'delete', self._original_values
+                )
 
-        self.collection.update_bbox_extent('delete', self.geometry, None, self)
+                updated |= self.collection.update_bbox_extent('delete', self.geometry, None, self)
 
-        self.collection.save()
+                if updated:
+                    self.collection.save_extent()
+                else:
+                    propagate_changes(self.collection, self.collection.name)
 
         super().delete(*args, **kwargs)
+        invalidate_etag_cache(self, self.collection.name, self.name)
 
 
 class ItemLink(Link):
@@ -514,7 +730,9 @@ class ItemLink(Link):
             }
         )
         super().save(*args, **kwargs)
-        self.item.save()  # We save the item to update its ETag
+        # update the item ETag and the collection ETag, on which the items list ETags depend
+        propagate_changes(self.item, self.item.collection.name, self.item.name)
+        propagate_changes(self.item.collection, self.item.collection.name)
 
 
 ASSET_KEEP_ORIGINAL_FIELDS = ["name", "file"] + UPDATE_SUMMARIES_FIELDS
@@ -655,8 +873,58 @@ class Asset(models.Model):
         '''
         self.etag = compute_etag()
 
-    # alter save-function, so that the corresponding collection of the parent item of the asset
-    # is saved, too.
+    def upload_file(self):
+        '''Upload the new asset file while computing its checksum in a single read
+
+        Unlike upload_asset_to_path_hook(), which reads the whole file to compute its checksum
+        before the storage reads it again to upload it, the checksum is computed while streaming
+        the file to the storage (see stac_api.storages.S3Storage.save_with_sha256()).
+        '''
+        logger.debug(
+            'Uploading asset file %s (file size: %.1f MB)',
+            self.file.name,
+            self.file.size / 1024**2,
+            extra={
+                'collection': self.item.collection.name, 'item': self.item.name, 'asset': self.name
+            }
+        )
+        name, sha256 = self.file.storage.save_with_sha256(
+            get_asset_path(self.item, self.name),
+            self.file.file,
+            max_length=self._meta.get_field('file').max_length
+        )
+        self.file.name = name
+        self.file._committed = True  # pylint: disable=protected-access
+        self.checksum_multihash = to_hex_string(multihash_encode(bytes.fromhex(sha256), 'sha2-256'))
+
+    def update_collection_summaries(self, trigger, old_values):
+        '''Update the summaries of the asset's collection
+
+        The collection row is only saved when its summaries changed, otherwise only the change is
+        propagated to it.
+
+        Args:
+            trigger: string
+                Asset trigger event, one of 'insert', 'update' or 'delete'
+            old_values: list | None
+                Original values of the asset's UPDATE_SUMMARIES_FIELDS
+        '''
+        collection = self.item.collection
+        if settings.COLLECTION_UPDATES_DEFERRED:
+            # only the summaries update is deferred, the collection ETag must change right away
+            collection.request_update()
+            propagate_changes(collection, collection.name)
+        elif collection.update_summaries(self, trigger, old_values=old_values):
+            if settings.COLLECTION_EXTENT_ATOMIC_MERGE:
+                # don't overwrite the extent merged by concurrent item insertions
+                collection.save(update_fields=['summaries', 'etag', 'updated'])
+            else:
+                collection.save()
+        else:
+            propagate_changes(collection, collection.name)
+
+    # alter save-function, so that the corresponding item and collection of the asset are updated,
+    # too.
     def save(self, *args, **kwargs):  # pylint: disable=signature-differs
         logger.debug(
             'Saving asset',
@@ -666,14 +934,25 @@ class Asset(models.Model):
         )
         self.update_etag()
 
+        # pylint: disable=protected-access
+        if (
+            settings.UPLOAD_STREAMING_HASH and self.file and not self.file._committed and
+            self.file.size > settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        ):
+            # the small files are kept in memory and hashed before their upload (see
+            # upload_asset_to_path_hook()), the large ones are hashed while being uploaded
+            self.upload_file()
+
         trigger = get_save_trigger(self)
 
         old_values = [self._original_values.get(field, None) for field in UPDATE_SUMMARIES_FIELDS]
 
-        self.item.collection.update_summaries(self, trigger, old_values=old_values)
-        self.item.save()  # We save the item to update its ETag
+        self.update_collection_summaries(trigger, old_values)
+        # update the item ETag
+        propagate_changes(self.item, self.item.collection.name, self.item.name)
 
         super().save(*args, **kwargs)
+        invalidate_etag_cache(self, self.item.collection.name, self.item.name, self.name)
 
         # update the original_values just in case save() is called again without reloading from db
         fields = [field.name for field in self._meta.get_fields()]
@@ -688,9 +967,14 @@ class Asset(models.Model):
         )
         # It is important to use `*args, **kwargs` in signature because django might add dynamically
         # parameters
-        self.item.collection.update_summaries(self, 'delete', old_values=None)
-        self.item.save()  # We save the item to update its ETag
+        self.update_collection_summaries('delete', None)
+        # update the item ETag
+        propagate_changes(self.item, self.item.collection.name, self.item.name)
 
+        # The asset uploads are deleted in cascade
+        upload_ids = list(
+            AssetUpload.objects.filter(asset=self).values_list('upload_id', flat=True)
+        )
         try:
             super().delete(*args, **kwargs)
         except ProtectedError as error:
@@ -705,6 +989,10 @@ class Asset(models.Model):
                 }
             )
             raise ValidationError(error.args[0]) from None
+        names = [self.item.collection.name, self.item.name, self.name]
+        invalidate_etag_cache(self, *names)
+        for upload_id in upload_ids:
+            invalidate_etag(*names, upload_id)
 
     def clean(self):
         validate_asset_name_with_media_type(self.name, self.media_type)
@@ -715,10 +1003,11 @@ class AssetUpload(models.Model):
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['asset', 'upload_id'], name='unique_together'),
-            # Make sure that there is only one asset upload in progress per asset
+            # Make sure that there is only one asset upload in progress (or being completed) per
+            # asset
             models.UniqueConstraint(
-                fields=['asset', 'status'],
-                condition=Q(status='in-progress'),
+                fields=['asset'],
+                condition=Q(status__in=['in-progress', 'completing']),
                 name='unique_in_progress'
             )
         ]
@@ -726,8 +1015,12 @@ class AssetUpload(models.Model):
     class Status(models.TextChoices):
         # pylint: disable=invalid-name
         IN_PROGRESS = 'in-progress'
+        # completion requested asynchronously, see stac_api.upload_completion
+        COMPLETING = 'completing'
         COMPLETED = 'completed'
         ABORTED = 'aborted'
+        # asynchronous completion failed, see failure_reason
+        FAILED = 'failed'
         __empty__ = ''
 
     # using BigIntegerField as primary_key to deal with the expected large number of assets.
@@ -738,11 +1031,17 @@ class AssetUpload(models.Model):
         choices=Status.choices, max_length=32, default=Status.IN_PROGRESS, blank=False, null=False
     )
     number_parts = models.IntegerField(
-        validators=[MinValueValidator(1), MaxValueValidator(100)], null=False, blank=False
+        validators=[MinValueValidator(1), MaxValueValidator(10000)], null=False, blank=False
     )  # S3 doesn't support more that 10'000 parts
+    # presigned urls of the parts, only created with the upload when it has at most
+    # settings.UPLOAD_PRESIGNED_URLS_MAX_PARTS parts, otherwise they are created on demand
     urls = models.JSONField(default=list, encoder=DjangoJSONEncoder, blank=True)
     created = models.DateTimeField(auto_now_add=True)
     ended = models.DateTimeField(blank=True, null=True, default=None)
+    # start of the asynchronous completion, see stac_api.upload_completion
+    completion_started = models.DateTimeField(blank=True, null=True, default=None)
+    # reason of the asynchronous completion failure
+    failure_reason = models.TextField(blank=True, null=True, default=None)
     checksum_multihash = models.CharField(max_length=255, blank=False, null=False)
 
     # hidden ETag field
@@ -754,6 +1053,15 @@ class AssetUpload(models.Model):
     def save(self, *args, **kwargs):  # pylint: disable=signature-differs
         self.update_etag()
         super().save(*args, **kwargs)
+        invalidate_etag(
+            self.asset.item.collection.name, self.asset.item.name, self.asset.name, self.upload_id
+        )
+
+    def delete(self, *args, **kwargs):  # pylint: disable=signature-differs
+        super().delete(*args, **kwargs)
+        invalidate_etag(
+            self.asset.item.collection.name, self.asset.item.name, self.asset.name, self.upload_id
+        )
 
     def update_etag(self):
         '''Update the ETag with a new UUID
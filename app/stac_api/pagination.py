@@ -1,4 +1,6 @@
 import logging
+from base64 import b64decode
+from base64 import b64encode
 from urllib import parse
 
 from django.conf import settings
@@ -9,7 +11,6 @@ from rest_framework import pagination
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.utils.urls import remove_query_param
 from rest_framework.utils.urls import replace_query_param
 
 from stac_api.utils import get_query_params
@@ -104,45 +105,6 @@ def validate_page_size(size_string, max_page_size, log_extra=None):
     return page_size
 
 
-def validate_offset(offset_string, log_extra=None):
-    '''Parse and validate offset
-
-    Args:
-        offset_string: string
-            page size in string
-        log_extra: dict
-            extra to add to the log message in case of error
-
-    Returns: int
-        Offset parsed
-
-    Raises:
-        ValidationError: if offset is invalid
-    '''
-    try:
-        offset = int(offset_string)
-    except ValueError as error:
-        logger.error(
-            'Invalid query parameter offset=%s: must be an integer', offset_string, extra=log_extra
-        )
-        raise ValidationError(
-            _('invalid offset query parameter: must be an integer'),
-            code='invalid'
-        ) from None
-
-    if offset < 0:
-        logger.error(
-            'Invalid query parameter offset=%d: negative number not allowed',
-            offset,
-            extra=log_extra
-        )
-        raise ValidationError(
-            _('offset query parameter too small, must be positive'),
-            code='invalid'
-        )
-    return offset
-
-
 class CursorPagination(pagination.CursorPagination):
     '''Default pagination for all endpoints
     '''
@@ -163,9 +125,9 @@ class CursorPagination(pagination.CursorPagination):
             return tuple(ordering)
         return super().get_ordering(request, queryset, view)
 
-    def get_paginated_response(self, data):
+    def get_paginated_response(self, data, response_class=Response):  # pylint: disable=arguments-differ
         update_links_with_pagination(data, self.get_previous_link(), self.get_next_link())
-        return Response(data)
+        return response_class(data)
 
     def get_page_size(self, request):
         # Overwrite the default implementation about the page size as this one
@@ -183,13 +145,13 @@ class GetPostCursorPagination(CursorPagination):
     pagination is either in query or in payload depending on the method.
     '''
 
-    def get_paginated_response(self, data, request=None):  # pylint: disable=arguments-differ
+    def get_paginated_response(self, data, request=None, response_class=Response):  # pylint: disable=arguments-differ
         data, previous_link, next_link = update_links_with_pagination(
             data, self.get_previous_link(), self.get_next_link()
         )
         self.patch_link(previous_link, request)
         self.patch_link(next_link, request)
-        return Response(data)
+        return response_class(data)
 
     def get_page_size(self, request):
         if request.method == 'POST':
@@ -242,52 +204,63 @@ class GetPostCursorPagination(CursorPagination):
         return link
 
 
-class ExtApiPagination:
+class ExtApiCursorPagination:
     """
-    A limit/offset based style pagination for external API (e.g. S3)
+    A cursor based pagination for external API with integer markers (e.g. S3 ListParts)
+
+    The cursor is the opaque encoding of the marker returned by the external API for the next
+    page (e.g. S3 NextPartNumberMarker), each page is therefore retrieved with a single external
+    API call whatever its position. As the external API only allows to go forward, there is no
+    previous link. The former `offset` query parameter is rejected, otherwise its clients would
+    silently get the first page again.
 
     http://api.example.org/accounts/?limit=100
-    http://api.example.org/accounts/?offset=400&limit=100
+    http://api.example.org/accounts/?cursor=bT0xMDA%3D&limit=100
     """
     default_limit = settings.REST_FRAMEWORK['PAGE_SIZE']
     max_limit = settings.REST_FRAMEWORK['PAGE_SIZE_LIMIT']
     limit_query_param = 'limit'
-    offset_query_param = 'offset'
+    cursor_query_param = 'cursor'
+    removed_query_params = ['offset']
 
     def get_pagination_config(self, request):
         # pylint: disable=attribute-defined-outside-init
         self.request = request
+        self.validate_removed_query_params(request)
         self.limit = self.get_limit(request)
-        self.offset = self.get_offset(request)
-        return self.limit, self.offset
+        self.marker = self.decode_cursor(request)
+        return self.limit, self.marker
 
-    def get_next_link(self):
+    def get_next_link(self, next_marker):
         next_url = self.request.build_absolute_uri()
         next_url = replace_query_param(next_url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            next_url, self.cursor_query_param, self.encode_cursor(next_marker)
+        )
 
-        offset = self.offset + self.limit
-        return replace_query_param(next_url, self.offset_query_param, offset)
-
-    def get_previous_link(self):
-        if self.offset <= 0:
-            return None
-
-        previous_url = self.request.build_absolute_uri()
-        previous_url = replace_query_param(previous_url, self.limit_query_param, self.limit)
-
-        if self.offset - self.limit <= 0:
-            previous_url = remove_query_param(previous_url, self.offset_query_param)
-        else:
-            offset = self.offset - self.limit
-            previous_url = replace_query_param(previous_url, self.offset_query_param, offset)
-        return previous_url
-
-    def get_paginated_response(self, data, has_next):
+    def get_paginated_response(self, data, next_marker):
         update_links_with_pagination(
-            data, self.get_previous_link(), self.get_next_link() if has_next else None
+            data, None, self.get_next_link(next_marker) if next_marker is not None else None
         )
         return Response(data)
 
+    def validate_removed_query_params(self, request):
+        for param in self.removed_query_params:
+            if param in request.query_params:
+                logger.error(
+                    'Unsupported query parameter %s=%s',
+                    param,
+                    request.query_params[param],
+                    extra={'request': request}
+                )
+                message = _('%(param)s query parameter is not supported, use the %(cursor)s '
+                            'of the next link instead')
+                raise ValidationError(
+                    message % {
+                        'param': param, 'cursor': self.cursor_query_param
+                    }, code='invalid'
+                )
+
     def get_limit(self, request):
         return validate_page_size(
             request.query_params.get(self.limit_query_param, str(self.default_limit)),
@@ -295,8 +268,23 @@ class ExtApiPagination:
             log_extra={'request': request}
         )
 
-    def get_offset(self, request):
-        return validate_offset(
-            request.query_params.get(self.offset_query_param, str(0)),
-            log_extra={'request': request}
-        )
+    def encode_cursor(self, marker):
+        querystring = parse.urlencode({'m': marker})
+        return b64encode(querystring.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param, None)
+        if encoded is None:
+            return None
+        try:
+            querystring = b64decode(encoded.encode('ascii'), validate=True).decode('ascii')
+            marker = int(parse.parse_qs(querystring, strict_parsing=True)['m'][0])
+            if marker < 0:
+                raise ValueError('Negative marker')
+        except (ValueError, KeyError, UnicodeError):
+            logger.error('Invalid query parameter cursor=%s', encoded, extra={'request': request})
+            raise ValidationError(
+                _('invalid cursor query parameter'),
+                code='invalid'
+            ) from None
+        return marker
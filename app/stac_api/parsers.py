@@ -0,0 +1,32 @@
+import codecs
+import json
+import logging
+
+from django.conf import settings
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+logger = logging.getLogger(__name__)
+
+
+class NDJSONParser(BaseParser):
+    '''Newline delimited JSON parser
+
+    Parses the request body as a list of JSON objects, one per line. Empty lines are ignored.
+    '''
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        data = []
+        number = 0
+        try:
+            for number, line in enumerate(codecs.getreader(encoding)(stream), start=1):
+                if line.strip():
+                    data.append(json.loads(line))
+        except ValueError as error:
+            logger.error('Failed to parse NDJSON line %d: %s', number, error)
+            raise ParseError(f'NDJSON parse error at line {number} - {error}') from None
+        return data
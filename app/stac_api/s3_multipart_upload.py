@@ -130,7 +130,7 @@ class MultipartUpload:
             }
         )
 
-        logger.info(
+        logger.debug(
             'Presigned url %s for %s part %s with expires %s created',
             url,
             key,
@@ -191,22 +191,24 @@ class MultipartUpload:
         Args:
             key: string
                 key on the S3 backend for which we want to abort the multipart upload
-            asset: Asset
-                Asset metadata model associated with the S3 backend key
+            asset: Asset | None
+                Asset metadata model associated with the S3 backend key, None for an orphan
+                upload without asset upload object
             upload_id: string
                 Upload ID
         '''
+        log_extra = {'upload_id': upload_id, 'key': key}
+        if asset is not None:
+            log_extra['asset'] = asset.name
         self.call_s3_api(
             self.s3.abort_multipart_upload,
             Bucket=settings.AWS_STORAGE_BUCKET_NAME,
             Key=key,
             UploadId=upload_id,
-            log_extra={
-                'upload_id': upload_id, 'asset': asset.name
-            }
+            log_extra=log_extra
         )
 
-    def list_upload_parts(self, key, asset, upload_id, limit, offset):
+    def list_upload_parts(self, key, asset, upload_id, limit, marker=None):
         '''List all actual part uploaded for a multipart upload
 
         Args:
@@ -218,30 +220,37 @@ class MultipartUpload:
                 Upload ID
             limit: int
                 Limit the number of result (for pagination)
-            offset: int
-                Start offset of the result list (for pagination)
-        Returns: dict
-            AWS S3 list parts answer
+            marker: int | None
+                Part number after which the parts are listed (for pagination)
+        Returns: (dict, int | None)
+            Returns a tuple (response, next_marker) with the AWS S3 list parts answer and the
+            part number marker of the next results, None if there is no more result
 
         Raises:
             ValueError: if AWS S3 return an HTTP Error code
             ClientError: any S3 client error
         '''
+        kwargs = {}
+        if marker is not None:
+            kwargs['PartNumberMarker'] = marker
         response = self.call_s3_api(
             self.s3.list_parts,
             Bucket=settings.AWS_STORAGE_BUCKET_NAME,
             Key=key,
             UploadId=upload_id,
             MaxParts=limit,
-            PartNumberMarker=offset,
             log_extra={
                 'collection': asset.item.collection.name,
                 'item': asset.item.name,
                 'asset': asset.name,
                 'upload_id': upload_id
-            }
+            },
+            **kwargs
         )
-        return response, response.get('IsTruncated', False)
+        next_marker = None
+        if response.get('IsTruncated', False):
+            next_marker = response.get('NextPartNumberMarker', None)
+        return response, next_marker
 
     def call_s3_api(self, func, *args, **kwargs):
         '''Wrap a S3 API call with logging and generic error handling
@@ -8,17 +8,23 @@ from dateutil.parser import isoparse
 from django.conf import settings
 from django.contrib.gis.geos import GEOSGeometry
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
 
+from stac_api.copy_importer import CopyImporter
 from stac_api.models import Asset
 from stac_api.models import Collection
 from stac_api.models import CollectionLink
 from stac_api.models import Item
 from stac_api.models import Provider
+from stac_api.utils import get_asset_path
+from stac_api.utils import get_sha256_multihash
 
 # path definition relative to the directory that contains manage.py
 DATADIR = settings.BASE_DIR / 'app/stac_api/management/sample_data/'
 logger = logging.getLogger(__name__)
 
+ASSET_DUMMY_CONTENT = b'Asset dummy content'
+
 
 def create_provider(collection, provider_data):
     logger.debug('Create provider %s', provider_data['name'])
@@ -51,7 +57,7 @@ def create_collection_link(collection, link_data):
     return link
 
 
-def import_collection(collection_dir):
+def import_collection(collection_dir, copy=False):
     """Import a whole collection folder
 
     The collection_dir has to be structured as follows
@@ -62,6 +68,9 @@ def import_collection(collection_dir):
             |- <item2_name>.json
        |- collection.json
     ```
+
+    When copy is set, the items and assets are imported through PostgreSQL COPY (see
+    import_items_with_copy()).
     """
 
     if not collection_dir.is_dir():
@@ -76,6 +85,10 @@ def import_collection(collection_dir):
         logger.error(error)
         raise
 
+    if copy:
+        import_items_with_copy(collection, collection_dir)
+        return collection
+
     # loop over all the items inside the current collection folder
     for item in glob.iglob(os.path.join(collection_dir, "items", "*.json")):
         logger.debug('Trying to import item: %s, in collection: %s', item, collection)
@@ -124,20 +137,32 @@ def get_property_datetime(item_data, key):
     return None
 
 
-def parse_item(item_data):
-    collection = Collection.objects.get(name=item_data["collection"])
+def get_item_values(item_data):
     geometry = GEOSGeometry(json.dumps(item_data["geometry"]))
     if not geometry.valid:
         raise ValueError(f'Invalid geometry in item {item_data["id"]}: {geometry.valid_reason}')
+    return {
+        'geometry': geometry,
+        'properties_datetime': get_property_datetime(item_data, 'datetime'),
+        'properties_start_datetime': get_property_datetime(item_data, 'start_datetime'),
+        'properties_end_datetime': get_property_datetime(item_data, 'end_datetime'),
+    }
+
+
+def get_asset_values(asset_data):
+    return {
+        "media_type": asset_data["type"],
+        "eo_gsd": asset_data.get("eo:gsd", None),
+        "proj_epsg": asset_data.get("proj:epsg", None),
+        "geoadmin_lang": asset_data.get("geoadmin:lang", None),
+        "geoadmin_variant": asset_data.get("geoadmin:variant", None),
+    }
+
+
+def parse_item(item_data):
+    collection = Collection.objects.get(name=item_data["collection"])
     item, created = Item.objects.get_or_create(
-        name=item_data["id"],
-        collection=collection,
-        defaults={
-            'geometry': geometry,
-            'properties_datetime': get_property_datetime(item_data, 'datetime'),
-            'properties_start_datetime': get_property_datetime(item_data, 'start_datetime'),
-            'properties_end_datetime': get_property_datetime(item_data, 'end_datetime'),
-        }
+        name=item_data["id"], collection=collection, defaults=get_item_values(item_data)
     )
 
     if 'title' in item_data['properties']:
@@ -151,16 +176,37 @@ def parse_item(item_data):
 
 
 def parse_asset(item, asset_name, asset_data):
-    asset, created = Asset.objects.get_or_create(
-        item=item,
-        name=asset_name,
-        defaults={
-            "file": SimpleUploadedFile(asset_name, b'Asset dummy content'),
-            "media_type": asset_data["type"],
-            "eo_gsd": asset_data.get("eo:gsd", None),
-            "proj_epsg": asset_data.get("proj:epsg", None),
-            "geoadmin_lang": asset_data.get("geoadmin:lang", None),
-            "geoadmin_variant": asset_data.get("geoadmin:variant", None),
-        }
-    )
+    defaults = get_asset_values(asset_data)
+    defaults["file"] = SimpleUploadedFile(asset_name, ASSET_DUMMY_CONTENT)
+    asset, created = Asset.objects.get_or_create(item=item, name=asset_name, defaults=defaults)
     return asset
+
+
+@transaction.atomic
+def import_items_with_copy(collection, collection_dir):
+    """Import the items and assets of a collection folder through PostgreSQL COPY
+
+    The items already in the collection are skipped and the asset files are not uploaded (see
+    stac_api.copy_importer.CopyImporter).
+    """
+    existing_items = set(collection.item_set.values_list('name', flat=True))
+    checksum_multihash = get_sha256_multihash(ASSET_DUMMY_CONTENT)
+    importer = CopyImporter(collection)
+    for item_path in glob.iglob(os.path.join(collection_dir, "items", "*.json")):
+        with open(item_path) as item_file:
+            item_data = json.load(item_file)
+        if item_data["id"] in existing_items:
+            logger.info('Ignore existing item %s', item_data["id"])
+            continue
+        item = importer.add_item(Item(name=item_data["id"], **get_item_values(item_data)))
+        for asset_name, asset_data in item_data["assets"].items():
+            importer.add(
+                Asset(
+                    item=item,
+                    name=asset_name,
+                    file=get_asset_path(item, asset_name),
+                    checksum_multihash=checksum_multihash,
+                    **get_asset_values(asset_data)
+                )
+            )
+    importer.finish()
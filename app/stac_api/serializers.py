@@ -1,9 +1,12 @@
+import json
 import logging
 from collections import OrderedDict
 from urllib.parse import urlparse
 
 from django.conf import settings
 from django.contrib.gis.geos import GEOSGeometry
+from django.db import IntegrityError
+from django.db import transaction
 
 from rest_framework import serializers
 from rest_framework.utils.serializer_helpers import ReturnDict
@@ -20,9 +23,11 @@ from stac_api.models import ItemLink
 from stac_api.models import LandingPage
 from stac_api.models import LandingPageLink
 from stac_api.models import Provider
+from stac_api.models import propagate_changes
 from stac_api.serializers_utils import DictSerializer
 from stac_api.serializers_utils import NonNullModelSerializer
 from stac_api.serializers_utils import UpsertModelSerializerMixin
+from stac_api.serializers_utils import bulk_update_or_create
 from stac_api.serializers_utils import get_relation_links
 from stac_api.serializers_utils import update_or_create_links
 from stac_api.utils import build_asset_href
@@ -40,6 +45,9 @@ from stac_api.validators_serializer import validate_uniqueness_and_create
 
 logger = logging.getLogger(__name__)
 
+# Number of rows inserted per INSERT statement by the bulk creations
+ITEMS_BULK_BATCH_SIZE = 1000
+
 
 class LandingPageLinkSerializer(serializers.ModelSerializer):
 
@@ -256,38 +264,18 @@ class CollectionSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
         return settings.STAC_VERSION
 
     def _update_or_create_providers(self, collection, providers_data):
-        provider_ids = []
-        for provider_data in providers_data:
-            provider, created = Provider.objects.get_or_create(
-                collection=collection,
-                name=provider_data["name"],
-                defaults={
-                    'description': provider_data.get('description', None),
-                    'roles': provider_data.get('roles', None),
-                    'url': provider_data.get('url', None)
-                }
-            )
-            logger.debug(
-                '%s provider %s',
-                'created' if created else 'updated',
-                provider.name,
-                extra={"provider": provider_data}
-            )
-            provider_ids.append(provider.id)
-            # the duplicate here is necessary to update the values in
-            # case the object already exists
-            provider.description = provider_data.get('description', provider.description)
-            provider.roles = provider_data.get('roles', provider.roles)
-            provider.url = provider_data.get('url', provider.url)
-            provider.full_clean()
-            provider.save()
-
-        # Delete providers that were not mentioned in the payload anymore
-        deleted = Provider.objects.filter(collection=collection).exclude(id__in=provider_ids
-                                                                        ).delete()
+        _created, _updated, deleted = bulk_update_or_create(
+            model=Provider,
+            parent_field='collection',
+            parent=collection,
+            key='name',
+            fields=['description', 'roles', 'url'],
+            rows_data=providers_data,
+            names=[collection.name]
+        )
         logger.info(
             "deleted %d stale providers for collection %s",
-            deleted[0],
+            deleted,
             collection.name,
             extra={"collection": collection.name}
         )
@@ -417,10 +405,31 @@ class BboxSerializer(gis_serializers.GeoFeatureModelSerializer):
         fields = ['geometry']
 
     def to_representation(self, instance):
+        # Use the bbox stored with the item when available (see Item.update_bbox())
+        bbox = instance.bbox
+        if bbox is not None:
+            return bbox
         python_native = super().to_representation(instance)
         return python_native['bbox']
 
 
+class ItemGeometryField(gis_serializers.GeometryField):
+    '''Item geometry field
+
+    Uses the GeoJSON rendered by the DB when available (see
+    stac_api.item_documents.annotate_items_for_documents()) instead of the GEOS geometry.
+    '''
+
+    # pylint: disable=abstract-method
+
+    def get_attribute(self, instance):
+        geojson = getattr(instance, 'geometry_geojson', None)
+        if geojson is not None:
+            # The GeometryField returns dictionaries as is
+            return json.loads(geojson, object_pairs_hook=OrderedDict)
+        return super().get_attribute(instance)
+
+
 class AssetsDictSerializer(DictSerializer):
     '''Assets serializer list to dictionary
 
@@ -443,6 +452,21 @@ class HrefField(serializers.Field):
         return build_asset_href(request, path)
 
 
+class AssetPathField(serializers.Field):
+    '''Asset file path field
+
+    Host independent version of the HrefField, used for the item document (see
+    stac_api.item_documents)
+    '''
+
+    # pylint: disable=abstract-method
+
+    def to_representation(self, value):
+        if not value.name:
+            return None
+        return value.name
+
+
 class AssetBaseSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
     '''Asset serializer base class
     '''
@@ -607,6 +631,75 @@ class AssetsForItemSerializer(AssetBaseSerializer):
         ]
 
 
+class ItemListSerializer(serializers.ListSerializer):
+    '''Item list serializer used to create items in bulk
+
+    The items and their links are inserted with one bulk insert per table and the collection
+    extent and ETag are updated once for the whole batch instead of once per item.
+    '''
+
+    # pylint: disable=abstract-method
+
+    def validate(self, attrs):
+        names = [item['name'] for item in attrs]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise serializers.ValidationError(
+                code='unique', detail={'id': [f'Duplicate item ids in payload: {duplicates}']}
+            )
+        return attrs
+
+    def create(self, validated_data):
+        collection = validated_data[0]['collection']
+        names = [item_data['name'] for item_data in validated_data]
+        existing = Item.objects.filter(collection=collection, name__in=names)
+        existing = sorted(existing.values_list('name', flat=True))
+        if existing:
+            raise serializers.ValidationError(
+                code='unique', detail={'id': [f'Items already exist: {existing}']}
+            )
+
+        items = []
+        links = []
+        for item_data in validated_data:
+            links_data = item_data.pop('links', [])
+            item = Item(**item_data)
+            item.update_etag()
+            item.update_bbox()
+            items.append(item)
+            links.extend(ItemLink(item=item, **link_data) for link_data in links_data)
+
+        try:
+            with transaction.atomic():
+                # Lock the collection to serialize its extent update with concurrent writers
+                collection = Collection.objects.select_for_update().get(pk=collection.pk)
+                Item.objects.bulk_create(items, batch_size=ITEMS_BULK_BATCH_SIZE)
+                for link in links:
+                    # set the primary key of the items created above
+                    link.item_id = link.item.pk
+                ItemLink.objects.bulk_create(links, batch_size=ITEMS_BULK_BATCH_SIZE)
+                if settings.COLLECTION_UPDATES_DEFERRED:
+                    collection.request_update()
+                    propagate_changes(collection, collection.name)
+                elif settings.COLLECTION_EXTENT_ATOMIC_MERGE:
+                    collection.merge_extent(items)
+                else:
+                    collection.update_temporal_extent_on_items_insert(items)
+                    collection.update_bbox_extent_on_items_insert(items)
+                    collection.save()
+        except IntegrityError as error:
+            # an item with the same id has been created concurrently
+            logger.error(
+                'Failed to create items in bulk: %s', error, extra={'collection': collection.name}
+            )
+            raise serializers.ValidationError(
+                code='unique', detail={'id': ['Items already exist']}
+            ) from None
+
+        logger.info('Created %d items in bulk', len(items), extra={'collection': collection.name})
+        return items
+
+
 class ItemSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
 
     class Meta:
@@ -623,6 +716,7 @@ class ItemSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
             'links',
             'assets'
         ]
+        list_serializer_class = ItemListSerializer
         validators = []  # Remove a default "unique together" constraint.
         # (see:
         # https://www.django-rest-framework.org/api-guide/validators/#limitations-of-validators)
@@ -633,7 +727,7 @@ class ItemSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
         source='name', required=True, max_length=255, validators=[validate_name]
     )
     properties = ItemsPropertiesSerializer(source='*', required=True)
-    geometry = gis_serializers.GeometryField(required=True)
+    geometry = ItemGeometryField(required=True)
     links = ItemLinkSerializer(required=False, many=True)
     # read only fields
     type = serializers.SerializerMethodField()
@@ -706,6 +800,13 @@ class ItemSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
         )
         return item, created
 
+    def run_validation(self, data=serializers.empty):
+        if isinstance(self.parent, serializers.ListSerializer):
+            # The child of a list serializer validates each item of the list, the payload
+            # validation needs the item data (see validate_json_payload())
+            self.initial_data = data
+        return super().run_validation(data)
+
     def validate(self, attrs):
         if (
             not self.partial or \
@@ -728,6 +829,30 @@ class ItemSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
         return attrs
 
 
+class AssetsForItemDocumentSerializer(AssetsForItemSerializer):
+    '''Assets serializer for nesting them inside the item document
+
+    Same as AssetsForItemSerializer but the href is replaced by the asset file path.
+    '''
+    href = AssetPathField(source='file', read_only=True)
+
+
+class ItemDocumentSerializer(ItemSerializer):
+    '''Item serializer for the item document
+
+    This serializer returns the host independent part of the item serialization; no auto
+    generated links and assets with their file path instead of href. This representation is
+    stored along with the item ETag and completed on each request by
+    stac_api.item_documents.render_item_document()
+    '''
+    # pylint: disable=abstract-method
+    assets = AssetsForItemDocumentSerializer(many=True, read_only=True)
+
+    def to_representation(self, instance):
+        # skip ItemSerializer.to_representation() which adds the request dependent links
+        return super(ItemSerializer, self).to_representation(instance)
+
+
 class AssetUploadListSerializer(serializers.ListSerializer):
     # pylint: disable=abstract-method
 
@@ -746,7 +871,7 @@ class UploadPartSerializer(serializers.Serializer):
     # pylint: disable=abstract-method
     etag = serializers.CharField(source='ETag', allow_blank=False, required=True)
     part_number = serializers.IntegerField(
-        source='PartNumber', min_value=1, max_value=100, required=True, allow_null=False
+        source='PartNumber', min_value=1, max_value=10000, required=True, allow_null=False
     )
     modified = serializers.DateTimeField(source='LastModified', required=False, allow_null=True)
     size = serializers.IntegerField(source='Size', allow_null=True, required=False)
@@ -764,6 +889,8 @@ class AssetUploadSerializer(NonNullModelSerializer):
             'checksum_multihash',
             'completed',
             'aborted',
+            'failed',
+            'failure_reason',
             'number_parts',
             'urls',
             'ended',
@@ -790,6 +917,8 @@ class AssetUploadSerializer(NonNullModelSerializer):
     urls = serializers.JSONField(read_only=True)
     completed = serializers.SerializerMethodField()
     aborted = serializers.SerializerMethodField()
+    failed = serializers.SerializerMethodField()
+    failure_reason = serializers.CharField(read_only=True)
 
     def get_completed(self, obj):
         if obj.status == AssetUpload.Status.COMPLETED:
@@ -801,6 +930,11 @@ class AssetUploadSerializer(NonNullModelSerializer):
             return isoformat(obj.ended)
         return None
 
+    def get_failed(self, obj):
+        if obj.status == AssetUpload.Status.FAILED:
+            return isoformat(obj.ended)
+        return None
+
     def get_fields(self):
         fields = super().get_fields()
         # This is a hack to allow fields with special characters
@@ -808,6 +942,16 @@ class AssetUploadSerializer(NonNullModelSerializer):
         return fields
 
 
+class AssetUploadPartUrlSerializer(serializers.Serializer):
+    '''Upload part presigned url serializer'''
+
+    # pylint: disable=abstract-method
+
+    url = serializers.CharField(read_only=True)
+    part = serializers.IntegerField(read_only=True)
+    expires = serializers.DateTimeField(read_only=True)
+
+
 class AssetUploadPartsSerializer(serializers.Serializer):
     '''S3 list_parts response serializer'''
 
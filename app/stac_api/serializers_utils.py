@@ -6,9 +6,78 @@ from django.urls import reverse
 from rest_framework import serializers
 from rest_framework.utils.serializer_helpers import ReturnDict
 
+from stac_api.models import propagate_changes
+
 logger = logging.getLogger(__name__)
 
 
+def bulk_update_or_create(model, parent_field, parent, key, fields, rows_data, names):
+    '''Update or create the children rows of a parent from a payload and delete the others
+
+    The existing rows are loaded once and compared with the payload, then the new rows are
+    inserted with a single bulk create, the changed rows updated with a single bulk update and
+    the stale rows deleted with a single DELETE. Finally the change is propagated once to the
+    parent.
+
+    Args:
+        model: model class of the children (e.g. CollectionLink)
+        parent_field: (str) name of the children foreign key to the parent (e.g. 'collection')
+        parent: parent model instance
+        key: (str) name of the field identifying a child within its parent (e.g. 'rel')
+        fields: list of the other fields to update
+        rows_data: list of children dictionary to add/update
+        names: parent URL kwargs (see stac_api.models.propagate_changes())
+
+    Returns:
+        tuple: number of created, updated and deleted rows
+    '''
+    # Merge duplicate keys, the last value wins
+    payload = OrderedDict()
+    for row_data in rows_data:
+        payload.setdefault(row_data[key], {}).update(row_data)
+
+    existing = {getattr(row, key): row for row in model.objects.filter(**{parent_field: parent})}
+    to_create = []
+    to_update = []
+    for key_value, row_data in payload.items():
+        row = existing.pop(key_value, None)
+        if row is None:
+            attributes = {field: row_data.get(field, None) for field in fields}
+            attributes.update({parent_field: parent, key: key_value})
+            row = model(**attributes)
+            to_create.append(row)
+        else:
+            changed = False
+            for field in fields:
+                value = row_data.get(field, getattr(row, field))
+                if value != getattr(row, field):
+                    setattr(row, field, value)
+                    changed = True
+            if not changed:
+                continue
+            to_update.append(row)
+        # the parent exists and the uniqueness is given by the payload merge above
+        row.full_clean(exclude=[parent_field], validate_unique=False)
+
+    model.objects.bulk_create(to_create)
+    model.objects.bulk_update(to_update, fields)
+    deleted = 0
+    if existing:
+        deleted = model.objects.filter(id__in=[row.id for row in existing.values()]).delete()[0]
+
+    logger.debug(
+        '%s: %d created, %d updated, %d deleted',
+        model.__name__,
+        len(to_create),
+        len(to_update),
+        deleted,
+        extra={parent_field: parent.name}
+    )
+    if to_create or to_update or deleted:
+        propagate_changes(parent, *names)
+    return len(to_create), len(to_update), deleted
+
+
 def update_or_create_links(model, instance, instance_type, links_data):
     '''Update or create links for a model
 
@@ -19,39 +88,16 @@ def update_or_create_links(model, instance, instance_type, links_data):
         instance_type: (str) instance type name string to use for filtering ('collection' or 'item')
         links_data: list of links dictionary to add/update
     '''
-    links_ids = []
-    for link_data in links_data:
-        link, created = model.objects.get_or_create(
-            **{instance_type: instance},
-            rel=link_data["rel"],
-            defaults={
-                'href': link_data.get('href', None),
-                'link_type': link_data.get('link_type', None),
-                'title': link_data.get('title', None)
-            }
-        )
-        logger.debug(
-            '%s link %s',
-            'created' if created else 'updated',
-            link.href,
-            extra={
-                instance_type: instance.name, "link": link_data
-            }
-        )
-        links_ids.append(link.id)
-        # the duplicate here is necessary to update the values in
-        # case the object already exists
-        link.link_type = link_data.get('link_type', link.link_type)
-        link.title = link_data.get('title', link.title)
-        link.href = link_data.get('href', link.rel)
-        link.full_clean()
-        link.save()
-
-    # Delete link that were not mentioned in the payload anymore
-    deleted = model.objects.filter(**{instance_type: instance},).exclude(id__in=links_ids).delete()
+    if instance_type == 'item':
+        names = [instance.collection.name, instance.name]
+    else:
+        names = [instance.name]
+    _created, _updated, deleted = bulk_update_or_create(
+        model, instance_type, instance, 'rel', ['href', 'link_type', 'title'], links_data, names
+    )
     logger.info(
         "deleted %d stale links for %s %s",
-        deleted[0],
+        deleted,
         instance_type,
         instance.name,
         extra={instance_type: instance}
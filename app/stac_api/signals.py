@@ -12,7 +12,7 @@ logger = logging.getLogger(__name__)
 
 @receiver(pre_delete, sender=AssetUpload)
 def check_on_going_upload(sender, instance, **kwargs):
-    if instance.status == AssetUpload.Status.IN_PROGRESS:
+    if instance.status in [AssetUpload.Status.IN_PROGRESS, AssetUpload.Status.COMPLETING]:
         logger.error(
             "Cannot delete asset %s due to upload %s which is still in progress",
             instance.asset.name,
@@ -1,15 +1,67 @@
+import hashlib
+import io
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from time import mktime
 from wsgiref.handlers import format_date_time
 
 from django.conf import settings
+from django.core.files import File
 
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 
 logger = logging.getLogger(__name__)
 
 
+class HashingFile(File):
+    '''File wrapper computing the sha256 digest of the content while it is read
+
+    Each chunk read is hashed in a worker thread while the next one is read and sent, hashlib
+    releasing the GIL during the digest computation. The wrapper is not seekable, so that the
+    content is read only once and sequentially; only a rewind to the start is allowed, which
+    restarts the digest.
+    '''
+
+    def __init__(self, file, name=None):
+        super().__init__(file, name)
+        self.content_type = getattr(file, 'content_type', None)
+        self._sha256 = hashlib.sha256()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = None
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        if data:
+            # wait for the previous chunk to bound the memory usage
+            if self._pending is not None:
+                self._pending.result()
+            self._pending = self._executor.submit(self._sha256.update, data)
+        return data
+
+    def seekable(self):
+        return False
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('HashingFile can only be rewound to the start')
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+        self._sha256 = hashlib.sha256()
+        return self.file.seek(offset, whence)
+
+    def hexdigest(self):
+        '''Returns the sha256 hex digest of the content read so far'''
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+        self._executor.shutdown()
+        return self._sha256.hexdigest()
+
+
 class S3Storage(S3Boto3Storage):
     # pylint: disable=abstract-method
     # pylint: disable=no-member
@@ -30,7 +82,9 @@ class S3Storage(S3Boto3Storage):
 
         if 'Metadata' not in params:
             params['Metadata'] = {}
-        params['Metadata']['sha256'] = getattr(self, '_tmp_sha256', None)
+        sha256 = getattr(self, '_tmp_sha256', None)
+        if sha256 is not None:
+            params['Metadata']['sha256'] = sha256
 
         if 'CacheControl' in params:
             logger.warning(
@@ -42,3 +96,63 @@ class S3Storage(S3Boto3Storage):
         params['Expires'] = format_date_time(stamp + settings.STORAGE_ASSETS_CACHE_SECONDS)
 
         return params
+
+    def _get_write_parameters(self, name, content=None):
+        params = super()._get_write_parameters(name, content)
+        if isinstance(content, HashingFile):
+            # The sha256 is only known once uploaded, it is not taken from the storage instance,
+            # which is shared by the concurrent uploads (see save_with_sha256())
+            params.get('Metadata', {}).pop('sha256', None)
+        return params
+
+    def save_with_sha256(self, name, content, max_length=None):
+        """
+        Save the content while computing its sha256 checksum in a single read.
+
+        The sha256 is only known once the content has been uploaded, it is therefore set as
+        MetaData afterward with a copy in place of the object (see set_sha256_metadata()).
+
+        Args:
+            name: string
+                file name
+            content: File
+                file content
+            max_length: int
+                maximum length of the file name
+
+        Returns:
+            Tuple (name, sha256) with the saved file name and the content sha256 hex digest
+        """
+        start = time.time()
+        content.seek(0)
+        hashing_content = HashingFile(content, name=getattr(content, 'name', name))
+        try:
+            name = self.save(name, hashing_content, max_length=max_length)
+        finally:
+            sha256 = hashing_content.hexdigest()
+        logger.debug('File %s uploaded and hashed in %.3fs', name, time.time() - start)
+        self.set_sha256_metadata(name, sha256)
+        return name, sha256
+
+    def set_sha256_metadata(self, name, sha256):
+        """
+        Set the sha256 checksum MetaData of an uploaded file
+
+        The object metadata cannot be updated, the object is therefore copied in place with the
+        new metadata (the copy being done by S3 with a multipart copy for large objects).
+
+        Args:
+            name: string
+                file name
+            sha256: string
+                file sha256 hex digest
+        """
+        start = time.time()
+        key = self._normalize_name(clean_name(name))
+        obj = self.bucket.Object(key)
+        params = self.get_object_parameters(name)
+        params['Metadata']['sha256'] = sha256
+        params['ContentType'] = obj.content_type
+        params['MetadataDirective'] = 'REPLACE'
+        obj.copy({'Bucket': self.bucket_name, 'Key': key}, ExtraArgs=params)
+        logger.debug('File %s sha256 metadata set in %.3fs', name, time.time() - start)
@@ -0,0 +1,64 @@
+import logging
+
+from django.http import StreamingHttpResponse
+
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureCollectionStreamingResponse(StreamingHttpResponse):
+    '''Streaming response for a FeatureCollection
+
+    The FeatureCollection envelope is sent first, then its features one by one as they are
+    rendered and finally the remaining members (e.g. the links, including the pagination links).
+    The members are rendered with the same JSON renderer as the non streaming response so the
+    output is identical.
+    '''
+
+    def __init__(self, data, status=None, headers=None):
+        '''
+        Args:
+            data: dict
+                FeatureCollection data where 'features' is an iterable of features
+            status: int
+                HTTP status code
+            headers: dict
+                Additional HTTP headers
+        '''
+        self.data = data
+        self.renderer = JSONRenderer()
+        super().__init__(
+            streaming_content=self.render(), content_type=self.renderer.media_type, status=status
+        )
+        for key, value in (headers or {}).items():
+            self[key] = value
+
+    def render_value(self, value):
+        # NOTE: the JSONRenderer renders None as an empty content and not as null
+        if value is None:
+            return b'null'
+        return self.renderer.render(value)
+
+    def render(self):
+        yield b'{'
+        for i, (key, value) in enumerate(self.data.items()):
+            if i:
+                yield b','
+            yield self.render_value(key) + b':'
+            if key == 'features':
+                yield from self.render_features(value)
+            else:
+                yield self.render_value(value)
+        yield b'}'
+
+    def render_features(self, features):
+        count = 0
+        yield b'['
+        for feature in features:
+            if count:
+                yield b','
+            yield self.render_value(feature)
+            count += 1
+        yield b']'
+        logger.debug('%d features streamed', count)
@@ -0,0 +1,237 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timedelta
+
+from botocore.exceptions import ClientError
+from botocore.exceptions import ParamValidationError
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db import connection
+from django.db import transaction
+
+from rest_framework.exceptions import ValidationError
+
+from stac_api.models import AssetUpload
+from stac_api.models import propagate_changes_once
+from stac_api.s3_multipart_upload import MultipartUpload
+from stac_api.utils import get_asset_path
+from stac_api.utils import utc_aware
+
+logger = logging.getLogger(__name__)
+
+# Number of asset uploads completed in parallel by the process
+COMPLETION_WORKERS = 2
+
+_executor_lock = threading.Lock()
+_executor = None
+
+
+def complete_asset_upload(executor, asset_upload, parts):
+    '''Complete the multipart upload on S3 and update the asset upload and its asset
+
+    Args:
+        executor: MultipartUpload
+            S3 multipart upload executor
+        asset_upload: AssetUpload
+            Asset upload to complete
+        parts: [{'ETag': string, 'PartNumber': int}]
+            List of Etag and part number to use for the completion
+
+    Raises:
+        ValidationError: when the parts are not valid
+    '''
+    asset = asset_upload.asset
+    key = get_asset_path(asset.item, asset.name)
+    executor.complete_multipart_upload(key, asset, parts, asset_upload.upload_id)
+    finish_asset_upload(asset_upload)
+
+
+def finish_asset_upload(asset_upload):
+    '''Update the asset upload and its asset once the multipart upload is completed on S3
+
+    Args:
+        asset_upload: AssetUpload
+            Asset upload completed
+    '''
+    asset_upload.update_asset_checksum_multihash()
+    asset_upload.status = asset_upload.Status.COMPLETED
+    asset_upload.ended = utc_aware(datetime.utcnow())
+    asset_upload.urls = []
+    asset_upload.save()
+
+
+def complete_asset_upload_async(asset_upload, parts):
+    '''Complete the asset upload asynchronously in a worker thread of the process
+
+    The asset upload status is set to completing and its completion is started once the current
+    transaction is committed (see process_upload_completion()).
+
+    Args:
+        asset_upload: AssetUpload
+            Asset upload to complete
+        parts: [{'ETag': string, 'PartNumber': int}]
+            List of Etag and part number to use for the completion
+    '''
+    asset_upload.status = asset_upload.Status.COMPLETING
+    asset_upload.completion_started = utc_aware(datetime.utcnow())
+    asset_upload.save()
+    pk = asset_upload.pk
+    parts = [dict(part) for part in parts]
+    transaction.on_commit(lambda: _get_executor().submit(_run_upload_completion, pk, parts))
+
+
+def reset_stale_completion(asset_upload):
+    '''Set an asset upload back to in-progress when its asynchronous completion is lost
+
+    The completion is lost when the process running it has been stopped (e.g. killed or
+    restarted), the upload then stays in completing status. After
+    settings.UPLOAD_COMPLETION_TIMEOUT_SECONDS, it is set back to in-progress so that it can be
+    completed or aborted again. The asset upload should be locked (select_for_update).
+
+    Args:
+        asset_upload: AssetUpload
+            Asset upload to check
+
+    Returns:
+        bool: True if the upload has been reset, false otherwise
+    '''
+    if asset_upload.status != asset_upload.Status.COMPLETING:
+        return False
+    timeout = timedelta(seconds=settings.UPLOAD_COMPLETION_TIMEOUT_SECONDS)
+    if (
+        asset_upload.completion_started is not None and
+        asset_upload.completion_started > utc_aware(datetime.utcnow()) - timeout
+    ):
+        return False
+    logger.warning(
+        'Asset upload completion started at %s is lost, set it back to in progress',
+        asset_upload.completion_started,
+        extra={'upload_id': asset_upload.upload_id}
+    )
+    asset_upload.status = asset_upload.Status.IN_PROGRESS
+    asset_upload.completion_started = None
+    asset_upload.save()
+    return True
+
+
+def process_upload_completion(pk, parts):
+    '''Complete an asset upload in completing status
+
+    The completing status has been committed by the request (see complete_asset_upload_async()),
+    it prevents any other completion or abort of the upload, therefore the S3 completion is done
+    without holding any DB lock or transaction. The asset upload and its asset are then updated
+    in a new transaction.
+
+    When the completion fails, the upload status is set to failed with the failure reason so that
+    the client following the completion is informed, the client must then start a new upload.
+
+    Args:
+        pk: int
+            Asset upload primary key
+        parts: [{'ETag': string, 'PartNumber': int}]
+            List of Etag and part number to use for the completion
+
+    Returns:
+        bool: True if the upload has been completed, false otherwise
+    '''
+    log_extra = {'upload_pk': pk}
+    asset_upload = AssetUpload.objects.filter(pk=pk).first()
+    if not _is_completing(asset_upload, log_extra):
+        return False
+    log_extra['upload_id'] = asset_upload.upload_id
+    executor = MultipartUpload()
+    asset = asset_upload.asset
+    key = get_asset_path(asset.item, asset.name)
+
+    try:
+        executor.complete_multipart_upload(key, asset, parts, asset_upload.upload_id)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.error('Failed to complete the S3 multipart upload: %s', error, extra=log_extra)
+        fail_upload_completion(pk, get_failure_reason(error), log_extra)
+        try:
+            # The upload cannot be completed anymore, don't keep its parts on S3
+            executor.abort_multipart_upload(key, asset, asset_upload.upload_id)
+        except (ClientError, ParamValidationError, ValueError) as abort_error:
+            logger.error(
+                'Failed to abort the S3 multipart upload: %s', abort_error, extra=log_extra
+            )
+        return False
+
+    try:
+        with transaction.atomic(), propagate_changes_once():
+            asset_upload = AssetUpload.objects.select_for_update(of=('self',)).get(pk=pk)
+            if not _is_completing(asset_upload, log_extra):
+                return False
+            finish_asset_upload(asset_upload)
+    except Exception as error:  # pylint: disable=broad-except
+        # The upload is completed on S3 and can therefore not be completed again
+        logger.error('Failed to update the completed asset upload: %s', error, extra=log_extra)
+        fail_upload_completion(pk, get_failure_reason(error), log_extra)
+        return False
+    logger.info('Asset upload completed', extra=log_extra)
+    return True
+
+
+def _is_completing(asset_upload, log_extra):
+    if asset_upload is None or asset_upload.status != asset_upload.Status.COMPLETING:
+        logger.warning(
+            'Asset upload not completed, its status is %s',
+            asset_upload.status if asset_upload is not None else None,
+            extra=log_extra
+        )
+        return False
+    return True
+
+
+def get_failure_reason(error):
+    '''Returns the failure reason of the asset upload completion from its exception'''
+    if isinstance(error, ValidationError) and isinstance(error.detail, list):
+        return ' '.join(str(detail) for detail in error.detail)
+    return str(error) or type(error).__name__
+
+
+def fail_upload_completion(pk, reason, log_extra):
+    '''Set an asset upload in completing status to failed
+
+    Args:
+        pk: int
+            Asset upload primary key
+        reason: string
+            Failure reason shown to the client
+        log_extra: dict
+            Logging extra
+    '''
+    try:
+        with transaction.atomic():
+            asset_upload = AssetUpload.objects.select_for_update(of=('self',)).filter(pk=pk).first()
+            if asset_upload is None or asset_upload.status != asset_upload.Status.COMPLETING:
+                return
+            asset_upload.status = asset_upload.Status.FAILED
+            asset_upload.failure_reason = reason
+            asset_upload.ended = utc_aware(datetime.utcnow())
+            asset_upload.urls = []
+            asset_upload.save()
+    except DatabaseError as error:
+        # The upload stays in completing status until reset_stale_completion()
+        logger.error('Failed to set the asset upload as failed: %s', error, extra=log_extra)
+
+
+def _run_upload_completion(pk, parts):
+    try:
+        process_upload_completion(pk, parts)
+    finally:
+        # The worker thread connections are not closed by the request cycle
+        connection.close()
+
+
+def _get_executor():
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=COMPLETION_WORKERS, thread_name_prefix='upload-completion'
+            )
+        return _executor
@@ -10,11 +10,13 @@ from stac_api.views import AssetUploadAbort
 from stac_api.views import AssetUploadComplete
 from stac_api.views import AssetUploadDetail
 from stac_api.views import AssetUploadPartsList
+from stac_api.views import AssetUploadPartUrl
 from stac_api.views import AssetUploadsList
 from stac_api.views import CollectionDetail
 from stac_api.views import CollectionList
 from stac_api.views import ConformancePageDetail
 from stac_api.views import ItemDetail
+from stac_api.views import ItemsBulk
 from stac_api.views import ItemsList
 from stac_api.views import LandingPageDetail
 from stac_api.views import SearchList
@@ -25,6 +27,11 @@ HEALTHCHECK_ENDPOINT = settings.HEALTHCHECK_ENDPOINT
 asset_upload_urls = [
     path("<upload_id>", AssetUploadDetail.as_view(), name='asset-upload-detail'),
     path("<upload_id>/parts", AssetUploadPartsList.as_view(), name='asset-upload-parts-list'),
+    path(
+        "<upload_id>/parts/<int:part_number>/url",
+        AssetUploadPartUrl.as_view(),
+        name='asset-upload-part-url'
+    ),
     path("<upload_id>/complete", AssetUploadComplete.as_view(), name='asset-upload-complete'),
     path("<upload_id>/abort", AssetUploadAbort.as_view(), name='asset-upload-abort')
 ]
@@ -44,6 +51,7 @@ item_urls = [
 collection_urls = [
     path("<collection_name>", CollectionDetail.as_view(), name='collection-detail'),
     path("<collection_name>/items", ItemsList.as_view(), name='items-list'),
+    path("<collection_name>/items:bulk", ItemsBulk.as_view(), name='items-bulk'),
     path("<collection_name>/items/", include(item_urls))
 ]
 
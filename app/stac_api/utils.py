@@ -1,6 +1,7 @@
 import hashlib
 import json
 import logging
+import threading
 from datetime import datetime
 from datetime import timezone
 from decimal import Decimal
@@ -17,6 +18,10 @@ from django.urls import reverse
 
 logger = logging.getLogger(__name__)
 
+_s3_lock = threading.Lock()
+_s3_client = None
+_s3_resource_class = None
+
 
 def isoformat(date_time):
     '''Return a datetime string in isoformat using 'Z' as timezone instead of '+00:00'
@@ -97,32 +102,61 @@ def get_asset_path(item, asset_name):
     return '/'.join([item.collection.name, item.name, asset_name])
 
 
+def _get_s3_session_args():
+    return {
+        'service_name': 's3',
+        'endpoint_url': settings.AWS_S3_ENDPOINT_URL,
+        'config':
+            Config(
+                signature_version='s3v4', max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS
+            )
+    }
+
+
 def get_s3_resource():
     '''Returns an AWS S3 resource
 
     The authentication with the S3 server is configured via the AWS_ACCESS_KEY_ID and
     AWS_SECRET_ACCESS_KEY environment variables.
 
+    The resources are not thread safe, therefore a new resource is returned on each call, but all
+    resources share the client of the process (see get_s3_client()).
+
     Returns:
         AWS S3 resource
     '''
-    return boto3.resource(
-        's3', endpoint_url=settings.AWS_S3_ENDPOINT_URL, config=Config(signature_version='s3v4')
-    )
+    global _s3_resource_class  # pylint: disable=global-statement
+    if _s3_resource_class is None:
+        with _s3_lock:
+            if _s3_resource_class is None:
+                _s3_resource_class = type(
+                    boto3.session.Session().resource(**_get_s3_session_args())
+                )
+    return _s3_resource_class(client=get_s3_client())
 
 
 def get_s3_client():
-    '''Returns an AWS S3 client
+    '''Returns the AWS S3 client of the process
 
     The authentication with the S3 server is configured via the AWS_ACCESS_KEY_ID and
     AWS_SECRET_ACCESS_KEY environment variables.
 
+    The client is created once per process and is thread safe (greenlet safe with gevent), its
+    connections being kept alive in a pool of at most settings.AWS_S3_MAX_POOL_CONNECTIONS
+    connections. This avoids the endpoint resolution, credentials lookup and new HTTPS connection
+    of a new client on each S3 call.
+
     Returns:
         AWS S3 client
     '''
-    return boto3.client(
-        's3', endpoint_url=settings.AWS_S3_ENDPOINT_URL, config=Config(signature_version='s3v4')
-    )
+    global _s3_client  # pylint: disable=global-statement
+    if _s3_client is None:
+        with _s3_lock:
+            if _s3_client is None:
+                logger.debug('Creating the S3 client')
+                # boto3.client() uses the default session, which is not thread safe
+                _s3_client = boto3.session.Session().client(**_get_s3_session_args())
+    return _s3_client
 
 
 def build_asset_href(request, path):
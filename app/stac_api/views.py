@@ -2,38 +2,55 @@ import json
 import logging
 from collections import OrderedDict
 from datetime import datetime
+from uuid import NAMESPACE_URL
+from uuid import uuid5
 
 from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
 from django.db import IntegrityError
 from django.db import transaction
 from django.db.models import Prefetch
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import generics
 from rest_framework import mixins
+from rest_framework import status
+from rest_framework.exceptions import NotFound
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework_condition import etag
 
 from stac_api import views_mixins
+from stac_api.etag_cache import get_cached_etag
+from stac_api.item_documents import annotate_items_for_documents
+from stac_api.item_documents import iter_item_documents
 from stac_api.models import Asset
 from stac_api.models import AssetUpload
 from stac_api.models import Collection
 from stac_api.models import ConformancePage
 from stac_api.models import Item
 from stac_api.models import LandingPage
-from stac_api.pagination import ExtApiPagination
+from stac_api.pagination import ExtApiCursorPagination
 from stac_api.pagination import GetPostCursorPagination
+from stac_api.parsers import NDJSONParser
 from stac_api.s3_multipart_upload import MultipartUpload
 from stac_api.serializers import AssetSerializer
 from stac_api.serializers import AssetUploadPartsSerializer
+from stac_api.serializers import AssetUploadPartUrlSerializer
 from stac_api.serializers import AssetUploadSerializer
 from stac_api.serializers import CollectionSerializer
 from stac_api.serializers import ConformancePageSerializer
 from stac_api.serializers import ItemSerializer
 from stac_api.serializers import LandingPageSerializer
+from stac_api.streaming import FeatureCollectionStreamingResponse
+from stac_api.upload_completion import complete_asset_upload
+from stac_api.upload_completion import complete_asset_upload_async
+from stac_api.upload_completion import reset_stale_completion
 from stac_api.utils import get_asset_path
 from stac_api.utils import harmonize_post_get_for_search
 from stac_api.utils import utc_aware
@@ -46,18 +63,16 @@ from stac_api.validators_view import validate_renaming
 logger = logging.getLogger(__name__)
 
 
-def get_etag(queryset):
-    if queryset.exists():
-        return list(queryset.only('etag').values('etag').first().values())[0]
-    return None
-
-
 def get_collection_etag(request, *args, **kwargs):
     '''Get the ETag for a collection object
 
     The ETag is an UUID4 computed on each object changes (including relations; provider and links)
     '''
-    tag = get_etag(Collection.objects.filter(name=kwargs['collection_name']))
+    tag = get_cached_etag(
+        request,
+        Collection.objects.filter(name=kwargs['collection_name']),
+        kwargs['collection_name']
+    )
 
     if settings.DEBUG_ENABLE_DB_EXPLAIN_ANALYZE:
         logger.debug(
@@ -78,8 +93,11 @@ def get_item_etag(request, *args, **kwargs):
 
     The ETag is an UUID4 computed on each object changes (including relations; assets and links)
     '''
-    tag = get_etag(
-        Item.objects.filter(collection__name=kwargs['collection_name'], name=kwargs['item_name'])
+    tag = get_cached_etag(
+        request,
+        Item.objects.filter(collection__name=kwargs['collection_name'], name=kwargs['item_name']),
+        kwargs['collection_name'],
+        kwargs['item_name']
     )
 
     if settings.DEBUG_ENABLE_DB_EXPLAIN_ANALYZE:
@@ -104,12 +122,16 @@ def get_asset_etag(request, *args, **kwargs):
 
     The ETag is an UUID4 computed on each object changes
     '''
-    tag = get_etag(
+    tag = get_cached_etag(
+        request,
         Asset.objects.filter(
             item__collection__name=kwargs['collection_name'],
             item__name=kwargs['item_name'],
             name=kwargs['asset_name']
-        )
+        ),
+        kwargs['collection_name'],
+        kwargs['item_name'],
+        kwargs['asset_name']
     )
 
     if settings.DEBUG_ENABLE_DB_EXPLAIN_ANALYZE:
@@ -131,16 +153,88 @@ def get_asset_upload_etag(request, *args, **kwargs):
 
     The ETag is an UUID4 computed on each object changes
     '''
-    return get_etag(
+    return get_cached_etag(
+        request,
         AssetUpload.objects.filter(
             asset__item__collection__name=kwargs['collection_name'],
             asset__item__name=kwargs['item_name'],
             asset__name=kwargs['asset_name'],
             upload_id=kwargs['upload_id']
-        )
+        ),
+        kwargs['collection_name'],
+        kwargs['item_name'],
+        kwargs['asset_name'],
+        kwargs['upload_id']
     )
 
 
+def get_list_etag(request, *tags):
+    '''Compute the ETag of a list endpoint
+
+    The list ETag is derived from the ETag(s) of the object(s) that change whenever the list
+    content changes, the request URL (the content depends on the query and pagination) and the
+    application version (the content depends on the serialization).
+
+    Args:
+        request: HttpRequest
+            Request
+        *tags: string
+            ETags of the list
+
+    Returns: string | None
+        ETag or None for unsafe methods or when an ETag is missing (e.g. the parent object
+        doesn't exist)
+    '''
+    if request.method not in SAFE_METHODS or None in tags:
+        return None
+    return str(
+        uuid5(NAMESPACE_URL, '|'.join([settings.APP_VERSION, request.build_absolute_uri(), *tags]))
+    )
+
+
+def get_collections_etag():
+    '''Returns the aggregated ETag of all collections
+
+    This aggregated ETag changes on each collections changes, including on their items and
+    assets changes which always update their collection ETag.
+    '''
+    etags = Collection.objects.aggregate(etags=StringAgg('etag', delimiter=',', ordering='id'))
+    return etags['etags'] or ''
+
+
+def get_collection_list_etag(request, *args, **kwargs):
+    '''Get the ETag for the collections list
+
+    The ETag is computed from all collections ETag
+    '''
+    return get_list_etag(request, get_collections_etag())
+
+
+def get_items_list_etag(request, *args, **kwargs):
+    '''Get the ETag for the items list of a collection
+
+    The ETag is computed from the collection ETag which is updated on each of its items changes
+    '''
+    return get_list_etag(request, get_collection_etag(request, *args, **kwargs))
+
+
+def get_assets_list_etag(request, *args, **kwargs):
+    '''Get the ETag for the assets list of an item
+
+    The ETag is computed from the item ETag which is updated on each of its assets changes
+    '''
+    return get_list_etag(request, get_item_etag(request, *args, **kwargs))
+
+
+def get_search_etag(request, *args, **kwargs):
+    '''Get the ETag for the search endpoint
+
+    The ETag is computed from all collections ETag, only for GET requests as the search
+    parameters of POST requests are in the payload.
+    '''
+    return get_list_etag(request, get_collections_etag())
+
+
 class LandingPageDetail(generics.RetrieveAPIView):
     serializer_class = LandingPageSerializer
     queryset = LandingPage.objects.all()
@@ -164,8 +258,9 @@ class SearchList(generics.GenericAPIView, mixins.ListModelMixin):
     ordering = ['name']
 
     def get_queryset(self):
-        queryset = Item.objects.filter(collection__published=True
-                                      ).prefetch_related('assets', 'links')
+        # NOTE: the assets and links are only fetched for the items without a valid document,
+        # see stac_api.item_documents
+        queryset = Item.objects.filter(collection__published=True)
         # harmonize GET and POST query
         query_param = harmonize_post_get_for_search(self.request)
 
@@ -187,6 +282,8 @@ class SearchList(generics.GenericAPIView, mixins.ListModelMixin):
             if 'intersects' in query_param:
                 queryset = queryset.filter_by_intersects(json.dumps(query_param['intersects']))
 
+        queryset = annotate_items_for_documents(queryset)
+
         if settings.DEBUG_ENABLE_DB_EXPLAIN_ANALYZE:
             logger.debug(
                 "Output of EXPLAIN.. ANALYZE from SearchList() view:\n%s",
@@ -203,16 +300,18 @@ class SearchList(generics.GenericAPIView, mixins.ListModelMixin):
         queryset = self.filter_queryset(self.get_queryset())
 
         page = self.paginate_queryset(queryset)
-
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
+        features = iter_item_documents(page if page is not None else queryset, request)
+        if settings.STREAMING_RESPONSES:
+            # The features are rendered and sent one by one by the response
+            response_class = FeatureCollectionStreamingResponse
         else:
-            serializer = self.get_serializer(queryset, many=True)
+            response_class = Response
+            features = list(features)
 
         data = {
             'type': 'FeatureCollection',
             'timeStamp': utc_aware(datetime.utcnow()),
-            'features': serializer.data,
+            'features': features,
             'links': [
                 OrderedDict([
                     ('rel', 'self'),
@@ -230,9 +329,12 @@ class SearchList(generics.GenericAPIView, mixins.ListModelMixin):
         }
 
         if page is not None:
-            return self.paginator.get_paginated_response(data, request)
-        return Response(data)
+            return self.paginator.get_paginated_response(
+                data, request, response_class=response_class
+            )
+        return response_class(data)
 
+    @etag(get_search_etag)
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
@@ -248,6 +350,7 @@ class CollectionList(generics.GenericAPIView):
     queryset = Collection.objects.filter(published=True).prefetch_related('providers', 'links')
     ordering = ['name']
 
+    @etag(get_collection_list_etag)
     def get(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -340,9 +443,9 @@ class ItemsList(generics.GenericAPIView):
 
     def get_queryset(self):
         # filter based on the url
-        queryset = Item.objects.filter(
-            collection__name=self.kwargs['collection_name']
-        ).prefetch_related(Prefetch('assets', queryset=Asset.objects.order_by('name')), 'links')
+        # NOTE: the assets and links are only fetched for the items without a valid document,
+        # see stac_api.item_documents
+        queryset = Item.objects.filter(collection__name=self.kwargs['collection_name'])
         bbox = self.request.query_params.get('bbox', None)
         date_time = self.request.query_params.get('datetime', None)
 
@@ -352,6 +455,8 @@ class ItemsList(generics.GenericAPIView):
         if date_time:
             queryset = queryset.filter_by_datetime(date_time)
 
+        queryset = annotate_items_for_documents(queryset)
+
         if settings.DEBUG_ENABLE_DB_EXPLAIN_ANALYZE:
             logger.debug(
                 "Output of EXPLAIN.. ANALYZE from ItemList() view:\n%s",
@@ -365,15 +470,18 @@ class ItemsList(generics.GenericAPIView):
         validate_collection(self.kwargs)
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
+        features = iter_item_documents(page if page is not None else queryset, request)
+        if settings.STREAMING_RESPONSES:
+            # The features are rendered and sent one by one by the response
+            response_class = FeatureCollectionStreamingResponse
         else:
-            serializer = self.get_serializer(queryset, many=True)
+            response_class = Response
+            features = list(features)
 
         data = {
             'type': 'FeatureCollection',
             'timeStamp': utc_aware(datetime.utcnow()),
-            'features': serializer.data,
+            'features': features,
             'links': [
                 OrderedDict([
                     ('rel', 'self'),
@@ -391,13 +499,64 @@ class ItemsList(generics.GenericAPIView):
         }
 
         if page is not None:
-            return self.get_paginated_response(data)
-        return Response(data)
+            return self.paginator.get_paginated_response(data, response_class=response_class)
+        return response_class(data)
 
+    @etag(get_items_list_etag)
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
+class ItemsBulk(generics.GenericAPIView):
+    '''Bulk creation of items
+
+    The items are given as FeatureCollection or as newline delimited JSON features (NDJSON) and
+    are validated then inserted together, see ItemListSerializer.
+    '''
+    serializer_class = ItemSerializer
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def get_queryset(self):
+        # used by the permission check
+        return Item.objects.filter(collection__name=self.kwargs['collection_name'])
+
+    def get_features(self, data):
+        if isinstance(data, list):
+            # NDJSON payload
+            return data
+        if not isinstance(data, dict) or data.get('type') != 'FeatureCollection' or \
+            not isinstance(data.get('features'), list):
+            logger.error('Invalid items bulk payload, not a FeatureCollection')
+            raise ValidationError(
+                code='payload',
+                detail={'type': _('Payload must be a FeatureCollection or NDJSON features')}
+            )
+        return data['features']
+
+    def validate_features_count(self, features):
+        # The features are inserted within a single transaction locking the collection
+        if len(features) > settings.ITEMS_BULK_MAX_FEATURES:
+            logger.error('Too many features in items bulk payload: %d', len(features))
+            raise ValidationError(
+                code='max_length',
+                detail={
+                    'features': [
+                        _('Too many features, maximum %(max)d per request') %
+                        {'max': settings.ITEMS_BULK_MAX_FEATURES}
+                    ]
+                }
+            )
+
+    def post(self, request, *args, **kwargs):
+        collection = get_object_or_404(Collection, name=self.kwargs['collection_name'])
+        features = self.get_features(request.data)
+        self.validate_features_count(features)
+        serializer = self.get_serializer(data=features, many=True, allow_empty=False)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.save(collection=collection)
+        return Response({'ids': [item.name for item in items]}, status=status.HTTP_201_CREATED)
+
+
 class ItemDetail(
     generics.GenericAPIView,
     mixins.RetrieveModelMixin,
@@ -480,6 +639,7 @@ class AssetsList(generics.GenericAPIView):
             item__name=self.kwargs['item_name']
         ).order_by('name')
 
+    @etag(get_assets_list_etag)
     def get(self, request, *args, **kwargs):
         validate_item(self.kwargs)
 
@@ -619,10 +779,11 @@ class AssetUploadBase(generics.GenericAPIView):
             key, asset, validated_data['checksum_multihash']
         )
         urls = []
-        for part in range(
-            1, (validated_data['number_parts'] if 'number_parts' in validated_data else 0) + 1
-        ):
-            urls.append(executor.create_presigned_url(key, asset, part, upload_id))
+        number_parts = validated_data.get('number_parts', 0)
+        # The urls of the uploads with many parts are created on demand (see AssetUploadPartUrl)
+        if number_parts <= settings.UPLOAD_PRESIGNED_URLS_MAX_PARTS:
+            for part in range(1, number_parts + 1):
+                urls.append(executor.create_presigned_url(key, asset, part, upload_id))
 
         clean_up_required = False
         try:
@@ -640,6 +801,9 @@ class AssetUploadBase(generics.GenericAPIView):
                     'asset': asset.name
                 }
             )
+            completing = self.get_queryset().filter(status=AssetUpload.Status.COMPLETING)
+            for asset_upload in completing.select_for_update(of=('self',)):
+                reset_stale_completion(asset_upload)
             in_progress = self.get_in_progress_queryset()
             if bool(in_progress):
                 # Abort the last upload in progress and retry
@@ -648,14 +812,16 @@ class AssetUploadBase(generics.GenericAPIView):
                 serializer.save(asset=asset, upload_id=upload_id, urls=urls)
                 exception_handled = True
                 clean_up_required = False
+            elif completing.exists():
+                message = _("Asset has an upload being completed")
+                raise ValidationError({'details': message}, code='invalid') from error
             if not exception_handled:
                 raise
         finally:
             if clean_up_required:
                 executor.abort_multipart_upload(key, asset, upload_id)
 
-    def complete_multipart_upload(self, executor, validated_data, asset_upload, asset):
-        key = get_asset_path(asset.item, asset.name)
+    def complete_multipart_upload(self, executor, validated_data, asset_upload, asynchronous=False):
         parts = validated_data.get('parts', None)
         if parts is None:
             raise ValidationError({'parts': _("Missing required field")}, code='missing')
@@ -663,12 +829,15 @@ class AssetUploadBase(generics.GenericAPIView):
             raise ValidationError({'parts': [_("Too many parts")]}, code='invalid')
         if len(parts) < asset_upload.number_parts:
             raise ValidationError({'parts': [_("Too few parts")]}, code='invalid')
-        executor.complete_multipart_upload(key, asset, parts, asset_upload.upload_id)
-        asset_upload.update_asset_checksum_multihash()
-        asset_upload.status = AssetUpload.Status.COMPLETED
-        asset_upload.ended = utc_aware(datetime.utcnow())
-        asset_upload.urls = []
-        asset_upload.save()
+        reset_stale_completion(asset_upload)
+        if asset_upload.status == AssetUpload.Status.COMPLETING:
+            raise ValidationError({
+                'details': _("Upload is already being completed")
+            }, code='invalid')
+        if asynchronous:
+            complete_asset_upload_async(asset_upload, parts)
+        else:
+            complete_asset_upload(executor, asset_upload, parts)
 
     def abort_multipart_upload(self, executor, asset_upload, asset):
         key = get_asset_path(asset.item, asset.name)
@@ -678,9 +847,9 @@ class AssetUploadBase(generics.GenericAPIView):
         asset_upload.urls = []
         asset_upload.save()
 
-    def list_multipart_upload_parts(self, executor, asset_upload, asset, limit, offset):
+    def list_multipart_upload_parts(self, executor, asset_upload, asset, limit, marker):
         key = get_asset_path(asset.item, asset.name)
-        return executor.list_upload_parts(key, asset, asset_upload.upload_id, limit, offset)
+        return executor.list_upload_parts(key, asset, asset_upload.upload_id, limit, marker)
 
 
 class AssetUploadsList(AssetUploadBase, mixins.ListModelMixin, views_mixins.CreateModelMixin):
@@ -704,9 +873,9 @@ class AssetUploadsList(AssetUploadBase, mixins.ListModelMixin, views_mixins.Crea
     def get_queryset(self):
         queryset = super().get_queryset()
 
-        status = self.request.query_params.get('status', None)
-        if status:
-            queryset = queryset.filter_by_status(status)
+        upload_status = self.request.query_params.get('status', None)
+        if upload_status:
+            queryset = queryset.filter_by_status(upload_status)
 
         return queryset
 
@@ -723,16 +892,44 @@ class AssetUploadDetail(AssetUploadBase, mixins.RetrieveModelMixin, views_mixins
 
 
 class AssetUploadComplete(AssetUploadBase, views_mixins.UpdateInsertModelMixin):
+    '''Complete an asset upload
+
+    With the `Prefer: respond-async` header, the upload is completed in background and the
+    request returns 202 with the upload in `completing` status, its completion can be followed
+    on the upload detail endpoint (see stac_api.upload_completion).
+    '''
 
     def post(self, request, *args, **kwargs):
         kwargs['partial'] = True
-        return self.update(request, *args, **kwargs)
+        response = self.update(request, *args, **kwargs)
+        if self.is_respond_async():
+            response.status_code = status.HTTP_202_ACCEPTED
+            response['Preference-Applied'] = 'respond-async'
+            response['Location'] = request.build_absolute_uri(
+                reverse('asset-upload-detail', kwargs=self.kwargs)
+            )
+        return response
+
+    def is_respond_async(self):
+        # The Prefer header is a comma separated list of preferences with optional parameters
+        # (see RFC 7240)
+        preferences = self.request.headers.get('Prefer', '')
+        return any(
+            preference.split(';')[0].strip().lower() == 'respond-async'
+            for preference in preferences.split(',')
+        )
+
+    def get_queryset(self):
+        # Lock the upload against concurrent completion or abort (see process_upload_completion())
+        return super().get_queryset().select_for_update(of=('self',))
 
     def perform_update(self, serializer):
         executor = MultipartUpload()
-        asset = serializer.instance.asset
         self.complete_multipart_upload(
-            executor, serializer.validated_data, serializer.instance, asset
+            executor,
+            serializer.validated_data,
+            serializer.instance,
+            asynchronous=self.is_respond_async()
         )
 
 
@@ -742,15 +939,44 @@ class AssetUploadAbort(AssetUploadBase, views_mixins.UpdateInsertModelMixin):
         kwargs['partial'] = True
         return self.update(request, *args, **kwargs)
 
+    def get_queryset(self):
+        # Lock the upload against concurrent completion (see process_upload_completion())
+        return super().get_queryset().select_for_update(of=('self',))
+
     def perform_update(self, serializer):
         executor = MultipartUpload()
-        asset = serializer.instance.asset
-        self.abort_multipart_upload(executor, serializer.instance, asset)
+        asset_upload = serializer.instance
+        reset_stale_completion(asset_upload)
+        if asset_upload.status == AssetUpload.Status.COMPLETING:
+            raise ValidationError({'details': _("Upload is being completed")}, code='invalid')
+        self.abort_multipart_upload(executor, asset_upload, asset_upload.asset)
+
+
+class AssetUploadPartUrl(AssetUploadBase):
+    '''Presigned url of an upload part, created on demand
+
+    This allows to upload files with many parts, without creating and storing all the parts urls
+    with the upload (see settings.UPLOAD_PRESIGNED_URLS_MAX_PARTS).
+    '''
+    serializer_class = AssetUploadPartUrlSerializer
+
+    def get(self, request, *args, **kwargs):
+        asset_upload = self.get_object()
+        if asset_upload.status != AssetUpload.Status.IN_PROGRESS:
+            raise ValidationError({'upload_id': [_("Upload is not in progress")]}, code='invalid')
+        part_number = self.kwargs['part_number']
+        if part_number < 1 or part_number > asset_upload.number_parts:
+            raise NotFound(_(f'Part {part_number} not found'))
+        asset = asset_upload.asset
+        url = MultipartUpload().create_presigned_url(
+            get_asset_path(asset.item, asset.name), asset, part_number, asset_upload.upload_id
+        )
+        return Response(self.get_serializer(url).data)
 
 
 class AssetUploadPartsList(AssetUploadBase):
     serializer_class = AssetUploadPartsSerializer
-    pagination_class = ExtApiPagination
+    pagination_class = ExtApiCursorPagination
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -758,16 +984,16 @@ class AssetUploadPartsList(AssetUploadBase):
     def list(self, request, *args, **kwargs):
         executor = MultipartUpload()
         asset_upload = self.get_object()
-        limit, offset = self.get_pagination_config(request)
-        data, has_next = self.list_multipart_upload_parts(
-            executor, asset_upload, asset_upload.asset, limit, offset
+        limit, marker = self.get_pagination_config(request)
+        data, next_marker = self.list_multipart_upload_parts(
+            executor, asset_upload, asset_upload.asset, limit, marker
         )
         serializer = self.get_serializer(data)
 
-        return self.get_paginated_response(serializer.data, has_next)
+        return self.get_paginated_response(serializer.data, next_marker)
 
     def get_pagination_config(self, request):
         return self.paginator.get_pagination_config(request)
 
-    def get_paginated_response(self, data, has_next):  # pylint: disable=arguments-differ
-        return self.paginator.get_paginated_response(data, has_next)
+    def get_paginated_response(self, data, next_marker):  # pylint: disable=arguments-differ
+        return self.paginator.get_paginated_response(data, next_marker)
@@ -8,6 +8,7 @@ from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from stac_api.models import propagate_changes_once
 from stac_api.utils import get_link
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,7 @@ class CreateModelMixin:
         return request.data
 
     @transaction.atomic
+    @propagate_changes_once()
     def create(self, request, *args, **kwargs):
         data = self.get_write_request_data(request, *args, **kwargs)
         serializer = self.get_serializer(data=data)
@@ -70,6 +72,7 @@ class UpdateInsertModelMixin:
         return request.data
 
     @transaction.atomic
+    @propagate_changes_once()
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
         serializer_kwargs = {'partial': partial}
@@ -87,6 +90,7 @@ class UpdateInsertModelMixin:
         return Response(serializer.data)
 
     @transaction.atomic
+    @propagate_changes_once()
     def upsert(self, request, *args, **kwargs):
         data = self.get_write_request_data(request, *args, **kwargs)
         serializer = self.get_serializer(data=data)
@@ -130,6 +134,7 @@ class DestroyModelMixin:
     """
 
     @transaction.atomic
+    @propagate_changes_once()
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         self.perform_destroy(instance)
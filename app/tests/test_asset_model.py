@@ -1,9 +1,20 @@
+import hashlib
+import io
 import logging
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.test import override_settings
 
 from stac_api.models import Asset
+from stac_api.models import Item
+from stac_api.models import propagate_changes_once
+from stac_api.storages import HashingFile
+from stac_api.utils import get_s3_resource
+from stac_api.utils import get_sha256_multihash
 
 from tests.data_factory import Factory
 from tests.utils import mock_s3_asset_file
@@ -29,6 +40,58 @@ class AssetsModelTestCase(TestCase):
             asset.full_clean()
             asset.save()
 
+    @mock_s3_asset_file
+    @override_settings(UPLOAD_STREAMING_HASH=True, FILE_UPLOAD_MAX_MEMORY_SIZE=10)
+    def test_create_asset_streaming_hash(self):
+        content = b'Asset content larger than the max memory size'
+        asset = Asset(
+            item=self.item,
+            name='streaming-hash.txt',
+            media_type='text/plain',
+            file=SimpleUploadedFile('streaming-hash.txt', content)
+        )
+        asset.full_clean()
+        asset.save()
+        self.assertEqual(get_sha256_multihash(content), asset.checksum_multihash)
+        self.assertEqual(
+            f'{self.collection.name}/{self.item.name}/streaming-hash.txt', asset.file.name
+        )
+        obj = get_s3_resource().Object(settings.AWS_STORAGE_BUCKET_NAME, asset.file.name)
+        self.assertEqual(content, obj.get()['Body'].read())
+        self.assertEqual(
+            hashlib.sha256(content).hexdigest(),
+            obj.metadata['sha256'],
+            msg='sha256 metadata not set'
+        )
+
+    def test_hashing_file_seek(self):
+        content = b'Asset content'
+        hashing_file = HashingFile(ContentFile(content))
+        hashing_file.read(5)
+        with self.assertRaises(io.UnsupportedOperation):
+            hashing_file.seek(2)
+        # rewinding restarts the digest
+        hashing_file.seek(0)
+        self.assertEqual(content, hashing_file.read())
+        self.assertEqual(hashlib.sha256(content).hexdigest(), hashing_file.hexdigest())
+
+    @mock_s3_asset_file
+    def test_create_asset_propagate_changes(self):
+        etag = Item.objects.get(pk=self.item.pk).etag
+        self.factory.create_asset_sample(item=self.item, db_create=True)
+        item = Item.objects.get(pk=self.item.pk)
+        self.assertNotEqual(etag, item.etag, msg='Item ETag not updated')
+        self.assertEqual(self.item.etag, item.etag)
+
+        # the changes are propagated only once to the item within the block
+        etag = item.etag
+        with propagate_changes_once():
+            self.factory.create_asset_sample(item=self.item, db_create=True)
+            new_etag = Item.objects.get(pk=self.item.pk).etag
+            self.factory.create_asset_sample(item=self.item, db_create=True)
+            self.assertEqual(new_etag, Item.objects.get(pk=self.item.pk).etag)
+        self.assertNotEqual(etag, new_etag, msg='Item ETag not updated')
+
     def test_create_asset_invalid_name(self):
         # try to create a asset with invalid asset name and other invalid fields
         with self.assertRaises(ValidationError, msg="asset with invalid name was accepted."):
@@ -6,10 +6,17 @@ from urllib import parse
 
 from django.conf import settings
 from django.test import Client
+from django.test import RequestFactory
+from django.test import override_settings
 from django.urls import reverse
 
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
 from stac_api.models import Asset
 from stac_api.models import AssetUpload
+from stac_api.pagination import ExtApiCursorPagination
+from stac_api.upload_completion import process_upload_completion
 from stac_api.utils import fromisoformat
 from stac_api.utils import get_asset_path
 from stac_api.utils import get_s3_client
@@ -61,6 +68,12 @@ class AssetUploadBaseTest(StacBaseTestCase, S3TestMixin):
             'asset-uploads-list', args=[self.collection.name, self.item.name, self.asset.name]
         )
 
+    def get_get_multipart_upload_path(self, upload_id):
+        return reverse(
+            'asset-upload-detail',
+            args=[self.collection.name, self.item.name, self.asset.name, upload_id]
+        )
+
     def get_abort_multipart_upload_path(self, upload_id):
         return reverse(
             'asset-upload-abort',
@@ -79,6 +92,12 @@ class AssetUploadBaseTest(StacBaseTestCase, S3TestMixin):
             args=[self.collection.name, self.item.name, self.asset.name, upload_id]
         )
 
+    def get_part_url_path(self, upload_id, part_number):
+        return reverse(
+            'asset-upload-part-url',
+            args=[self.collection.name, self.item.name, self.asset.name, upload_id, part_number]
+        )
+
     def s3_upload_parts(self, upload_id, file_like, size, number_parts):
         s3 = get_s3_client()
         key = get_asset_path(self.item, self.asset.name)
@@ -282,6 +301,154 @@ class AssetUpload1PartEndpointTestCase(AssetUploadBaseTest):
         self.assertS3ObjectExists(key)
 
 
+class AssetUploadAsyncCompleteEndpointTestCase(AssetUploadBaseTest):
+
+    def test_asset_upload_complete_async(self):
+        key = get_asset_path(self.item, self.asset.name)
+        number_parts = 1
+        size = 1 * KB
+        file_like, checksum_multihash = self.get_file_like_object(size)
+        response = self.client.post(
+            self.get_create_multipart_upload_path(),
+            data={
+                'number_parts': number_parts, 'checksum:multihash': checksum_multihash
+            },
+            content_type="application/json"
+        )
+        self.assertStatusCode(201, response)
+        json_data = response.json()
+        upload_id = json_data['upload_id']
+
+        parts = self.s3_upload_parts(upload_id, file_like, size, number_parts)
+
+        response = self.client.post(
+            self.get_complete_multipart_upload_path(upload_id),
+            data={'parts': parts},
+            content_type="application/json",
+            HTTP_PREFER='respond-async'
+        )
+        self.assertStatusCode(202, response)
+        self.assertEqual(response['Preference-Applied'], 'respond-async')
+        self.assertTrue(
+            response['Location'].endswith(self.get_get_multipart_upload_path(upload_id)),
+            msg=f'Invalid location {response["Location"]}'
+        )
+        self.assertEqual(response.json()['status'], 'completing')
+        self.assertS3ObjectNotExists(key)
+
+        # A completion is already running
+        response = self.client.post(
+            self.get_complete_multipart_upload_path(upload_id),
+            data={'parts': parts},
+            content_type="application/json"
+        )
+        self.assertStatusCode(400, response)
+
+        # The upload cannot be aborted while being completed
+        response = self.client.post(self.get_abort_multipart_upload_path(upload_id))
+        self.assertStatusCode(400, response)
+
+        # The test transactions are never committed, run the completion job directly
+        asset_upload = self.get_asset_upload_queryset().get(upload_id=upload_id)
+        self.assertTrue(
+            process_upload_completion(
+                asset_upload.pk, [{
+                    'ETag': part['etag'], 'PartNumber': part['part_number']
+                } for part in parts]
+            )
+        )
+
+        response = self.client.get(self.get_get_multipart_upload_path(upload_id))
+        self.assertStatusCode(200, response)
+        self.check_completed_response(response.json())
+        self.assertS3ObjectExists(key)
+
+    @override_settings(UPLOAD_COMPLETION_TIMEOUT_SECONDS=0)
+    def test_asset_upload_complete_async_lost(self):
+        number_parts = 1
+        size = 1 * KB
+        file_like, checksum_multihash = self.get_file_like_object(size)
+        response = self.client.post(
+            self.get_create_multipart_upload_path(),
+            data={
+                'number_parts': number_parts, 'checksum:multihash': checksum_multihash
+            },
+            content_type="application/json"
+        )
+        self.assertStatusCode(201, response)
+        upload_id = response.json()['upload_id']
+        parts = self.s3_upload_parts(upload_id, file_like, size, number_parts)
+
+        response = self.client.post(
+            self.get_complete_multipart_upload_path(upload_id),
+            data={'parts': parts},
+            content_type="application/json",
+            HTTP_PREFER='respond-async'
+        )
+        self.assertStatusCode(202, response)
+
+        # The completion job never ran and timed out, the upload can be completed again
+        response = self.client.post(
+            self.get_complete_multipart_upload_path(upload_id),
+            data={'parts': parts},
+            content_type="application/json"
+        )
+        self.assertStatusCode(200, response)
+        self.check_completed_response(response.json())
+
+    def test_asset_upload_complete_async_failure(self):
+        number_parts = 1
+        size = 1 * KB
+        file_like, checksum_multihash = self.get_file_like_object(size)
+        response = self.client.post(
+            self.get_create_multipart_upload_path(),
+            data={
+                'number_parts': number_parts, 'checksum:multihash': checksum_multihash
+            },
+            content_type="application/json"
+        )
+        self.assertStatusCode(201, response)
+        upload_id = response.json()['upload_id']
+        self.s3_upload_parts(upload_id, file_like, size, number_parts)
+
+        parts = [{'etag': 'dummy', 'part_number': 1}]
+        response = self.client.post(
+            self.get_complete_multipart_upload_path(upload_id),
+            data={'parts': parts},
+            content_type="application/json",
+            HTTP_PREFER='respond-async, wait=10'
+        )
+        self.assertStatusCode(202, response)
+
+        asset_upload = self.get_asset_upload_queryset().get(upload_id=upload_id)
+        self.assertFalse(
+            process_upload_completion(asset_upload.pk, [{
+                'ETag': 'dummy', 'PartNumber': 1
+            }])
+        )
+        asset_upload.refresh_from_db()
+        self.assertEqual(asset_upload.status, AssetUpload.Status.FAILED)
+
+        # The failure is reported to the client following the completion
+        response = self.client.get(self.get_get_multipart_upload_path(upload_id))
+        self.assertStatusCode(200, response)
+        json_data = response.json()
+        self.assertEqual(json_data['status'], 'failed')
+        self.assertIn('failed', json_data)
+        self.assertIn('failure_reason', json_data)
+        self.assertNotIn('urls', json_data)
+
+        # A new upload can be started
+        response = self.client.post(
+            self.get_create_multipart_upload_path(),
+            data={
+                'number_parts': number_parts, 'checksum:multihash': checksum_multihash
+            },
+            content_type="application/json"
+        )
+        self.assertStatusCode(201, response)
+
+
 class AssetUpload2PartEndpointTestCase(AssetUploadBaseTest):
 
     def test_asset_upload_2_parts(self):
@@ -315,6 +482,52 @@ class AssetUpload2PartEndpointTestCase(AssetUploadBaseTest):
         self.assertS3ObjectExists(key)
 
 
+@override_settings(UPLOAD_PRESIGNED_URLS_MAX_PARTS=1)
+class AssetUploadPartUrlEndpointTestCase(AssetUploadBaseTest):
+
+    def test_asset_upload_part_urls_on_demand(self):
+        key = get_asset_path(self.item, self.asset.name)
+        number_parts = 2
+        size = 10 * MB  # Minimum upload part on S3 is 5 MB
+        file_like, checksum_multihash = self.get_file_like_object(size)
+
+        response = self.client.post(
+            self.get_create_multipart_upload_path(),
+            data={
+                'number_parts': number_parts, 'checksum:multihash': checksum_multihash
+            },
+            content_type="application/json"
+        )
+        self.assertStatusCode(201, response)
+        json_data = response.json()
+        self.assertEqual(json_data['status'], 'in-progress')
+        self.assertNotIn('urls', json_data, msg='Urls should be created on demand')
+        upload_id = json_data['upload_id']
+        self.assertEqual([], self.get_asset_upload_queryset().get(upload_id=upload_id).urls)
+
+        urls = []
+        for part in range(1, number_parts + 1):
+            response = self.client.get(self.get_part_url_path(upload_id, part))
+            self.assertStatusCode(200, response)
+            urls.append(response.json())
+        self.check_urls_response(urls, number_parts)
+
+        response = self.client.get(self.get_part_url_path(upload_id, number_parts + 1))
+        self.assertStatusCode(404, response)
+
+        parts = self.s3_upload_parts(upload_id, file_like, size, number_parts)
+        response = self.client.post(
+            self.get_complete_multipart_upload_path(upload_id),
+            data={'parts': parts},
+            content_type="application/json"
+        )
+        self.assertStatusCode(200, response)
+        self.assertS3ObjectExists(key)
+
+        response = self.client.get(self.get_part_url_path(upload_id, 1))
+        self.assertStatusCode(400, response)
+
+
 class AssetUploadInvalidEndpointTestCase(AssetUploadBaseTest):
 
     def test_asset_upload_create_invalid(self):
@@ -349,7 +562,7 @@ class AssetUploadInvalidEndpointTestCase(AssetUploadBaseTest):
         response = self.client.post(
             self.get_create_multipart_upload_path(),
             data={
-                'number_parts': 101, "checksum:multihash": 'abcdef'
+                'number_parts': 10001, "checksum:multihash": 'abcdef'
             },
             content_type="application/json"
         )
@@ -358,7 +571,7 @@ class AssetUploadInvalidEndpointTestCase(AssetUploadBaseTest):
             response.json()['description'],
             {
                 'checksum:multihash': ['Invalid multihash value; Invalid varint provided'],
-                'number_parts': ['Ensure this value is less than or equal to 100.']
+                'number_parts': ['Ensure this value is less than or equal to 10000.']
             }
         )
 
@@ -709,6 +922,10 @@ class AssetUploadListPartsEndpointTestCase(AssetUploadBaseTest):
             self.assertIn('size', part)
             self.assertIn('part_number', part)
 
+        # Invalid cursor
+        response = self.client.get(self.get_list_parts_path(upload_id), {'cursor': 'invalid'})
+        self.assertStatusCode(400, response)
+
         # Unfortunately moto doesn't support yet the MaxParts
         # (see https://github.com/spulec/moto/issues/2680)
         # Test the list parts pagination
@@ -732,3 +949,27 @@ class AssetUploadListPartsEndpointTestCase(AssetUploadBaseTest):
         )
         self.assertStatusCode(200, response)
         self.assertS3ObjectExists(key)
+
+
+class AssetUploadPartsCursorPaginationTestCase(StacBaseTestCase):
+
+    def test_cursor_pagination_next_link(self):
+        factory = RequestFactory()
+        paginator = ExtApiCursorPagination()
+        request = Request(factory.get('/parts', {'limit': 2}))
+        self.assertEqual((2, None), paginator.get_pagination_config(request))
+        response = paginator.get_paginated_response({'parts': []}, 2)
+        self.assertEqual(1, len(response.data['links']), msg='Only a next link expected')
+        next_link = response.data['links'][0]
+        self.assertEqual('next', next_link['rel'])
+
+        request = Request(factory.get(next_link['href']))
+        self.assertEqual((2, 2), paginator.get_pagination_config(request))
+        response = paginator.get_paginated_response({'parts': []}, None)
+        self.assertEqual([], response.data['links'], msg='Last page should have no link')
+
+    def test_cursor_pagination_offset_rejected(self):
+        paginator = ExtApiCursorPagination()
+        request = Request(RequestFactory().get('/parts', {'limit': 2, 'offset': 2}))
+        with self.assertRaises(ValidationError):
+            paginator.get_pagination_config(request)
@@ -0,0 +1,103 @@
+import logging
+from datetime import datetime
+
+from django.contrib.gis.geos import GEOSGeometry
+from django.core.management import call_command
+from django.test import TestCase
+from django.test import override_settings
+
+from stac_api.collection_updates import process_collection_updates
+from stac_api.models import CollectionChange
+from stac_api.utils import utc_aware
+
+from tests.data_factory import Factory
+from tests.utils import mock_s3_asset_file
+
+logger = logging.getLogger(__name__)
+
+
+@override_settings(COLLECTION_UPDATES_DEFERRED=True)
+class CollectionUpdatesTestCase(TestCase):
+
+    y200 = utc_aware(datetime.strptime('0200-01-01T00:00:00Z', '%Y-%m-%dT%H:%M:%SZ'))
+    y8000 = utc_aware(datetime.strptime('8000-01-01T00:00:00Z', '%Y-%m-%dT%H:%M:%SZ'))
+
+    @mock_s3_asset_file
+    def setUp(self):
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample().model
+        self.item = self.factory.create_item_sample(
+            collection=self.collection,
+            name='item-1',
+            properties_start_datetime=self.y200,
+            properties_end_datetime=self.y8000,
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((0 0, 0 45, 45 45, 45 0, 0 0))')
+        ).model
+
+    def test_collection_updates_deferred(self):
+        self.collection.refresh_from_db()
+        self.assertIsNone(self.collection.extent_geometry)
+        self.assertEqual(1, CollectionChange.objects.filter(collection=self.collection).count())
+
+        # changes more recent than the delay are not processed
+        self.assertEqual(0, process_collection_updates(3600))
+        self.assertEqual(1, process_collection_updates(0))
+        self.assertFalse(CollectionChange.objects.filter(collection=self.collection).exists())
+
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.extent_geometry.extent, (0, 0, 45, 45))
+        self.assertEqual(self.collection.extent_start_datetime, self.y200)
+        self.assertEqual(self.collection.extent_end_datetime, self.y8000)
+
+    def test_collection_updates_deferred_etag(self):
+        # only the extent is deferred, the collection ETag changes with the item
+        self.collection.refresh_from_db()
+        etag = self.collection.etag
+        self.item.properties_title = 'New title'
+        self.item.full_clean()
+        self.item.save()
+        self.collection.refresh_from_db()
+        self.assertNotEqual(etag, self.collection.etag)
+
+    @mock_s3_asset_file
+    def test_collection_updates_coalesced(self):
+        item = self.factory.create_item_sample(
+            collection=self.collection,
+            name='item-2',
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((10 10, 10 50, 50 50, 50 10, 10 10))')
+        ).model
+        self.factory.create_asset_sample(
+            item=item, eo_gsd=2.5, geoadmin_variant='krel', proj_epsg=2056, db_create=True
+        )
+        self.factory.create_asset_sample(
+            item=self.item, eo_gsd=0.5, geoadmin_variant=None, proj_epsg=2056, db_create=True
+        )
+        self.assertEqual(1, process_collection_updates(0))
+
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.extent_geometry.extent, (0, 0, 50, 50))
+        self.assertEqual(
+            self.collection.summaries, {
+                'eo:gsd': [0.5, 2.5], 'geoadmin:variant': ['krel'], 'proj:epsg': [2056]
+            }
+        )
+
+        item.delete()
+        call_command('update_collections', verbosity=0)
+
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.extent_geometry.extent, (0, 0, 45, 45))
+        self.assertEqual(
+            self.collection.summaries, {
+                'eo:gsd': [0.5], 'geoadmin:variant': [], 'proj:epsg': [2056]
+            }
+        )
+
+    def test_collection_updates_last_item_deleted(self):
+        self.item.delete()
+        process_collection_updates(0)
+
+        self.collection.refresh_from_db()
+        self.assertIsNone(self.collection.extent_geometry)
+        self.assertIsNone(self.collection.extent_start_datetime)
+        self.assertIsNone(self.collection.extent_end_datetime)
@@ -4,7 +4,9 @@ from datetime import datetime
 from django.contrib.gis.geos import GEOSGeometry
 from django.contrib.gis.geos import Polygon
 from django.test import TestCase
+from django.test import override_settings
 
+from stac_api.models import Collection
 from stac_api.models import Item
 from stac_api.utils import utc_aware
 
@@ -90,6 +92,31 @@ class CollectionSpatialExtentTestCase(TestCase):
         diagonal_item.delete()
         self.assertEqual(self.collection.extent_geometry, self.item.geometry)
 
+    def test_changing_bbox_edges(self):
+        # only the edges defined by the removed item are recomputed
+        east_item = self.factory.create_item_sample(
+            self.collection,
+            name='east-bbox',
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((40 10, 40 20, 60 20, 60 10, 40 10))')
+        ).model
+        inner_item = self.factory.create_item_sample(
+            self.collection,
+            name='inner-bbox',
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((5 5, 5 10, 10 10, 10 5, 5 5))')
+        ).model
+        self.assertEqual(GEOSGeometry(self.collection.extent_geometry).extent, (0, 0, 60, 45))
+
+        inner_item.delete()
+        self.assertEqual(GEOSGeometry(self.collection.extent_geometry).extent, (0, 0, 60, 45))
+
+        east_item.geometry = GEOSGeometry('SRID=4326;POLYGON ((40 10, 40 20, 50 20, 50 10, 40 10))')
+        east_item.full_clean()
+        east_item.save()
+        self.assertEqual(GEOSGeometry(self.collection.extent_geometry).extent, (0, 0, 50, 45))
+
+        east_item.delete()
+        self.assertEqual(GEOSGeometry(self.collection.extent_geometry).extent, (0, 0, 45, 45))
+
     def test_collection_lost_all_items(self):
         self.item.delete()  # should be the one and only item of this collection
         self.assertIsNone(self.collection.extent_geometry)
@@ -822,3 +849,61 @@ class CollectionsModelTemporalExtentTestCase(TestCase):
             "Updating temporal extent (extent_end_datetime) based on mixed "
             "items failed."
         )
+
+
+@override_settings(COLLECTION_EXTENT_ATOMIC_MERGE=True)
+class CollectionExtentAtomicMergeTestCase(TestCase):
+    y200 = utc_aware(datetime.strptime('0200-01-01T00:00:00Z', '%Y-%m-%dT%H:%M:%SZ'))
+    y8000 = utc_aware(datetime.strptime('8000-01-01T00:00:00Z', '%Y-%m-%dT%H:%M:%SZ'))
+
+    def setUp(self):
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample().model
+
+    def test_collection_extent_atomic_merge(self):
+        self.factory.create_item_sample(
+            collection=self.collection,
+            name='item-1',
+            properties_datetime=self.y200,
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((0 0, 0 45, 45 45, 45 0, 0 0))')
+        ).create()
+        # a concurrent insertion, through another collection instance
+        collection = Collection.objects.get(pk=self.collection.pk)
+        self.factory.create_item_sample(
+            collection=collection,
+            name='item-2',
+            sample='item-2',
+            properties_start_datetime=self.y200,
+            properties_end_datetime=self.y8000,
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((10 10, 10 50, 50 50, 50 10, 10 10))')
+        ).create()
+
+        self.collection.refresh_from_db()
+        self.assertEqual(GEOSGeometry(self.collection.extent_geometry).extent, (0, 0, 50, 50))
+        self.assertEqual(self.collection.extent_start_datetime, self.y200)
+        self.assertEqual(self.collection.extent_end_datetime, self.y8000)
+
+    def test_collection_extent_atomic_merge_item_update(self):
+        item = self.factory.create_item_sample(
+            collection=self.collection,
+            name='item-1',
+            properties_datetime=self.y200,
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((0 0, 0 45, 45 45, 45 0, 0 0))')
+        ).create()
+        # a concurrent insertion, through another collection instance
+        collection = Collection.objects.get(pk=self.collection.pk)
+        self.factory.create_item_sample(
+            collection=collection,
+            name='item-2',
+            sample='item-2',
+            properties_datetime=self.y200,
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((10 10, 10 50, 50 50, 50 10, 10 10))')
+        ).create()
+
+        # the update of the item must not overwrite the extent merged by the insertion
+        item.geometry = GEOSGeometry('SRID=4326;POLYGON ((-10 -10, -10 5, 5 5, 5 -10, -10 -10))')
+        item.full_clean()
+        item.save()
+
+        self.collection.refresh_from_db()
+        self.assertEqual(GEOSGeometry(self.collection.extent_geometry).extent, (-10, -10, 50, 50))
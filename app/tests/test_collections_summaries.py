@@ -231,3 +231,33 @@ class CollectionsSummariesTestCase(TestCase):
                 'eo:gsd': [2.0], 'proj:epsg': [2056], 'geoadmin:variant': ['krel']
             }
         )
+
+    def test_update_collection_summaries_shared_values(self):
+        # a value remains in the summaries as long as an asset has it
+        item1 = self.add_range_item(self.y200, self.y8000, "item1")
+        item2 = self.add_range_item(self.y200, self.y8000, "item2")
+        asset1 = self.add_asset(item1, 1.5, "krel", 2056)
+        asset2 = self.add_asset(item1, 2.0, "krel", 21781)
+        self.add_asset(item2, 1.5, "komb", 2056)
+
+        asset1.delete()
+        self.assertEqual(
+            self.collection.summaries, {
+                'eo:gsd': [1.5, 2.0],
+                'proj:epsg': [2056, 21781],
+                'geoadmin:variant': ['komb', 'krel']
+            }
+        )
+
+        # the item assets are protected, they must be deleted before the item
+        asset2.delete()
+        item1.delete()
+        self.assertEqual(
+            self.collection.summaries, {
+                'eo:gsd': [1.5], 'proj:epsg': [2056], 'geoadmin:variant': ['komb']
+            }
+        )
+        self.assertEqual(
+            self.collection.summaries,
+            self.collection._get_summaries_from_counts()  # pylint: disable=protected-access
+        )
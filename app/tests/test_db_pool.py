@@ -0,0 +1,70 @@
+import psycopg2
+
+from django.db import connection
+from django.test import TestCase
+
+from db_backends.postgis_pool.pool import ConnectionPool
+from db_backends.postgis_pool.pool import PoolTimeout
+
+
+class ConnectionPoolTestCase(TestCase):
+
+    def setUp(self):  # pylint: disable=invalid-name
+        self.pool = ConnectionPool('test', size=2, timeout=0.1, check_seconds=0, max_age=3600)
+        self.conn_params = connection.get_connection_params()
+
+    def tearDown(self):  # pylint: disable=invalid-name
+        self.pool.close_idle()
+
+    def connect(self):
+        return psycopg2.connect(**self.conn_params)
+
+    def test_pool_reuse_connection(self):
+        conn, is_new = self.pool.acquire(self.connect)
+        self.assertTrue(is_new)
+        self.pool.release(conn)
+        conn2, is_new = self.pool.acquire(self.connect)
+        self.assertFalse(is_new)
+        self.assertIs(conn, conn2)
+        self.pool.release(conn2)
+
+    def test_pool_timeout(self):
+        conn1, _ = self.pool.acquire(self.connect)
+        conn2, _ = self.pool.acquire(self.connect)
+        with self.assertRaises(PoolTimeout):
+            self.pool.acquire(self.connect)
+        self.pool.release(conn1)
+        conn3, is_new = self.pool.acquire(self.connect)
+        self.assertFalse(is_new)
+        self.pool.release(conn2)
+        self.pool.release(conn3)
+
+    def test_pool_rollback_on_release(self):
+        conn, _ = self.pool.acquire(self.connect)
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertEqual(
+            psycopg2.extensions.TRANSACTION_STATUS_INTRANS, conn.get_transaction_status()
+        )
+        self.pool.release(conn)
+        self.assertEqual(psycopg2.extensions.TRANSACTION_STATUS_IDLE, conn.get_transaction_status())
+
+    def test_pool_discard_broken_connection(self):
+        conn, _ = self.pool.acquire(self.connect)
+        conn.close()
+        self.pool.release(conn)
+        conn2, is_new = self.pool.acquire(self.connect)
+        self.assertTrue(is_new)
+        self.assertIsNot(conn, conn2)
+        self.pool.release(conn2)
+
+    def test_pool_health_check(self):
+        conn, _ = self.pool.acquire(self.connect)
+        self.pool.release(conn)
+        # Simulate a connection closed by the server
+        with self.connect() as admin_conn, admin_conn.cursor() as cursor:
+            cursor.execute('SELECT pg_terminate_backend(%s)', [conn.get_backend_pid()])
+        admin_conn.close()
+        conn2, is_new = self.pool.acquire(self.connect)
+        self.assertTrue(is_new, msg='Unhealthy connection reused')
+        self.pool.release(conn2)
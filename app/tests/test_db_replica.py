@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test import TestCase
+from django.test import override_settings
+
+from stac_api.models import Item
+
+from middleware import db_replica
+
+STAC_BASE_V = settings.STAC_BASE_V
+
+
+# NOTE: the default database is not a replica, its lag is therefore 0
+@override_settings(DB_REPLICAS=['default'])
+class DBReplicaTestCase(TestCase):
+
+    def setUp(self):  # pylint: disable=invalid-name
+        self.factory = RequestFactory()
+        self.db_for_read = None
+        self.middleware = db_replica.DBReplicaMiddleware(self.get_response)
+        db_replica._replicas_availability.clear()  # pylint: disable=protected-access
+
+    def get_response(self, request):
+        # pylint: disable=protected-access
+        self.db_for_read = db_replica.ReplicaRouter().db_for_read(Item)
+        return HttpResponse(db_replica._state.use_replica)
+
+    def test_db_replica_safe_requests(self):
+        for request in [
+            self.factory.get(f'/{STAC_BASE_V}/collections'),
+            self.factory.head(f'/{STAC_BASE_V}/collections'),
+            self.factory.post(f'/{STAC_BASE_V}/search'),
+        ]:
+            with self.subTest(method=request.method):
+                response = self.middleware(request)
+                self.assertEqual(b'True', response.content, msg='Replica not used')
+                self.assertEqual('default', self.db_for_read)
+                self.assertNotIn(settings.DB_REPLICA_STICKY_COOKIE, response.cookies)
+        self.assertFalse(db_replica._state.use_replica)  # pylint: disable=protected-access
+
+    def test_db_replica_sticky(self):
+        response = self.middleware(self.factory.put(f'/{STAC_BASE_V}/collections/collection-1'))
+        self.assertEqual(b'False', response.content, msg='Replica used for unsafe request')
+        self.assertIn(settings.DB_REPLICA_STICKY_COOKIE, response.cookies)
+
+        request = self.factory.get(f'/{STAC_BASE_V}/collections/collection-1')
+        request.COOKIES[settings.DB_REPLICA_STICKY_COOKIE] = '1'
+        response = self.middleware(request)
+        self.assertEqual(b'False', response.content, msg='Replica used after a write')
+
+    @override_settings(DB_REPLICA_MAX_LAG_SECONDS=-1)
+    def test_db_replica_lag(self):
+        self.assertFalse(db_replica.is_replica_available('default'))
+        self.assertIsNone(db_replica.get_replica())
@@ -3,10 +3,14 @@ from datetime import datetime
 from datetime import timedelta
 
 from django.conf import settings
+from django.core.cache import caches
 from django.test import Client
 from django.test import override_settings
 
+from stac_api.etag_cache import ETAG_CACHE
+from stac_api.etag_cache import get_etag_cache_key
 from stac_api.models import AssetUpload
+from stac_api.models import Item
 from stac_api.utils import get_link
 from stac_api.utils import get_sha256_multihash
 from stac_api.utils import utc_aware
@@ -248,6 +252,40 @@ class ApiETagPreconditionTestCase(StacBaseTestCase):
                 response4 = self.client.get(f"/{STAC_BASE_V}/{endpoint}", HTTP_IF_MATCH='"abcd"')
                 self.assertStatusCode(412, response4)
 
+    @mock_s3_asset_file
+    def test_list_precondition(self):
+        for endpoint in [
+            'collections',
+            f'collections/{self.collection["name"]}/items',
+            f'collections/{self.collection["name"]}/items/{self.item["name"]}/assets',
+            'search',
+        ]:
+            with self.subTest(endpoint=endpoint):
+                response1 = self.client.get(f"/{STAC_BASE_V}/{endpoint}")
+                self.assertStatusCode(200, response1)
+                self.check_header_etag(None, response1)
+
+                response2 = self.client.get(
+                    f"/{STAC_BASE_V}/{endpoint}", HTTP_IF_NONE_MATCH=response1['ETag']
+                )
+                self.assertEqual(response1['ETag'], response2['ETag'])
+                self.assertStatusCode(304, response2)
+
+                # Another query has another ETag
+                response3 = self.client.get(
+                    f"/{STAC_BASE_V}/{endpoint}?limit=1", HTTP_IF_NONE_MATCH=response1['ETag']
+                )
+                self.assertStatusCode(200, response3)
+                self.assertNotEqual(response1['ETag'], response3['ETag'])
+
+                # Any asset change changes the lists ETag
+                self.factory.create_asset_sample(item=self.item.model, db_create=True)
+                response4 = self.client.get(
+                    f"/{STAC_BASE_V}/{endpoint}", HTTP_IF_NONE_MATCH=response1['ETag']
+                )
+                self.assertStatusCode(200, response4)
+                self.assertNotEqual(response1['ETag'], response4['ETag'])
+
     def test_put_precondition(self):
         client_login(self.client)
         for (endpoint, sample) in [
@@ -397,6 +435,74 @@ class ApiETagPreconditionTestCase(StacBaseTestCase):
                 self.assertStatusCode(200, response)
 
 
+@override_settings(ETAG_CACHE_SECONDS=60)
+class ApiETagCacheTestCase(StacBaseTestCase):
+
+    @mock_s3_asset_file
+    def setUp(self):
+        caches[ETAG_CACHE].clear()
+        self.client = Client()
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample(db_create=True)
+        self.item = self.factory.create_item_sample(
+            collection=self.collection.model, db_create=True
+        )
+        self.endpoint = f'/{STAC_BASE_V}/collections/{self.collection["name"]}' \
+            f'/items/{self.item["name"]}'
+
+    def test_etag_cache_get(self):
+        response = self.client.get(self.endpoint)
+        self.assertStatusCode(200, response)
+        etag = response['ETag']
+
+        # change the ETag in DB without the model hooks, the cached ETag is still used
+        Item.objects.filter(pk=self.item.model.pk).update(etag='new-etag')
+        response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertStatusCode(304, response)
+
+        # but not for the preconditions of unsafe methods
+        client_login(self.client)
+        response = self.client.patch(
+            self.endpoint, {'properties': {
+                'title': 'My title'
+            }},
+            content_type="application/json",
+            HTTP_IF_MATCH=etag
+        )
+        self.assertStatusCode(412, response)
+
+    def test_etag_cache_invalidation(self):
+        response = self.client.get(self.endpoint)
+        self.assertStatusCode(200, response)
+        etag = response['ETag']
+
+        item = Item.objects.get(pk=self.item.model.pk)
+        item.properties_title = 'My title'
+        item.save()
+        response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertStatusCode(200, response)
+        self.assertNotEqual(etag, response['ETag'])
+
+    def test_etag_cache_rename(self):
+        collection_endpoint = f'/{STAC_BASE_V}/collections/{self.collection["name"]}'
+        response = self.client.get(collection_endpoint)
+        self.assertStatusCode(200, response)
+        self.assertIsNotNone(
+            caches[ETAG_CACHE].get(get_etag_cache_key(self.collection['name'])),
+            msg='ETag not cached'
+        )
+
+        self.collection.model.refresh_from_db()
+        self.collection.model.name = 'new-name'
+        self.collection.model.save()
+        self.assertIsNone(
+            caches[ETAG_CACHE].get(get_etag_cache_key(self.collection['name'])),
+            msg='ETag cache not cleared on renaming'
+        )
+        response = self.client.get(collection_endpoint, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertStatusCode(404, response)
+
+
 class ApiCacheHeaderTestCase(StacBaseTestCase):
 
     @classmethod
@@ -0,0 +1,126 @@
+import logging
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.test import Client
+from django.test import override_settings
+
+from stac_api.item_documents import annotate_items_for_documents
+from stac_api.models import Item
+from stac_api.utils import get_link
+
+from tests.base_test import StacBaseTestCase
+from tests.data_factory import Factory
+from tests.utils import mock_s3_asset_file
+
+logger = logging.getLogger(__name__)
+
+STAC_BASE_V = settings.STAC_BASE_V
+
+
+class ItemDocumentsTestCase(StacBaseTestCase):
+
+    @mock_s3_asset_file
+    def setUp(self):
+        self.client = Client()
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample().model
+        self.item = self.factory.create_item_sample(self.collection, db_create=True).model
+        self.factory.create_asset_samples(
+            2, self.item, name=['asset-1.tiff', 'asset-0.tiff'], db_create=True
+        )
+        self.path = f'/{STAC_BASE_V}/collections/{self.collection.name}/items'
+
+    def get_document(self):
+        return Item.objects.values_list('document', flat=True).get(pk=self.item.pk)
+
+    def test_item_document_stored_on_list(self):
+        self.assertIsNone(self.get_document(), msg='Document should not exist yet')
+        response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+        self.assertIsNotNone(self.get_document(), msg='Document has not been stored')
+
+        # second request served from the document must be identical to the first one and
+        # to the item detail endpoint
+        response_2 = self.client.get(self.path)
+        self.assertStatusCode(200, response_2)
+        self.assertEqual(response.json()['features'], response_2.json()['features'])
+        response_detail = self.client.get(f'{self.path}/{self.item.name}')
+        self.assertStatusCode(200, response_detail)
+        self.assertEqual(response_detail.json(), response_2.json()['features'][0])
+
+    def test_item_document_stored_on_search(self):
+        response = self.client.get(f'/{STAC_BASE_V}/search')
+        self.assertStatusCode(200, response)
+        self.assertIsNotNone(self.get_document(), msg='Document has not been stored')
+
+    def test_item_document_store_failure(self):
+        with patch('stac_api.item_documents.execute_values', side_effect=DatabaseError('test')):
+            response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+        self.assertIsNone(self.get_document(), msg='Document should not have been stored')
+        self.assertEqual(response.json()['features'][0]['id'], self.item.name)
+
+    @override_settings(ITEM_DOCUMENTS_ENGINE='python')
+    def test_item_document_geometry_only_rendered_when_missing(self):
+        item = annotate_items_for_documents(Item.objects.filter(pk=self.item.pk)).get()
+        self.assertIsNotNone(item.geometry_geojson, msg='Geometry not rendered without document')
+
+        self.client.get(self.path)
+        self.assertIsNotNone(self.get_document(), msg='Document has not been stored')
+        item = annotate_items_for_documents(Item.objects.filter(pk=self.item.pk)).get()
+        self.assertIsNone(item.geometry_geojson, msg='Geometry rendered with a valid document')
+
+    @mock_s3_asset_file
+    def test_item_document_invalidated_on_change(self):
+        self.client.get(self.path)
+        self.assertIsNotNone(self.get_document(), msg='Document has not been stored')
+
+        self.item.refresh_from_db()
+        self.item.properties_title = 'New title'
+        self.item.full_clean()
+        self.item.save()
+        self.assertIsNone(self.get_document(), msg='Document not invalidated on item change')
+
+        self.client.get(self.path)
+        self.assertIsNotNone(self.get_document(), msg='Document has not been stored')
+        self.factory.create_asset_sample(self.item, name='asset-2.tiff', db_create=True)
+        self.assertIsNone(self.get_document(), msg='Document not invalidated on asset change')
+
+        response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+        feature = response.json()['features'][0]
+        self.assertEqual('New title', feature['properties']['title'])
+        self.assertEqual(['asset-0.tiff', 'asset-1.tiff', 'asset-2.tiff'],
+                         list(feature['assets'].keys()))
+
+    def test_item_document_other_version(self):
+        self.client.get(self.path)
+        Item.objects.filter(pk=self.item.pk).update(document='{"version": "old", "item": {}}')
+        response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+        self.assertEqual(self.item.name, response.json()['features'][0]['id'])
+        self.assertNotIn('"old"', self.get_document(), msg='Outdated document not replaced')
+
+    @mock_s3_asset_file
+    def test_item_document_sql_engine(self):
+        self.factory.create_item_sample(self.collection, name='item-2', db_create=True)
+        for path in [f'{self.path}?limit=1', f'/{STAC_BASE_V}/search?limit=1']:
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertStatusCode(200, response)
+                with override_settings(ITEM_DOCUMENTS_ENGINE='sql'):
+                    response_sql = self.client.get(path)
+                    self.assertStatusCode(200, response_sql)
+                    json_data = response.json()
+                    json_data_sql = response_sql.json()
+                    self.assertEqual(json_data['features'], json_data_sql['features'])
+                    self.assertEqual(json_data['links'], json_data_sql['links'])
+
+                    # check the cursor pagination
+                    response_sql = self.client.get(get_link(json_data_sql['links'], 'next')['href'])
+                    self.assertStatusCode(200, response_sql)
+                response = self.client.get(get_link(json_data['links'], 'next')['href'])
+                self.assertStatusCode(200, response)
+                self.assertEqual(response.json()['features'], response_sql.json()['features'])
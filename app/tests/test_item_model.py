@@ -8,6 +8,7 @@ from django.test import TestCase
 
 from stac_api.models import Collection
 from stac_api.models import Item
+from stac_api.models import ItemLink
 from stac_api.utils import utc_aware
 
 from tests.data_factory import CollectionFactory
@@ -150,3 +151,81 @@ class ItemsModelTestCase(TestCase):
             )
             item.full_clean()
             item.save()
+
+    def test_item_filter_by_datetime_range(self):
+        now = utc_aware(datetime.utcnow())
+        yesterday = now - timedelta(days=1)
+        Item.objects.create(
+            collection=self.collection, name='item-instant', properties_datetime=now
+        )
+        Item.objects.create(
+            collection=self.collection,
+            name='item-range',
+            properties_start_datetime=yesterday - timedelta(hours=1),
+            properties_end_datetime=yesterday + timedelta(hours=1)
+        )
+
+        def filter_items(date_time):
+            return sorted(Item.objects.filter_by_datetime(date_time).values_list('name', flat=True))
+
+        before = (yesterday - timedelta(days=1)).isoformat()
+        self.assertEqual(['item-instant', 'item-range'], filter_items(f'{before}/..'))
+        self.assertEqual(['item-instant'], filter_items(f'{yesterday.isoformat()}/..'))
+        self.assertEqual([], filter_items(f'../{yesterday.isoformat()}'))
+        end = (yesterday + timedelta(hours=1)).isoformat()
+        self.assertEqual(['item-range'], filter_items(f'../{end}'))
+        self.assertEqual(['item-instant', 'item-range'],
+                         filter_items(f'{before}/{now.isoformat()}'))
+        self.assertEqual(['item-range'], filter_items(f'{before}/{end}'))
+
+    def test_item_bbox(self):
+        item = Item.objects.create(
+            collection=self.collection,
+            name='item-bbox',
+            properties_datetime=utc_aware(datetime.utcnow()),
+            geometry=GEOSGeometry('SRID=4326;POLYGON((6 46, 7 46, 7 47, 6 46))')
+        )
+        item.refresh_from_db()
+        self.assertEqual([6, 46, 7, 47], item.bbox)
+
+        item.geometry = GEOSGeometry('SRID=4326;POLYGON((6.5 46.5, 8 46.5, 8 47.5, 6.5 46.5))')
+        item.save()
+        item.refresh_from_db()
+        self.assertEqual([6.5, 46.5, 8, 47.5], item.bbox)
+
+    def test_item_link_save_propagate_changes(self):
+        item = Item.objects.create(
+            collection=self.collection,
+            name='item-link',
+            properties_datetime=utc_aware(datetime.utcnow())
+        )
+        self.collection.refresh_from_db()
+        item_etag = item.etag
+        collection_etag = self.collection.etag
+        ItemLink.objects.create(item=item, rel='license', href='https://www.example.com/license')
+        item.refresh_from_db()
+        self.collection.refresh_from_db()
+        self.assertNotEqual(item_etag, item.etag, msg='Item ETag not updated')
+        self.assertNotEqual(
+            collection_etag, self.collection.etag, msg='Collection ETag not updated'
+        )
+
+    def test_item_filter_by_bbox(self):
+        Item.objects.create(
+            collection=self.collection,
+            name='item-triangle',
+            properties_datetime=utc_aware(datetime.utcnow()),
+            geometry=GEOSGeometry('SRID=4326;POLYGON((6 46, 7 46, 7 47, 6 46))')
+        )
+
+        def filter_items(bbox):
+            return list(Item.objects.filter_by_bbox(bbox).values_list('name', flat=True))
+
+        # bbox containing the item bbox
+        self.assertEqual(['item-triangle'], filter_items('5.9,45.9,7.1,47.1'))
+        # bbox intersecting the item
+        self.assertEqual(['item-triangle'], filter_items('6.8,46.1,7.1,46.2'))
+        # bbox intersecting the item bbox but not the item
+        self.assertEqual([], filter_items('6.1,46.8,6.2,46.9'))
+        # bbox outside of the item bbox
+        self.assertEqual([], filter_items('8,48,9,49'))
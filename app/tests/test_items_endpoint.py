@@ -1,3 +1,4 @@
+import json
 import logging
 from datetime import datetime
 from datetime import timedelta
@@ -6,6 +7,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos.geometry import GEOSGeometry
 from django.test import Client
+from django.test import override_settings
 from django.urls import reverse
 
 from stac_api.models import BBOX_CH
@@ -102,6 +104,24 @@ class ItemsReadEndpointTestCase(StacBaseTestCase):
 
         self.check_stac_item(self.items[0].json, json_data['features'][0], self.collection.name)
 
+    def test_items_endpoint_streaming(self):
+        path = f"/{STAC_BASE_V}/collections/{self.collection.name}/items?limit=1"
+        response = self.client.get(path)
+        self.assertStatusCode(200, response)
+        with override_settings(STREAMING_RESPONSES=True):
+            streaming_response = self.client.get(path)
+        self.assertStatusCode(200, streaming_response)
+        self.assertTrue(streaming_response.streaming, msg='Response is not streamed')
+        self.assertEqual('application/json', streaming_response['Content-Type'])
+
+        json_data = response.json()
+        streaming_json_data = json.loads(b''.join(streaming_response.streaming_content))
+        self.assertEqual(json_data['features'], streaming_json_data['features'])
+        self.assertEqual(json_data['links'], streaming_json_data['links'])
+        self.assertIsNotNone(
+            get_link(streaming_json_data['links'], 'next'), msg='Pagination link missing'
+        )
+
     def test_single_item_endpoint(self):
         collection_name = self.collection.name
         item = self.items[0]
@@ -606,6 +626,115 @@ class ItemsCreateEndpointTestCase(StacBaseTestCase):
         )
 
 
+class ItemsBulkEndpointTestCase(StacBaseTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.factory = Factory()
+        cls.collection = cls.factory.create_collection_sample().model
+
+    def setUp(self):
+        self.client = Client()
+        client_login(self.client)
+        self.path = f'/{STAC_BASE_V}/collections/{self.collection.name}/items:bulk'
+
+    def test_items_bulk_create_feature_collection(self):
+        samples = self.factory.create_item_samples(['item-1', 'item-2'], self.collection)
+        etag = self.collection.etag
+        response = self.client.post(
+            self.path,
+            data={
+                'type': 'FeatureCollection',
+                'features': [sample.get_json('put') for sample in samples]
+            },
+            content_type="application/json"
+        )
+        self.assertStatusCode(201, response)
+        self.assertEqual([sample['name'] for sample in samples], response.json()['ids'])
+
+        for sample in samples:
+            response = self.client.get(
+                f'/{STAC_BASE_V}/collections/{self.collection.name}/items/{sample["name"]}'
+            )
+            self.assertStatusCode(200, response)
+            self.check_stac_item(sample.json, response.json(), self.collection.name)
+
+        self.collection.refresh_from_db()
+        self.assertNotEqual(etag, self.collection.etag, msg='Collection ETag not updated')
+        self.assertIsNotNone(self.collection.extent_geometry)
+        self.assertIsNotNone(self.collection.extent_start_datetime)
+        self.assertIsNotNone(self.collection.extent_end_datetime)
+
+    def test_items_bulk_create_ndjson(self):
+        samples = self.factory.create_item_samples(['item-1', 'item-2'], self.collection)
+        response = self.client.post(
+            self.path,
+            data='\n'.join(json.dumps(sample.get_json('put')) for sample in samples),
+            content_type="application/x-ndjson"
+        )
+        self.assertStatusCode(201, response)
+        self.assertEqual(2, Item.objects.filter(collection=self.collection).count())
+
+    def test_items_bulk_create_invalid(self):
+        valid = self.factory.create_item_sample(self.collection, sample='item-1')
+        invalid = self.factory.create_item_sample(self.collection, sample='item-invalid')
+        for features in [
+            [],
+            [valid.get_json('put'), invalid.get_json('put')],
+            [valid.get_json('put'), valid.get_json('put')],
+        ]:
+            with self.subTest(features=features):
+                response = self.client.post(
+                    self.path,
+                    data={
+                        'type': 'FeatureCollection', 'features': features
+                    },
+                    content_type="application/json"
+                )
+                self.assertStatusCode(400, response)
+                self.assertFalse(
+                    Item.objects.filter(collection=self.collection).exists(),
+                    msg="Items have been created in DB"
+                )
+
+    @override_settings(ITEMS_BULK_MAX_FEATURES=1)
+    def test_items_bulk_create_too_many(self):
+        samples = self.factory.create_item_samples(['item-1', 'item-2'], self.collection)
+        response = self.client.post(
+            self.path,
+            data='\n'.join(json.dumps(sample.get_json('put')) for sample in samples),
+            content_type="application/x-ndjson"
+        )
+        self.assertStatusCode(400, response)
+        self.assertIn('features', response.json()['description'])
+        self.assertFalse(Item.objects.filter(collection=self.collection).exists())
+
+    def test_items_bulk_create_existing(self):
+        existing = self.factory.create_item_sample(self.collection, db_create=True)
+        sample = self.factory.create_item_sample(self.collection)
+        response = self.client.post(
+            self.path,
+            data={
+                'type': 'FeatureCollection',
+                'features': [sample.get_json('put'), existing.get_json('put')]
+            },
+            content_type="application/json"
+        )
+        self.assertStatusCode(400, response)
+        self.assertFalse(Item.objects.filter(name=sample['name']).exists())
+
+    def test_items_bulk_create_unauthorized(self):
+        sample = self.factory.create_item_sample(self.collection)
+        response = Client().post(
+            self.path,
+            data={
+                'type': 'FeatureCollection', 'features': [sample.get_json('put')]
+            },
+            content_type="application/json"
+        )
+        self.assertStatusCode(401, response)
+
+
 class ItemsUpdateEndpointTestCase(StacBaseTestCase):
 
     @classmethod
@@ -0,0 +1,169 @@
+import json
+from io import StringIO
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+
+from stac_api.management.commands.list_asset_uploads import merge_uploads
+from stac_api.models import AssetUpload
+from stac_api.s3_multipart_upload import MultipartUpload
+from stac_api.utils import get_asset_path
+from stac_api.utils import get_s3_client
+from stac_api.utils import get_sha256_multihash
+
+from tests.data_factory import Factory
+from tests.utils import mock_s3_asset_file
+
+
+class MergeUploadsTestCase(TestCase):
+
+    def test_merge_uploads(self):
+        s3_uploads = [
+            {
+                'Key': 'a/b/c', 'UploadId': '2'
+            },
+            {
+                'Key': 'a/b/c', 'UploadId': '1'
+            },
+            {
+                'Key': 'a/b/d', 'UploadId': '3'
+            },
+            {
+                'Key': 'a/c/a', 'UploadId': '5'
+            },
+        ]
+        db_uploads = [
+            SimpleNamespace(s3_key='a/a/a', upload_id='0'),
+            SimpleNamespace(s3_key='a/b/c', upload_id='1'),
+            SimpleNamespace(s3_key='a/b/c', upload_id='4'),
+            SimpleNamespace(s3_key='a/c/a', upload_id='5'),
+        ]
+        result = [(
+            key,
+            s3_upload['UploadId'] if s3_upload else None,
+            db_upload.upload_id if db_upload else None,
+        ) for key,
+                  s3_upload,
+                  db_upload in merge_uploads(s3_uploads, db_uploads)]
+        self.assertEqual(
+            result,
+            [
+                ('a/a/a', None, '0'),
+                ('a/b/c', '2', None),
+                ('a/b/c', '1', '1'),
+                ('a/b/c', None, '4'),
+                ('a/b/d', '3', None),
+                ('a/c/a', '5', '5'),
+            ]
+        )
+
+    def test_merge_uploads_one_side(self):
+        s3_uploads = [{'Key': 'a/b/c', 'UploadId': '1'}]
+        self.assertEqual(list(merge_uploads(s3_uploads, [])), [('a/b/c', s3_uploads[0], None)])
+        self.assertEqual(list(merge_uploads([], s3_uploads[:0])), [])
+
+
+class ListAssetUploadsCommandTestCase(TestCase):
+
+    @mock_s3_asset_file
+    def setUp(self):  # pylint: disable=invalid-name
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample().model
+        self.item = self.factory.create_item_sample(collection=self.collection).model
+        self.assets = self.factory.create_asset_samples(
+            2, item=self.item, sample='asset-no-file', db_create=True
+        )
+        self.executor = MultipartUpload()
+        checksum_multihash = get_sha256_multihash(b'')
+
+        # Upload on S3 and in DB
+        asset = self.assets[0].model
+        self.key = get_asset_path(self.item, asset.name)
+        self.upload_id = self.executor.create_multipart_upload(self.key, asset, checksum_multihash)
+        AssetUpload.objects.create(
+            asset=asset,
+            upload_id=self.upload_id,
+            number_parts=1,
+            checksum_multihash=checksum_multihash
+        )
+
+        # Upload only in DB
+        AssetUpload.objects.create(
+            asset=self.assets[1].model,
+            upload_id='db-only',
+            number_parts=1,
+            checksum_multihash=checksum_multihash
+        )
+
+        # Upload only on S3
+        self.orphan_key = get_asset_path(self.item, 'orphan')
+        self.orphan_upload_id = get_s3_client().create_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=self.orphan_key
+        )['UploadId']
+
+    def call_command(self, *args, **kwargs):
+        out = StringIO()
+        call_command('list_asset_uploads', *args, stdout=out, verbosity=0, **kwargs)
+        return json.loads(out.getvalue())
+
+    def test_list_asset_uploads(self):
+        result = self.call_command(limit=0)
+        self.assertEqual([upload['db']['upload_id'] for upload in result['uploads']],
+                         [self.upload_id])
+        self.assertEqual([upload['s3']['Key'] for upload in result['uploads']], [self.key])
+        self.assertEqual([upload['upload_id'] for upload in result['db_uploads']], ['db-only'])
+        self.assertIn(
+            self.orphan_upload_id, [upload['UploadId'] for upload in result['s3_uploads']]
+        )
+        self.assertNotIn('aborted', result)
+
+    def test_list_asset_uploads_pagination(self):
+        upload_ids = []
+        pages = 0
+        key_start = None
+        while True:
+            result = self.call_command(limit=1, key_start=key_start)
+            pages += 1
+            upload_ids += [upload['db']['upload_id'] for upload in result['uploads']]
+            upload_ids += [upload['upload_id'] for upload in result['db_uploads']]
+            upload_ids += [upload['UploadId'] for upload in result['s3_uploads']]
+            if '--key-start' not in result['next']:
+                break
+            key_start = result['next'].split('--key-start=')[1]
+        self.assertGreaterEqual(pages, 3)
+        self.assertEqual(len(upload_ids), len(set(upload_ids)), msg='Uploads listed twice')
+        for upload_id in [self.upload_id, 'db-only', self.orphan_upload_id]:
+            self.assertIn(upload_id, upload_ids)
+
+    def test_list_asset_uploads_deprecated_start(self):
+        db_uploads = sorted([
+            (self.key, self.upload_id),
+            (get_asset_path(self.item, self.assets[1].model.name), 'db-only'),
+        ])
+        result = self.call_command('--start=1', '--limit=0')
+        upload_ids = [upload['db']['upload_id'] for upload in result['uploads']]
+        upload_ids += [upload['upload_id'] for upload in result['db_uploads']]
+        self.assertEqual(upload_ids, [db_uploads[1][1]])
+
+        # The former S3 markers are mapped onto the key and upload ID markers
+        result = self.call_command(
+            f'--s3-key-start={db_uploads[0][0]}', f'--s3-upload-id-start={db_uploads[0][1]}'
+        )
+        upload_ids = [upload['db']['upload_id'] for upload in result['uploads']]
+        upload_ids += [upload['upload_id'] for upload in result['db_uploads']]
+        self.assertEqual(upload_ids, [db_uploads[1][1]])
+
+    def test_list_asset_uploads_abort_orphans(self):
+        result = self.call_command(limit=0, abort_orphans=True, abort_older_than=0)
+        orphan = {'Key': self.orphan_key, 'UploadId': self.orphan_upload_id}
+        self.assertIn(orphan, result['aborted'])
+        self.assertEqual(result['abort_errors'], [])
+
+        result = self.call_command(limit=0)
+        self.assertNotIn(
+            self.orphan_upload_id, [upload['UploadId'] for upload in result['s3_uploads']]
+        )
+        self.assertEqual([upload['s3']['UploadId'] for upload in result['uploads']],
+                         [self.upload_id])
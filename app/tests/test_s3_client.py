@@ -0,0 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.test import TestCase
+
+from stac_api.utils import get_s3_client
+from stac_api.utils import get_s3_resource
+
+
+class S3ClientTestCase(TestCase):
+
+    def test_s3_client_reused(self):
+        client = get_s3_client()
+        self.assertIs(client, get_s3_client())
+        self.assertEqual(
+            settings.AWS_S3_MAX_POOL_CONNECTIONS, client.meta.config.max_pool_connections
+        )
+
+    def test_s3_client_shared_by_threads(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            clients = list(executor.map(lambda _: get_s3_client(), range(8)))
+        for client in clients:
+            self.assertIs(get_s3_client(), client)
+
+    def test_s3_resource_shares_client(self):
+        resource1 = get_s3_resource()
+        resource2 = get_s3_resource()
+        self.assertIsNot(resource1, resource2, msg='Resources are not thread safe')
+        self.assertIs(get_s3_client(), resource1.meta.client)
+        self.assertIs(get_s3_client(), resource2.meta.client)
+        obj = resource1.Object(settings.AWS_STORAGE_BUCKET_NAME, 'my-object')
+        self.assertIs(get_s3_client(), obj.meta.client)
@@ -36,8 +36,17 @@ class SampleDataTestCase(StacBaseTestCase):
                 ):
                     self._test_collection(Path(collection_dir.path))
 
-    def _test_collection(self, collection_dir):
-        collection = importer.import_collection(collection_dir)
+    def test_samples_copy(self):
+        for collection_dir in os.scandir(DATADIR):
+            if collection_dir.is_dir() and not collection_dir.name.startswith('_'):
+                with self.subTest(
+                    msg=f'test sample {collection_dir.name} with copy',
+                    collection_dir=collection_dir
+                ):
+                    self._test_collection(Path(collection_dir.path), copy=True)
+
+    def _test_collection(self, collection_dir, copy=False):
+        collection = importer.import_collection(collection_dir, copy=copy)
 
         with open(collection_dir / 'collection.json') as fd:
             collection_dict = json.load(fd)
@@ -5,6 +5,7 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.test import Client
+from django.test import override_settings
 
 from stac_api.utils import fromisoformat
 from stac_api.utils import get_link
@@ -166,6 +167,28 @@ class SearchEndpointPaginationTestCase(StacBaseTestCase):
             msg='previous page should be the same as the first one'
         )
 
+    def test_streaming_pagination(self):
+        for method, kwargs in [
+            ('get', {'path': f'{self.path}?limit=3'}),
+            ('post', {'path': self.path, 'data': {'limit': 3}, 'content_type': 'application/json'}),
+        ]:
+            with self.subTest(method=method):
+                response = getattr(self.client, method)(**kwargs)
+                self.assertStatusCode(200, response)
+                with override_settings(STREAMING_RESPONSES=True):
+                    streaming_response = getattr(self.client, method)(**kwargs)
+                self.assertStatusCode(200, streaming_response)
+                self.assertTrue(streaming_response.streaming, msg='Response is not streamed')
+                json_data = response.json()
+                streaming_json_data = json.loads(b''.join(streaming_response.streaming_content))
+                # the timeStamp is the only member that may differ
+                json_data.pop('timeStamp')
+                streaming_json_data.pop('timeStamp')
+                self.assertEqual(json_data, streaming_json_data)
+                self.assertEqual(['type', 'features', 'links'],
+                                 list(streaming_json_data.keys()),
+                                 msg='The links must be sent after the features')
+
 
 class SearchEndpointTestCaseOne(StacBaseTestCase):
 
@@ -7,15 +7,20 @@ from datetime import timedelta
 from pprint import pformat
 
 from django.conf import settings
+from django.test import override_settings
 
 from rest_framework.exceptions import ValidationError
 from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIRequestFactory
 
+from stac_api.item_documents import annotate_items_for_documents
+from stac_api.models import CollectionLink
+from stac_api.models import Item
 from stac_api.models import get_asset_path
 from stac_api.serializers import AssetSerializer
 from stac_api.serializers import CollectionSerializer
 from stac_api.serializers import ItemSerializer
+from stac_api.serializers_utils import bulk_update_or_create
 from stac_api.utils import get_link
 from stac_api.utils import isoformat
 from stac_api.utils import utc_aware
@@ -199,6 +204,39 @@ class CollectionDeserializationTestCase(StacBaseTestCase):
             msg='User link describedBy have not been removed'
         )
 
+    def test_collection_links_bulk_update_or_create(self):
+        collection = self.data_factory.create_collection_sample(required_only=True).model
+        links = [
+            {
+                'rel': 'describedBy', 'href': 'https://www.example.com/described-by'
+            },
+            {
+                'rel': 'license', 'href': 'https://www.example.com/license'
+            },
+        ]
+
+        def update_links(links):
+            return bulk_update_or_create(
+                CollectionLink,
+                'collection',
+                collection,
+                'rel', ['href', 'link_type', 'title'],
+                links, [collection.name]
+            )
+
+        etag = collection.etag
+        self.assertEqual((2, 0, 0), update_links(links))
+        self.assertNotEqual(etag, collection.etag, msg='Collection ETag not updated')
+
+        etag = collection.etag
+        self.assertEqual((0, 0, 0), update_links(links), msg='Unchanged links updated')
+        self.assertEqual(etag, collection.etag, msg='Collection ETag updated without changes')
+
+        links = [{'rel': 'license', 'href': 'https://www.example.com/license-2'}]
+        self.assertEqual((0, 1, 1), update_links(links))
+        self.assertEqual(['https://www.example.com/license-2'],
+                         list(collection.links.values_list('href', flat=True)))
+
     def test_collection_deserialization_invalid_data(self):
         data = self.data_factory.create_collection_sample(sample='collection-invalid'
                                                          ).get_json('deserialize')
@@ -280,6 +318,29 @@ class ItemSerializationTestCase(StacBaseTestCase):
         })
         self.check_stac_item(expected, python_native, collection_name)
 
+    @override_settings(ITEM_DOCUMENTS_ENGINE='python')
+    def test_item_serialization_annotated_geojson(self):
+        context = {
+            'request':
+                api_request_mocker.get(
+                    f'{STAC_BASE_V}/collections/{self.collection["name"]}/items/{self.item["name"]}'
+                )
+        }
+        python_native = ItemSerializer(self.item.model, context=context).data
+        item = annotate_items_for_documents(Item.objects.filter(pk=self.item.model.pk)).get()
+        self.assertIsNotNone(item.geometry_geojson)
+        self.assertIn('geometry', item.get_deferred_fields(), msg='Geometry not deferred')
+
+        # the DB rendered geometry and stored bbox must be equal to the python rendered ones
+        python_native_annotated = ItemSerializer(item, context=context).data
+        self.assertIn('geometry', item.get_deferred_fields(), msg='Geometry has been loaded')
+        self.assertEqual(python_native['geometry'], python_native_annotated['geometry'])
+        for value, expected in zip(python_native_annotated['bbox'], python_native['bbox']):
+            self.assertAlmostEqual(expected, value, places=12)
+        python_native.pop('bbox')
+        python_native_annotated.pop('bbox')
+        self.assertEqual(python_native, python_native_annotated)
+
     def test_item_serialization_datetime_range(self):
         sample = self.data_factory.create_item_sample(
             collection=self.collection.model, sample='item-2'
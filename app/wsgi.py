@@ -19,6 +19,9 @@ isort:skip_file
 if __name__ == '__main__':
     import gevent.monkey
     gevent.monkey.patch_all()
+    # Let the other greenlets run while waiting on the database
+    from db_backends.gevent_psycopg import patch_psycopg
+    patch_psycopg()
 """
 WSGI config for project project.
 